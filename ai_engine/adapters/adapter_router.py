@@ -0,0 +1,552 @@
+# ai-test-generator/ai_engine/adapters/adapter_router.py
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from ai_engine.adapters.base_adapter import BaseAdapter
+from ai_engine.adapters.resilience import CircuitBreaker, LatencyTracker
+from ai_engine.adapters.transport import wrap_adapter
+from ai_engine.adapters.usage import merge_usage
+from ai_engine.registry import load_adapter_class
+from utils.secret_manager import KeyPool, get_secret_manager
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderUnavailableError(RuntimeError):
+    """Raised when no configured provider can serve a request."""
+
+
+class DeadlineExceededError(ProviderUnavailableError, TimeoutError):
+    """Raised when no provider answered a request within its deadline."""
+
+
+class AdapterRouter:
+    """
+    Routes each test type to the AI provider configured in model_mapping.yaml.
+
+    One adapter instance is built (lazily) per provider and API key from
+    ai_providers.yaml and shared by every test type routed to it. A provider's key
+    secret may hold a pool of keys; requests are spread over them and each key gets
+    its own concurrency limit and cooldown. Providers whose circuit breaker is open,
+    or whose keys all failed or are saturated, are skipped in favour of the
+    configured fallbacks.
+
+    Calls run on their own worker threads so that they can be bounded: an attempt that misses
+    its timeout is abandoned for the next provider, and a whole call gives up at its
+    deadline. With hedging enabled, a request still unanswered after the provider's
+    p95 latency is also sent to the next provider, and the first answer wins.
+    """
+
+    def __init__(self, providers_config: dict, model_mapping: dict, cooldown_seconds: float = 60.0,
+                 resilience: dict = None, transport: dict = None):
+        """
+        :param providers_config: Parsed ai_providers.yaml content.
+        :param model_mapping: Parsed model_mapping.yaml content.
+        :param cooldown_seconds: How long a failing API key is skipped before being retried.
+        :param resilience: Optional `resilience` settings from generation_rules.yaml (timeout_seconds,
+                           deadline_seconds, failure_threshold, recovery_seconds, hedge).
+        :param transport: Optional `transport` settings from generation_rules.yaml (mode, path) to
+                          record provider responses to cassettes or replay them offline.
+        """
+        self.providers_config = providers_config or {}
+        self.model_mapping = model_mapping or {}
+        self.cooldown_seconds = cooldown_seconds
+        self.transport = transport or {}
+
+        resilience = resilience or {}
+        self.timeout_seconds: Optional[float] = resilience.get("timeout_seconds")
+        self.deadline_seconds: Optional[float] = resilience.get("deadline_seconds")
+        self.failure_threshold = resilience.get("failure_threshold", 3)
+        self.recovery_seconds = resilience.get("recovery_seconds", cooldown_seconds)
+        hedge = resilience.get("hedge") or {}
+        self.hedge_enabled = hedge.get("enabled", False)
+        self.hedge_percentile = hedge.get("percentile", 0.95)
+        self.hedge_min_samples = hedge.get("min_samples", 10)
+        self.hedge_initial_delay: Optional[float] = hedge.get("initial_delay_seconds")
+
+        # Keyed by (provider, API key): a rotated key gets a new adapter, and the retired
+        # ones stay so that their token usage is still reported.
+        self._adapters: Dict[Tuple[str, Optional[str]], BaseAdapter] = {}
+        self._pools: Dict[str, KeyPool] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+
+    def provider_chain(self, test_type: str) -> List[str]:
+        """
+        Returns the ordered list of providers to try for a test type: the mapped
+        adapter followed by its configured fallbacks. Unmapped test types may use
+        any configured provider.
+
+        :param test_type: The test type (e.g., 'functional').
+        :return: A list of provider names.
+        """
+        mapping = self.model_mapping.get(test_type) or {}
+        chain = []
+        primary = mapping.get("adapter")
+        if primary:
+            chain.append(primary)
+        chain.extend(mapping.get("fallback", []))
+        if not chain:
+            chain.extend(self.providers_config.keys())
+
+        ordered = []
+        for provider in chain:
+            if provider not in ordered:
+                ordered.append(provider)
+        return ordered
+
+    def for_test_type(self, test_type: str) -> "RoutedAdapter":
+        """
+        Returns an adapter that sends completions for the given test type
+        through its provider chain.
+
+        :param test_type: The test type (e.g., 'functional').
+        :return: A RoutedAdapter instance.
+        """
+        return RoutedAdapter(self, self.provider_chain(test_type))
+
+    def get_adapter(self, provider: str, key_index: int = 0) -> BaseAdapter:
+        """
+        Returns the shared adapter for a provider and one of its keys, building it on first use.
+
+        :param provider: Provider name as used in ai_providers.yaml.
+        :param key_index: Index of the API key in the provider's key pool.
+        :return: The adapter instance.
+        """
+        api_key = self.key_pool(provider).keys[key_index]
+        with self._lock:
+            if (provider, api_key) not in self._adapters:
+                self._adapters[(provider, api_key)] = self._build_adapter(provider, api_key)
+            return self._adapters[(provider, api_key)]
+
+    def key_pool(self, provider: str) -> KeyPool:
+        """
+        Returns the key pool of a provider. The keys are read through the secret manager
+        (a cached lookup), and the pool is rebuilt when they were rotated.
+
+        :param provider: Provider name.
+        :return: The KeyPool (a single None key for providers without an api_key_env_var).
+        """
+        config = self.providers_config.get(provider) or {}
+        keys = get_secret_manager().get_pool(config["api_key_env_var"]) if config.get("api_key_env_var") else []
+        keys = keys or [None]
+        with self._lock:
+            pool = self._pools.get(provider)
+            if pool is None or pool.keys != keys:
+                if pool is not None:
+                    logger.info(f"API keys of {provider} changed; using the new key pool.")
+                pool = KeyPool(keys, config.get("max_concurrent_requests"), self.cooldown_seconds)
+                self._pools[provider] = pool
+            return pool
+
+    def _build_adapter(self, provider: str, api_key: Optional[str] = None) -> BaseAdapter:
+        """
+        Instantiates an adapter from its ai_providers.yaml entry.
+
+        :param provider: Provider name.
+        :param api_key: The API key of this instance, for providers with an api_key_env_var.
+        :return: The adapter instance.
+        """
+        config = self.providers_config.get(provider) or {}
+        kwargs = {}
+        if config.get("default_model"):
+            kwargs["model"] = config["default_model"]
+        if config.get("api_key_env_var"):
+            kwargs["api_key"] = api_key
+        logger.info(f"Initializing {provider} adapter.")
+        # In replay mode the real adapter (and its SDK) is never built.
+        return wrap_adapter(lambda: load_adapter_class(provider)(**kwargs), provider,
+                            config.get("default_model") or provider, self.transport)
+
+    def usage_summary(self) -> Dict[str, dict]:
+        """
+        Returns the token usage of every provider used so far, including cached prompt tokens.
+
+        :return: Mapping of provider name to UsageTracker.snapshot().
+        """
+        with self._lock:
+            adapters = dict(self._adapters)
+        snapshots: Dict[str, Dict[str, dict]] = {}
+        for index, ((provider, _), adapter) in enumerate(adapters.items()):
+            snapshots.setdefault(provider, {})[str(index)] = adapter.usage.snapshot()
+        return {provider: merge_usage(by_key) for provider, by_key in snapshots.items()}
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        """Returns the circuit breaker of a provider."""
+        with self._lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker(self.failure_threshold, self.recovery_seconds)
+            return self._breakers[provider]
+
+    def latency(self, provider: str) -> LatencyTracker:
+        """Returns the latencies of a provider's recent successful calls."""
+        with self._lock:
+            if provider not in self._latencies:
+                self._latencies[provider] = LatencyTracker()
+            return self._latencies[provider]
+
+    def hedge_delay(self, provider: str) -> Optional[float]:
+        """
+        Returns how long to wait for a provider before hedging: its p95 latency once enough
+        calls were measured, the configured initial delay before that.
+
+        :param provider: Provider name.
+        :return: Seconds, or None if requests to it are not hedged.
+        """
+        if not self.hedge_enabled:
+            return None
+        latency = self.latency(provider)
+        if len(latency) >= self.hedge_min_samples:
+            return latency.percentile(self.hedge_percentile)
+        return self.hedge_initial_delay
+
+    def is_available(self, provider: str) -> bool:
+        """
+        Checks whether a provider's circuit is closed (or ready for a probe) and it has a
+        key below its concurrency limit and outside its own cooldown.
+
+        :param provider: Provider name.
+        :return: True if the provider can take a request now.
+        """
+        return self.breaker(provider).available() and self.key_pool(provider).has_capacity()
+
+    def mark_failed(self, provider: str) -> None:
+        """
+        Opens a provider's circuit, e.g. after its adapter could not be built.
+
+        :param provider: Provider name.
+        """
+        self.breaker(provider).trip()
+
+    def _submit(self, provider: str, call: Callable[[BaseAdapter], object], worker: Callable = None) -> Optional[Future]:
+        """
+        Starts `call` on a provider in the background.
+
+        :param provider: Provider name.
+        :param call: A callable taking an adapter and returning its result.
+        :param worker: The thread target (default: _run), called with
+                       (future, provider, key_index, adapter, call).
+        :return: The future of the call, or None if the provider cannot take it now.
+        :raises Exception: If the provider's keys or adapter cannot be set up (its circuit is opened).
+        """
+        breaker = self.breaker(provider)
+        if not breaker.available():
+            return None
+        try:
+            key_index = self.key_pool(provider).acquire()
+        except Exception:
+            breaker.trip()
+            raise
+        if key_index is None:
+            return None
+        if not breaker.allow():
+            self._release(provider, key_index)
+            return None
+        try:
+            adapter = self.get_adapter(provider, key_index)
+        except Exception:
+            self._release(provider, key_index)
+            breaker.trip()
+            raise
+        future = Future()
+        future.set_running_or_notify_cancel()
+        # A daemon thread rather than a pool worker: a call abandoned at its timeout must
+        # not keep the process alive at exit.
+        threading.Thread(target=worker or self._run, args=(future, provider, key_index, adapter, call),
+                         name=f"{provider}-call", daemon=True).start()
+        return future
+
+    def _run(self, future: Future, provider: str, key_index: int, adapter: BaseAdapter, call) -> None:
+        """Worker: runs one call and records its outcome. The key is released when the call
+        really ends, even if the caller stopped waiting for it."""
+        started, failed, error = time.monotonic(), True, None
+        try:
+            result = call(adapter)
+            failed = False
+        except Exception as e:
+            error = e
+        finally:
+            # Only this key cools down; the provider's other keys keep serving.
+            self._release(provider, key_index, failed)
+        abandoned = self._settle(future)
+        # An abandoned call already counted as one failure when it timed out; its late
+        # outcome must neither reset the breaker nor count a second time.
+        if not abandoned:
+            if failed:
+                self.breaker(provider).record_failure()
+            else:
+                self.latency(provider).record(time.monotonic() - started)
+                self.breaker(provider).record_success()
+        if failed:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _run_stream(self, chunks: queue.Queue, stop: threading.Event, future: Future, provider: str,
+                    key_index: int, adapter: BaseAdapter, call) -> None:
+        """
+        Worker of a streamed call: the future resolves with the first chunk (None for an
+        empty stream), and the following chunks go to `chunks`, ended by ("end", error).
+        Reading stops when `stop` is set, i.e. the consumer closed the stream.
+        """
+        failed, error, abandoned, stream = True, None, None, None
+        try:
+            stream = call(adapter)
+            for chunk in stream:
+                if abandoned is None:
+                    abandoned = self._settle(future)
+                    if abandoned:
+                        break
+                    future.set_result(chunk)
+                else:
+                    chunks.put(("chunk", chunk))
+                if stop.is_set():
+                    break
+            failed = False
+        except Exception as e:
+            error = e
+        finally:
+            if hasattr(stream, "close"):
+                stream.close()
+            self._release(provider, key_index, failed)
+        if abandoned is None:
+            abandoned = self._settle(future)
+            if failed:
+                future.set_exception(error)
+            else:
+                future.set_result(None)
+        else:
+            chunks.put(("end", error))
+        if not abandoned:
+            if failed:
+                self.breaker(provider).record_failure()
+            else:
+                self.breaker(provider).record_success()
+
+    def _settle(self, future: Future) -> bool:
+        """Marks a call as settled (no longer abandonable); returns whether it was abandoned first."""
+        with self._lock:
+            future.settled = True
+            return getattr(future, "abandoned", False)
+
+    def _abandon(self, future: Future, provider: str) -> bool:
+        """
+        Gives up on a call that timed out, counting exactly one breaker failure for it.
+
+        :param future: The future of the call.
+        :param provider: Provider name.
+        :return: False if the call ended meanwhile (its own outcome counts instead).
+        """
+        with self._lock:
+            if getattr(future, "settled", False):
+                return False
+            future.abandoned = True
+        self.breaker(provider).record_failure()
+        return True
+
+    def _release(self, provider: str, key_index: int, failed: bool = False) -> None:
+        with self._lock:
+            pool = self._pools.get(provider)
+        if pool is not None:
+            pool.release(key_index, failed)
+
+
+class RoutedAdapter(BaseAdapter):
+    """
+    Adapter facade that tries each provider in a chain until one succeeds.
+    """
+
+    def __init__(self, router: AdapterRouter, providers: List[str]):
+        """
+        :param router: The router that owns the shared adapters and provider health.
+        :param providers: Ordered list of providers to try.
+        """
+        self.router = router
+        self.providers = providers
+        self.last_provider: Optional[str] = None
+
+    def complete(self, prompt: str, **kwargs) -> str:
+        """
+        Sends the prompt to the first available provider, falling back on failure.
+
+        :param prompt: The prompt text to send.
+        :param kwargs: Additional provider-specific parameters.
+        :return: The generated response as a string.
+        :raises ProviderUnavailableError: If every provider is unavailable or fails.
+        """
+        return self._dispatch(lambda adapter: adapter.complete(prompt, **kwargs))
+
+    def complete_n(self, prompt: str, n: int = 1, **kwargs) -> List[str]:
+        """
+        Requests n candidates from the first available provider, falling back on failure.
+
+        :param prompt: The prompt text to send.
+        :param n: Number of candidates to generate.
+        :param kwargs: Additional provider-specific parameters.
+        :return: A list of generated responses.
+        :raises ProviderUnavailableError: If every provider is unavailable or fails.
+        """
+        return self._dispatch(lambda adapter: adapter.complete_n(prompt, n=n, **kwargs))
+
+    def stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """
+        Streams the completion from the first provider that produces a chunk. Providers
+        that fail or miss the attempt timeout before their first chunk fall back to the
+        next one; once a chunk was yielded the stream is committed to its provider, so
+        later errors are raised. Streams are not hedged.
+
+        :param prompt: The prompt text to send.
+        :param kwargs: Additional provider-specific parameters.
+        :return: An iterator of text chunks.
+        :raises ProviderUnavailableError: If every provider is unavailable or fails before its first chunk.
+        :raises DeadlineExceededError: If the call deadline passed.
+        """
+        router = self.router
+        deadline = time.monotonic() + router.deadline_seconds if router.deadline_seconds else None
+        errors = []
+        for provider in self.providers:
+            chunks, stop = queue.Queue(), threading.Event()
+            worker = lambda *args, chunks=chunks, stop=stop: router._run_stream(chunks, stop, *args)
+            try:
+                future = router._submit(provider, lambda adapter: adapter.stream(prompt, **kwargs), worker)
+            except Exception as e:
+                logger.warning(f"Could not initialize {provider} adapter: {e}")
+                errors.append(f"{provider}: {e}")
+                continue
+            if future is None:
+                logger.info(f"Provider {provider} is cooling down or saturated; trying next.")
+                continue
+
+            waits = [t for t in (router.timeout_seconds,
+                                 deadline - time.monotonic() if deadline is not None else None) if t is not None]
+            wait([future], timeout=max(0.0, min(waits)) if waits else None)
+            if not future.done() and router._abandon(future, provider):
+                stop.set()
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise DeadlineExceededError(f"No provider answered within {router.deadline_seconds}s "
+                                                f"({'; '.join(errors) or 'still waiting'}).")
+                logger.warning(f"Provider {provider} did not start streaming within {router.timeout_seconds}s; "
+                               f"falling back.")
+                errors.append(f"{provider}: no answer within {router.timeout_seconds}s")
+                continue
+            try:
+                first = future.result()
+            except Exception as e:
+                logger.warning(f"Provider {provider} failed, falling back: {e}")
+                errors.append(f"{provider}: {e}")
+                continue
+
+            self.last_provider = provider
+            try:
+                if first is None:
+                    return
+                yield first
+                while True:
+                    timeout = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+                    try:
+                        kind, value = chunks.get(timeout=timeout)
+                    except queue.Empty:
+                        raise DeadlineExceededError(f"{provider} did not finish streaming within "
+                                                    f"{router.deadline_seconds}s.") from None
+                    if kind == "end":
+                        if value is not None:
+                            raise value
+                        return
+                    yield value
+            finally:
+                # Also reached when the consumer closes the stream early.
+                stop.set()
+
+        raise ProviderUnavailableError(f"No provider could complete the request ({'; '.join(errors) or 'all busy'}).")
+
+    def _dispatch(self, call):
+        """
+        Invokes `call` with each provider's adapter in chain order until one succeeds,
+        within the router's attempt timeout and call deadline, hedging slow attempts
+        on the next provider when enabled.
+
+        :param call: A callable taking an adapter and returning its result.
+        :return: The result of the first successful call.
+        :raises DeadlineExceededError: If the call deadline passed.
+        """
+        router = self.router
+        deadline = time.monotonic() + router.deadline_seconds if router.deadline_seconds else None
+        remaining = iter(self.providers)
+        pending: Dict[Future, Tuple[str, float]] = {}
+        errors = []
+        hedged = False
+
+        def launch() -> bool:
+            for provider in remaining:
+                try:
+                    future = router._submit(provider, call)
+                except Exception as e:
+                    logger.warning(f"Could not initialize {provider} adapter: {e}")
+                    errors.append(f"{provider}: {e}")
+                    continue
+                if future is None:
+                    logger.info(f"Provider {provider} is cooling down or saturated; trying next.")
+                    continue
+                pending[future] = (provider, time.monotonic())
+                return True
+            return False
+
+        launch()
+        while pending:
+            hedge_at = None
+            if not hedged and len(pending) == 1:
+                provider, started = next(iter(pending.values()))
+                delay = router.hedge_delay(provider)
+                hedge_at = started + delay if delay is not None else None
+            wake_times = [deadline, hedge_at] + [
+                started + router.timeout_seconds for _, started in pending.values() if router.timeout_seconds
+            ]
+            wake = min((t for t in wake_times if t is not None), default=None)
+            done, _ = wait(list(pending), timeout=None if wake is None else max(0.0, wake - time.monotonic()),
+                           return_when=FIRST_COMPLETED)
+
+            for future in done:
+                provider, _ = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"Provider {provider} failed, falling back: {e}")
+                    errors.append(f"{provider}: {e}")
+                    continue
+                if hedged:
+                    logger.info(f"Hedged request answered first by {provider}.")
+                self.last_provider = provider
+                return result
+
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                # Give up on every outstanding attempt at once; their workers only free their keys.
+                for future, (provider, _) in pending.items():
+                    future.cancel()
+                    router._abandon(future, provider)
+                raise DeadlineExceededError(f"No provider answered within {router.deadline_seconds}s "
+                                            f"({'; '.join(errors) or 'still waiting'}).")
+            for future, (provider, started) in list(pending.items()):
+                if router.timeout_seconds and now - started >= router.timeout_seconds:
+                    # The call keeps running on its worker; its key is freed when it ends.
+                    if not router._abandon(future, provider):
+                        continue  # It just ended; its result is picked up on the next wait.
+                    del pending[future]
+                    logger.warning(f"Provider {provider} did not answer within {router.timeout_seconds}s; falling back.")
+                    errors.append(f"{provider}: no answer within {router.timeout_seconds}s")
+            if hedge_at is not None and now >= hedge_at and pending:
+                hedged = True
+                provider, _ = next(iter(pending.values()))
+                if launch():
+                    logger.info(f"Provider {provider} is slower than its p{round(router.hedge_percentile * 100)} "
+                                f"latency; hedging the request.")
+            if not pending:
+                launch()
+
+        raise ProviderUnavailableError(f"No provider could complete the request ({'; '.join(errors) or 'all busy'}).")
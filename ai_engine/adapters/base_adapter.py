@@ -1,20 +1,88 @@
 # ai-test-generator/ai_engine/adapters/base_adapter.py
 
+import asyncio
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List
+
+from ai_engine.adapters.usage import UsageTracker
 
 class BaseAdapter(ABC):
     """
     Abstract Base Adapter for AI provider integrations.
     This interface defines the contract for all adapters.
+
+    Callers may pass a `system` keyword with static instructions. Adapters send it
+    ahead of the prompt, unchanged, so provider prompt caches (and local KV caches)
+    can reuse it across requests.
     """
 
+    @property
+    def usage(self) -> UsageTracker:
+        """Token counters of this adapter, created on first use."""
+        tracker = self.__dict__.get("_usage")
+        if tracker is None:
+            tracker = self.__dict__.setdefault("_usage", UsageTracker())
+        return tracker
+
     @abstractmethod
     def complete(self, prompt: str, **kwargs) -> str:
         """
         Sends a prompt to the AI provider and returns the generated completion.
         
         :param prompt: The prompt text to send.
-        :param kwargs: Additional provider-specific parameters.
+        :param kwargs: Additional provider-specific parameters, and the optional `system` message.
         :return: The generated response as a string.
         """
         pass
+
+    def complete_n(self, prompt: str, n: int = 1, **kwargs) -> List[str]:
+        """
+        Returns n independent completions for the same prompt.
+        Adapters whose provider can return several choices in one call should
+        override this; the default issues n concurrent complete() calls.
+
+        :param prompt: The prompt text to send.
+        :param n: Number of candidates to generate.
+        :param kwargs: Additional provider-specific parameters.
+        :return: A list of generated responses.
+        """
+        if n <= 1:
+            return [self.complete(prompt, **kwargs)]
+        with ThreadPoolExecutor(max_workers=n) as executor:
+            futures = [executor.submit(self.complete, prompt, **kwargs) for _ in range(n)]
+            return [future.result() for future in futures]
+
+    def stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """
+        Yields the completion in chunks as the provider produces them. Adapters with a
+        streaming API override this; the default yields the whole completion at once.
+
+        :param prompt: The prompt text to send.
+        :param kwargs: Additional provider-specific parameters.
+        :return: An iterator of text chunks.
+        """
+        yield self.complete(prompt, **kwargs)
+
+    async def acomplete(self, prompt: str, **kwargs) -> str:
+        """
+        Asynchronous complete(). Adapters with an async client override this; the
+        default runs complete() in a worker thread.
+
+        :param prompt: The prompt text to send.
+        :param kwargs: Additional provider-specific parameters.
+        :return: The generated response as a string.
+        """
+        return await asyncio.to_thread(self.complete, prompt, **kwargs)
+
+    def complete_batch(self, prompts: List[str], max_concurrency: int = 4, **kwargs) -> List[str]:
+        """
+        Completes several independent prompts, at most `max_concurrency` at a time.
+
+        :param prompts: The prompts.
+        :param max_concurrency: Maximum number of requests in flight.
+        :param kwargs: Additional provider-specific parameters, shared by all prompts.
+        :return: The responses, in the order of the prompts.
+        """
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(prompts) or 1))) as executor:
+            return list(executor.map(lambda prompt: self.complete(prompt, **kwargs), prompts))
@@ -1,30 +1,192 @@
 # ai-test-generator/ai_engine/adapters/gemini_adapter.py
 
-import os
+import asyncio
+import logging
+import threading
+from typing import Dict, Iterator, List, Optional
+
 from ai_engine.adapters.base_adapter import BaseAdapter
+from utils.secret_manager import get_api_key
+
+logger = logging.getLogger(__name__)
+
+# google-generativeai keeps its API key in process-wide state (genai.configure).
+_configure_lock = threading.Lock()
+_configured_key: Optional[str] = None
+
 
 class GeminiAdapter(BaseAdapter):
     """
-    Adapter for integrating with the Google Gemini AI service.
-    Note: This is a placeholder implementation. In a real-world scenario,
-    you would integrate with the actual Gemini API endpoints.
+    Adapter for Google Gemini models through the google-generativeai SDK.
+
+    The `system` message is sent as the model's system_instruction, so it stays a
+    stable, cacheable prefix; one model object is kept per distinct system message.
+    Besides complete()/complete_n(), the adapter streams (stream()), has a native async
+    path (acomplete()) and batches prompts concurrently on one event loop (complete_batch()).
     """
-    def __init__(self, api_key: str = None, model: str = "gemini-model"):
-        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+
+    def __init__(self, api_key: str = None, model: str = "gemini-1.5-flash"):
+        """
+        :param api_key: API key for Gemini (default: the first key of the GEMINI_API_KEY secret).
+        :param model: The model to use (default: gemini-1.5-flash).
+        """
+        global _configured_key
+        self.api_key = api_key or get_api_key("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("Gemini API key not provided.")
         self.model = model
-        # Initialize the actual Gemini client here if available.
-        # Example: self.client = GeminiClient(api_key=self.api_key, model=self.model)
+        # Imported here so the SDK is only loaded when this adapter is selected.
+        import google.generativeai as genai
+        self._genai = genai
+        with _configure_lock:
+            if _configured_key is None:
+                genai.configure(api_key=self.api_key)
+                _configured_key = self.api_key
+            elif _configured_key != self.api_key:
+                logger.warning("google-generativeai supports one API key per process; "
+                               "additional Gemini keys share the first one.")
+        self._models: Dict[Optional[str], object] = {}
+        self._models_lock = threading.Lock()
+
+    def _model(self, system: Optional[str] = None):
+        """Returns the GenerativeModel for a system instruction, building it on first use."""
+        with self._models_lock:
+            if system not in self._models:
+                self._models[system] = self._genai.GenerativeModel(self.model, system_instruction=system)
+            return self._models[system]
+
+    @staticmethod
+    def _generation_config(kwargs: dict, candidates: int = 1) -> dict:
+        """Maps the adapter parameters shared by all providers to a Gemini GenerationConfig."""
+        config = {
+            "temperature": kwargs.get("temperature", 0.7),
+            "max_output_tokens": kwargs.get("max_tokens", 1000),
+            "candidate_count": candidates,
+        }
+        if kwargs.get("response_format") == "json":
+            config["response_mime_type"] = "application/json"
+        return config
 
     def complete(self, prompt: str, **kwargs) -> str:
         """
-        Simulated completion method for the Gemini API.
-        
-        :param prompt: The input prompt.
-        :param kwargs: Additional parameters for the API call.
-        :return: A simulated response string.
+        Sends a prompt to Gemini and returns the generated text.
+
+        :param prompt: The prompt to be completed.
+        :param kwargs: Additional parameters (temperature, max_tokens, system, response_format).
+        :return: The generated completion as a string.
+        """
+        response = self._model(kwargs.get("system")).generate_content(
+            prompt, generation_config=self._generation_config(kwargs)
+        )
+        self._record_usage(response)
+        return self._texts(response)[0]
+
+    def complete_n(self, prompt: str, n: int = 1, **kwargs) -> List[str]:
+        """
+        Requests n candidates in a single call (candidate_count).
+
+        :param prompt: The prompt to be completed.
+        :param n: Number of candidates to return.
+        :param kwargs: Additional parameters (temperature, max_tokens, system, response_format).
+        :return: The generated completions, one per candidate.
+        """
+        response = self._model(kwargs.get("system")).generate_content(
+            prompt, generation_config=self._generation_config(kwargs, candidates=n)
+        )
+        self._record_usage(response)
+        return self._texts(response)
+
+    def stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """
+        Yields the completion in chunks as Gemini produces them.
+
+        :param prompt: The prompt to be completed.
+        :param kwargs: Additional parameters (temperature, max_tokens, system, response_format).
+        :return: An iterator of text chunks.
+        """
+        response = self._model(kwargs.get("system")).generate_content(
+            prompt, generation_config=self._generation_config(kwargs), stream=True
+        )
+        for chunk in response:
+            if chunk.candidates and chunk.candidates[0].content.parts:
+                yield chunk.text
+        # Usage metadata is complete once the stream is exhausted.
+        self._record_usage(response)
+
+    async def acomplete(self, prompt: str, **kwargs) -> str:
+        """
+        Asynchronous complete() on the SDK's async client.
+
+        :param prompt: The prompt to be completed.
+        :param kwargs: Additional parameters (temperature, max_tokens, system, response_format).
+        :return: The generated completion as a string.
+        """
+        response = await self._model(kwargs.get("system")).generate_content_async(
+            prompt, generation_config=self._generation_config(kwargs)
+        )
+        self._record_usage(response)
+        return self._texts(response)[0]
+
+    def complete_batch(self, prompts: List[str], max_concurrency: int = 4, **kwargs) -> List[str]:
+        """
+        Completes several prompts concurrently on one event loop. Must not be called
+        from a running event loop; use acomplete() with asyncio.gather() there.
+
+        :param prompts: The prompts.
+        :param max_concurrency: Maximum number of requests in flight.
+        :param kwargs: Additional parameters, shared by all prompts.
+        :return: The responses, in the order of the prompts.
         """
-        # TODO: Replace this with an actual API call to Gemini.
-        simulated_response = f"[Gemini] Generated response for prompt: '{prompt}'"
-        return simulated_response
+        async def run() -> List[str]:
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+            async def one(prompt: str) -> str:
+                async with semaphore:
+                    return await self.acomplete(prompt, **kwargs)
+
+            return list(await asyncio.gather(*(one(prompt) for prompt in prompts)))
+
+        return asyncio.run(run())
+
+    def count_tokens(self, prompt: str, system: str = None) -> int:
+        """
+        Counts the input tokens of a prompt (with its system instruction) without generating.
+
+        :param prompt: The prompt text.
+        :param system: Optional system message.
+        :return: The number of tokens.
+        """
+        return self._model(system).count_tokens(prompt).total_tokens
+
+    @staticmethod
+    def _texts(response) -> List[str]:
+        """Extracts the text of every candidate; a blocked or empty response is an error."""
+        texts = []
+        for candidate in response.candidates:
+            parts = candidate.content.parts if candidate.content else []
+            if parts:
+                texts.append("".join(part.text for part in parts).strip())
+        if not texts:
+            feedback = getattr(response, "prompt_feedback", None)
+            raise RuntimeError(f"Gemini returned no text (prompt feedback: {feedback}).")
+        return texts
+
+    def _record_usage(self, response) -> None:
+        """Adds the token usage of a response, including the prompt tokens served from cache."""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return
+        self.usage.record(
+            prompt_tokens=getattr(usage, "prompt_token_count", 0),
+            cached_tokens=getattr(usage, "cached_content_token_count", 0),
+            completion_tokens=getattr(usage, "candidates_token_count", 0),
+        )
+
+
+# --- Example Usage ---
+# if __name__ == "__main__":
+#     adapter = GeminiAdapter(api_key="...", model="gemini-1.5-flash")
+#     print(adapter.complete("Write a pytest test for GET /pets.", system="Return only Python code."))
+#     for chunk in adapter.stream("List three HTTP status codes."):
+#         print(chunk, end="")
+#     print(adapter.usage.snapshot())
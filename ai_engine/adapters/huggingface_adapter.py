@@ -1,13 +1,24 @@
 # ai-test-generator/ai_engine/adapters/huggingface_adapter.py
 
+import copy
+import logging
 import os
-from transformers import pipeline
+import threading
+from typing import List, Optional, Tuple
 from ai_engine.adapters.base_adapter import BaseAdapter
 
+logger = logging.getLogger(__name__)
+
 class HuggingFaceAdapter(BaseAdapter):
     """
     Adapter for integrating with Hugging Face's text generation pipelines.
+
+    When a `system` message is given, its key/value cache is computed once and reused
+    for every request sharing it, so only the request-specific suffix is prefilled.
     """
+
+    # Joins the system message and the prompt; part of the prompt, never of the cached prefix.
+    _SEPARATOR = "\n\n"
     def __init__(self, model: str = "gpt2", device: int = -1, **kwargs):
         """
         :param model: Hugging Face model identifier.
@@ -15,15 +26,19 @@ class HuggingFaceAdapter(BaseAdapter):
         """
         self.model_name = model
         self.device = device
+        # transformers takes seconds to import, so defer it until the adapter is built.
+        from transformers import pipeline
         self.generator = pipeline("text-generation", model=self.model_name, device=self.device, **kwargs)
+        self._prefix_lock = threading.Lock()
+        self._prefix: Optional[Tuple] = None  # (system text, token ids, past key values)
 
     def complete(self, prompt: str, **kwargs) -> str:
         """
         Generates text completion using the Hugging Face pipeline.
         
         :param prompt: The input prompt for text generation.
-        :param kwargs: Additional generation parameters (e.g., max_length, temperature).
-        :return: Generated text as a string.
+        :param kwargs: Additional generation parameters (e.g., max_length, temperature, system).
+        :return: Generated text as a string (the prompt followed by its completion).
         """
         # Default parameters for text generation
         params = {
@@ -32,7 +47,97 @@ class HuggingFaceAdapter(BaseAdapter):
             "temperature": kwargs.get("temperature", 0.7),
             "do_sample": kwargs.get("do_sample", True)
         }
-        results = self.generator(prompt, **params)
+        system = kwargs.get("system")
+        if system and params["num_return_sequences"] == 1:
+            try:
+                return self._complete_with_prefix_cache(system, prompt, params)
+            except Exception as e:
+                # Older transformers versions cannot resume generation from a cache.
+                logger.debug(f"KV prefix reuse unavailable, using the pipeline: {e}")
+        results = self.generator(self._join(system, prompt), **params)
         # Extract and return the generated text from the first result.
-        generated_text = results[0]["generated_text"]
+        generated_text = self._strip_system(system, results[0]["generated_text"])
+        self._record_pipeline_usage(self._join(system, prompt), results[0]["generated_text"])
         return generated_text
+
+    def complete_n(self, prompt: str, n: int = 1, **kwargs) -> List[str]:
+        """
+        Generates n sequences in a single pipeline call.
+
+        :param prompt: The input prompt for text generation.
+        :param n: Number of sequences to return.
+        :param kwargs: Additional generation parameters (e.g., max_length, temperature, system).
+        :return: The generated texts.
+        """
+        params = {
+            "max_length": kwargs.get("max_length", 150),
+            "num_return_sequences": n,
+            "temperature": kwargs.get("temperature", 0.7),
+            "do_sample": True
+        }
+        system = kwargs.get("system")
+        results = self.generator(self._join(system, prompt), **params)
+        for result in results:
+            self._record_pipeline_usage(self._join(system, prompt), result["generated_text"])
+        return [self._strip_system(system, result["generated_text"]) for result in results]
+
+    def _join(self, system: Optional[str], prompt: str) -> str:
+        return f"{system}{self._SEPARATOR}{prompt}" if system else prompt
+
+    def _strip_system(self, system: Optional[str], text: str) -> str:
+        """Drops the system message from the echoed input, as if only the prompt had been sent."""
+        prefix = f"{system}{self._SEPARATOR}" if system else ""
+        return text[len(prefix):] if prefix and text.startswith(prefix) else text
+
+    def _prefix_cache(self, system: str):
+        """
+        Returns the token ids and key/value cache of the system message, computing them
+        only when the message differs from the previous one.
+
+        :return: (ids, past_key_values, hit).
+        """
+        import torch
+
+        with self._prefix_lock:
+            if self._prefix is not None and self._prefix[0] == system:
+                return self._prefix[1], self._prefix[2], True
+            model = self.generator.model
+            ids = self.generator.tokenizer(system, return_tensors="pt").input_ids.to(model.device)
+            with torch.no_grad():
+                past_key_values = model(ids, use_cache=True).past_key_values
+            self._prefix = (system, ids, past_key_values)
+            return ids, past_key_values, False
+
+    def _complete_with_prefix_cache(self, system: str, prompt: str, params: dict) -> str:
+        """Generates from the cached system prefix, prefilling only the prompt tokens."""
+        import torch
+
+        tokenizer, model = self.generator.tokenizer, self.generator.model
+        prefix_ids, past_key_values, hit = self._prefix_cache(system)
+        prompt_ids = tokenizer(self._SEPARATOR + prompt, return_tensors="pt",
+                               add_special_tokens=False).input_ids.to(model.device)
+        input_ids = torch.cat([prefix_ids, prompt_ids], dim=-1)
+        with torch.no_grad():
+            output = model.generate(
+                input_ids,
+                attention_mask=torch.ones_like(input_ids),
+                # generate() extends the cache in place, so each request works on a copy.
+                past_key_values=copy.deepcopy(past_key_values),
+                max_length=params["max_length"],
+                temperature=params["temperature"],
+                do_sample=params["do_sample"],
+                pad_token_id=tokenizer.eos_token_id,
+            )
+        self.usage.record(
+            prompt_tokens=input_ids.shape[-1],
+            cached_tokens=prefix_ids.shape[-1] if hit else 0,
+            completion_tokens=output.shape[-1] - input_ids.shape[-1],
+        )
+        text = tokenizer.decode(output[0][prefix_ids.shape[-1]:], skip_special_tokens=True)
+        return text[len(self._SEPARATOR):] if text.startswith(self._SEPARATOR) else text
+
+    def _record_pipeline_usage(self, prompt: str, generated_text: str) -> None:
+        tokenizer = self.generator.tokenizer
+        prompt_tokens = len(tokenizer(prompt).input_ids)
+        self.usage.record(prompt_tokens=prompt_tokens,
+                          completion_tokens=max(0, len(tokenizer(generated_text).input_ids) - prompt_tokens))
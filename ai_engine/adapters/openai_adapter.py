@@ -1,8 +1,8 @@
 # ai-test-generator/ai_engine/adapters/openai_adapter.py
 
-import os
-from openai import OpenAI
+from typing import Iterator, List
 from ai_engine.adapters.base_adapter import BaseAdapter
+from utils.secret_manager import get_api_key
 
 class OpenAIAdapter(BaseAdapter):
     """
@@ -12,13 +12,15 @@ class OpenAIAdapter(BaseAdapter):
  #gpt-3.5-turbo , gpt-4-turbo
     def __init__(self, api_key: str = None, model: str = "gpt-3.5-turbo"):
         """
-        :param api_key: API key for OpenAI.
+        :param api_key: API key for OpenAI (default: the first key of the OPENAI_API_KEY secret).
         :param model: The model to use (default: gpt-3.5-turbo).
         """
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.api_key = api_key or get_api_key("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key not provided.")
         self.model = model
+        # Imported here so the SDK is only loaded when this adapter is selected.
+        from openai import OpenAI
         self.client = OpenAI(api_key=self.api_key)
 
     def complete(self, prompt: str, **kwargs) -> str:
@@ -32,15 +34,95 @@ class OpenAIAdapter(BaseAdapter):
         # Prepare request parameters for the chat completion API
         params = {
             "model": self.model,
-            "messages": [{"role": "user", "content": prompt}],
+            "messages": self._messages(prompt, kwargs.get("system")),
             "temperature": kwargs.get("temperature", 0.7),
             "max_tokens": kwargs.get("max_tokens", 1000),
             "n": kwargs.get("n", 1)
         }
+        params.update(self._response_format(kwargs))
         
         # Use the new API format
         response = self.client.chat.completions.create(**params)
+        self._record_usage(response)
         
         # Extract and return the content from the first response choice
         generated_text = response.choices[0].message.content.strip()
         return generated_text
+
+    def complete_n(self, prompt: str, n: int = 1, **kwargs) -> List[str]:
+        """
+        Requests n candidates in a single chat completion call.
+
+        :param prompt: The prompt to be completed.
+        :param n: Number of candidates to return.
+        :param kwargs: Additional parameters for the API call (temperature, max_tokens, etc.)
+        :return: The generated completions, one per choice.
+        """
+        params = {
+            "model": self.model,
+            "messages": self._messages(prompt, kwargs.get("system")),
+            "temperature": kwargs.get("temperature", 0.7),
+            "max_tokens": kwargs.get("max_tokens", 1000),
+            "n": n
+        }
+        params.update(self._response_format(kwargs))
+        response = self.client.chat.completions.create(**params)
+        self._record_usage(response)
+        return [choice.message.content.strip() for choice in response.choices]
+
+    def stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """
+        Yields the completion in chunks as OpenAI produces them.
+
+        :param prompt: The prompt to be completed.
+        :param kwargs: Additional parameters for the API call (temperature, max_tokens, etc.)
+        :return: An iterator of text chunks.
+        """
+        params = {
+            "model": self.model,
+            "messages": self._messages(prompt, kwargs.get("system")),
+            "temperature": kwargs.get("temperature", 0.7),
+            "max_tokens": kwargs.get("max_tokens", 1000),
+            "stream": True,
+            # The last chunk carries the usage of the whole call.
+            "stream_options": {"include_usage": True},
+        }
+        params.update(self._response_format(kwargs))
+        response = self.client.chat.completions.create(**params)
+        try:
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                self._record_usage(chunk)
+        finally:
+            # Closing early (the caller stopped reading) ends the request.
+            response.close()
+
+    @staticmethod
+    def _response_format(kwargs: dict) -> dict:
+        """Maps `response_format="json"` to OpenAI's JSON mode."""
+        if kwargs.get("response_format") == "json":
+            return {"response_format": {"type": "json_object"}}
+        return {}
+
+    @staticmethod
+    def _messages(prompt: str, system: str = None) -> List[dict]:
+        """
+        Builds the chat messages. The system message goes first and is sent byte for byte
+        as given, so OpenAI's automatic prompt caching can match it as a prefix.
+        """
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    def _record_usage(self, response) -> None:
+        """Adds the token usage of a response, including the prompt tokens served from cache."""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        self.usage.record(
+            prompt_tokens=getattr(usage, "prompt_tokens", 0),
+            cached_tokens=getattr(details, "cached_tokens", 0) if details else 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0),
+        )
@@ -0,0 +1,126 @@
+# ai-test-generator/ai_engine/adapters/resilience.py
+
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker. After `failure_threshold` consecutive failures (errors
+    or missed deadlines) the circuit opens and the provider is skipped for
+    `recovery_seconds`; then a single probe request is let through (half-open), and its
+    outcome closes the circuit again or re-opens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 3, recovery_seconds: float = 60.0):
+        """
+        :param failure_threshold: Consecutive failures that open the circuit.
+        :param recovery_seconds: How long an open circuit rejects requests before a probe.
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_seconds = recovery_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if now - self._opened_at < self.recovery_seconds:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def available(self) -> bool:
+        """Checks, without reserving anything, whether a request could be let through now."""
+        with self._lock:
+            state = self._state(time.monotonic())
+            return state == self.CLOSED or (state == self.HALF_OPEN and not self._probing)
+
+    def allow(self) -> bool:
+        """
+        Reserves the right to send a request: always when closed, once per recovery
+        period when half-open (the probe), never when open.
+
+        :return: True if the request may be sent.
+        """
+        with self._lock:
+            state = self._state(time.monotonic())
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def trip(self) -> None:
+        """Opens the circuit immediately (e.g. the adapter could not even be built)."""
+        with self._lock:
+            self._failures = max(self._failures, self.failure_threshold)
+            self._opened_at = time.monotonic()
+            self._probing = False
+
+
+class LatencyTracker:
+    """
+    Rolling window of the latencies of successful calls to one provider, used to
+    decide when a request is slow enough to be hedged.
+    """
+
+    def __init__(self, window: int = 200):
+        """
+        :param window: Number of recent samples kept.
+        """
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        :param fraction: The percentile as a fraction (e.g. 0.95).
+        :return: The latency at that percentile, or None without samples.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+# --- Example Usage ---
+# if __name__ == "__main__":
+#     breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=30)
+#     breaker.record_failure(); breaker.record_failure()
+#     print(breaker.state, breaker.allow())  # open False
+#     latencies = LatencyTracker()
+#     for seconds in (1.2, 1.4, 9.0, 1.3):
+#         latencies.record(seconds)
+#     print(latencies.percentile(0.95))
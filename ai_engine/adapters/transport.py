@@ -0,0 +1,250 @@
+# ai-test-generator/ai_engine/adapters/transport.py
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+from ai_engine.adapters.base_adapter import BaseAdapter
+from ai_engine.adapters.usage import UsageTracker
+
+logger = logging.getLogger(__name__)
+
+MODES = ("live", "record", "replay", "auto")
+
+# Parameters that change what a provider returns; everything else (timeouts, ...) is
+# left out of the request key so recordings stay valid when it changes.
+KEY_PARAMS = ("system", "temperature", "max_tokens", "max_length", "response_format", "n")
+
+CASSETTE_VERSION = 1
+
+
+class CassetteMissError(RuntimeError):
+    """Raised in replay mode for a request that was never recorded."""
+
+
+def request_key(model: str, method: str, prompt: str, kwargs: dict) -> str:
+    """
+    Returns the stable key of a request: a hash of the model, the call and the prompt
+    with the parameters that influence the response.
+    """
+    params = {name: kwargs[name] for name in KEY_PARAMS if kwargs.get(name) is not None}
+    payload = json.dumps({"model": model, "method": method, "prompt": prompt, "params": params},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class Cassette:
+    """
+    A fixture file of recorded provider interactions (JSON, one file per provider).
+    Shared by every adapter instance of the provider, and written atomically after
+    each new recording so an interrupted run keeps what it captured.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Path of the fixture file; created on the first recording.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.interactions: Dict[str, dict] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    document = json.load(f)
+            except (OSError, ValueError) as e:
+                raise RuntimeError(f"Failed to load cassette '{path}': {e}") from e
+            self.interactions = document.get("interactions", {})
+
+    def get(self, key: str) -> Optional[dict]:
+        return self.interactions.get(key)
+
+    def put(self, key: str, interaction: dict) -> None:
+        with self._lock:
+            self.interactions[key] = interaction
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CASSETTE_VERSION, "interactions": self.interactions},
+                          f, indent=2, ensure_ascii=False, sort_keys=True)
+                f.write("\n")
+            os.replace(temp_path, self.path)
+
+
+_cassettes: Dict[str, Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def open_cassette(path: str) -> Cassette:
+    """Returns the shared Cassette of a fixture file."""
+    path = os.path.abspath(path)
+    with _cassettes_lock:
+        if path not in _cassettes:
+            _cassettes[path] = Cassette(path)
+        return _cassettes[path]
+
+
+class _CallUsageTracker(UsageTracker):
+    """Usage tracker that also collects the usage recorded by the current thread's call."""
+
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()
+
+    def record(self, prompt_tokens: int = 0, cached_tokens: int = 0, completion_tokens: int = 0) -> None:
+        super().record(prompt_tokens, cached_tokens, completion_tokens)
+        call = getattr(self._local, "call", None)
+        if call is not None:
+            call["prompt_tokens"] += prompt_tokens or 0
+            call["cached_tokens"] += cached_tokens or 0
+            call["completion_tokens"] += completion_tokens or 0
+
+    def begin_call(self) -> None:
+        self._local.call = {"prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0}
+
+    def end_call(self) -> dict:
+        call, self._local.call = self._local.call, None
+        return call
+
+
+class RecordReplayAdapter(BaseAdapter):
+    """
+    Transport layer in front of any adapter that records provider responses to a
+    cassette and replays them deterministically.
+
+    Modes:
+      - live: every call goes to the provider (nothing is recorded).
+      - record: every call goes to the provider and its response is recorded.
+      - replay: responses come from the cassette only; the real adapter (and its SDK and
+        API key) is never built, and an unrecorded request raises CassetteMissError.
+      - auto: replays recorded requests and records the others.
+
+    Replayed calls return immediately (unless `simulate_latency` is set) and report the
+    recorded token usage, so the pipeline and its usage accounting behave as in the
+    recorded run, offline and at full speed.
+    """
+
+    def __init__(self, factory: Callable[[], BaseAdapter], cassette: Cassette, model: str, mode: str = "auto",
+                 simulate_latency: bool = False):
+        """
+        :param factory: Builds the real adapter; called on the first call that needs it.
+        :param cassette: The cassette of this provider.
+        :param model: Model identifier, part of every request key.
+        :param mode: One of live, record, replay or auto.
+        :param simulate_latency: In replay, wait as long as the recorded call took.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown transport mode '{mode}' (expected one of {', '.join(MODES)}).")
+        self.factory = factory
+        self.cassette = cassette
+        self.model = model
+        self.mode = mode
+        self.simulate_latency = simulate_latency
+        self.__dict__["_usage"] = _CallUsageTracker()
+        self._adapter: Optional[BaseAdapter] = None
+        self._adapter_lock = threading.Lock()
+
+    @property
+    def adapter(self) -> BaseAdapter:
+        """The real adapter, built on first use; it reports its usage into this transport's tracker."""
+        with self._adapter_lock:
+            if self._adapter is None:
+                adapter = self.factory()
+                adapter.__dict__["_usage"] = self.usage
+                self._adapter = adapter
+            return self._adapter
+
+    def complete(self, prompt: str, **kwargs) -> str:
+        return self._call("complete", prompt, kwargs, lambda: self.adapter.complete(prompt, **kwargs))
+
+    def complete_n(self, prompt: str, n: int = 1, **kwargs) -> List[str]:
+        return self._call("complete_n", prompt, {**kwargs, "n": n},
+                          lambda: self.adapter.complete_n(prompt, n=n, **kwargs))
+
+    def stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Streams live or recorded chunks; a recorded stream replays chunk by chunk."""
+        key = request_key(self.model, "stream", prompt, kwargs)
+        interaction = self._lookup(key)
+        if interaction is not None:
+            yield from self._replay(interaction)
+            return
+        started, chunks = time.monotonic(), []
+        self.usage.begin_call()
+        try:
+            for chunk in self.adapter.stream(prompt, **kwargs):
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            usage = self.usage.end_call()
+        self._store(key, "stream", prompt, kwargs, chunks, usage, time.monotonic() - started)
+
+    def _lookup(self, key: str) -> Optional[dict]:
+        if self.mode in ("live", "record"):
+            return None
+        interaction = self.cassette.get(key)
+        if interaction is None and self.mode == "replay":
+            raise CassetteMissError(f"No recorded response for request {key} in '{self.cassette.path}'; "
+                                    f"record it first (transport mode 'record' or 'auto').")
+        return interaction
+
+    def _replay(self, interaction: dict):
+        if self.simulate_latency:
+            time.sleep(interaction.get("duration", 0))
+        self.usage.record(**interaction.get("usage", {}))
+        return interaction["response"]
+
+    def _call(self, method: str, prompt: str, kwargs: dict, call: Callable):
+        key = request_key(self.model, method, prompt, kwargs)
+        interaction = self._lookup(key)
+        if interaction is not None:
+            return self._replay(interaction)
+        started = time.monotonic()
+        self.usage.begin_call()
+        try:
+            response = call()
+        finally:
+            usage = self.usage.end_call()
+        self._store(key, method, prompt, kwargs, response, usage, time.monotonic() - started)
+        return response
+
+    def _store(self, key: str, method: str, prompt: str, kwargs: dict, response, usage: dict, duration: float) -> None:
+        if self.mode == "live":
+            return
+        self.cassette.put(key, {
+            "request": {"model": self.model, "method": method, "prompt_preview": prompt[:200],
+                        "params": {name: kwargs[name] for name in KEY_PARAMS if kwargs.get(name) is not None
+                                   and name != "system"}},
+            "response": response,
+            "usage": usage,
+            "duration": round(duration, 3),
+        })
+
+
+def wrap_adapter(factory: Callable[[], BaseAdapter], provider: str, model: str, transport: dict) -> BaseAdapter:
+    """
+    Puts the configured record/replay transport in front of an adapter.
+
+    :param factory: Builds the real adapter.
+    :param provider: Provider name; the cassette is <path>/<provider>.json.
+    :param model: Model identifier.
+    :param transport: The `transport` settings (mode, path, simulate_latency).
+    :return: The real adapter in live mode, a RecordReplayAdapter otherwise.
+    """
+    mode = (transport or {}).get("mode", "live")
+    if mode == "live":
+        return factory()
+    cassette = open_cassette(os.path.join(transport.get("path", "artifacts/cassettes"), f"{provider}.json"))
+    return RecordReplayAdapter(factory, cassette, model, mode, transport.get("simulate_latency", False))
+
+
+# --- Example Usage ---
+# if __name__ == "__main__":
+#     from ai_engine.adapters.openai_adapter import OpenAIAdapter
+#     cassette = open_cassette("artifacts/cassettes/openai.json")
+#     adapter = RecordReplayAdapter(lambda: OpenAIAdapter(model="gpt-4o"), cassette, "gpt-4o", mode="auto")
+#     print(adapter.complete("Say hello."))  # recorded on the first run, replayed offline afterwards
@@ -0,0 +1,71 @@
+# ai-test-generator/ai_engine/adapters/usage.py
+
+import threading
+from typing import Dict
+
+
+class UsageTracker:
+    """
+    Thread-safe token counters of one adapter. `cached_tokens` counts the prompt tokens
+    served from a provider's prompt cache (or a local KV cache), so the cache hit ratio
+    shows whether the stable system prefix is actually being reused.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+
+    def record(self, prompt_tokens: int = 0, cached_tokens: int = 0, completion_tokens: int = 0) -> None:
+        """
+        Adds the token counts of one request.
+
+        :param prompt_tokens: Input tokens, including the cached ones.
+        :param cached_tokens: Input tokens read from a cache.
+        :param completion_tokens: Generated tokens.
+        """
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += prompt_tokens or 0
+            self.cached_tokens += cached_tokens or 0
+            self.completion_tokens += completion_tokens or 0
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Returns the current counters.
+
+        :return: requests, prompt_tokens, cached_tokens, completion_tokens and cache_hit_ratio.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "completion_tokens": self.completion_tokens,
+                "cache_hit_ratio": round(self.cached_tokens / self.prompt_tokens, 3) if self.prompt_tokens else 0.0,
+            }
+
+
+def merge_usage(snapshots: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+    """
+    Sums usage snapshots, e.g. of all providers behind a router.
+
+    :param snapshots: Mapping of name to snapshot().
+    :return: A combined snapshot.
+    """
+    total = UsageTracker()
+    for snapshot in snapshots.values():
+        total.prompt_tokens += snapshot.get("prompt_tokens", 0)
+        total.cached_tokens += snapshot.get("cached_tokens", 0)
+        total.completion_tokens += snapshot.get("completion_tokens", 0)
+        total.requests += snapshot.get("requests", 0)
+    return total.snapshot()
+
+
+# --- Example Usage ---
+# if __name__ == "__main__":
+#     tracker = UsageTracker()
+#     tracker.record(prompt_tokens=2400, cached_tokens=2048, completion_tokens=900)
+#     print(tracker.snapshot())
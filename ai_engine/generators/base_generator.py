@@ -1,22 +1,40 @@
 # ai-test-generator/ai_engine/generators/base_generator.py
 
-from typing import Dict, List
+import logging
+from typing import Callable, Dict, List, Optional
 from abc import ABC, abstractmethod
 
+from ai_engine.post_processor.candidate_selector import select_best_candidate
+from core.test_models.ir_builder import build_suite_from_code
+from core.test_models.test_suite import TestSuite, endpoint_keys
+
+logger = logging.getLogger(__name__)
+
 class BaseGenerator(ABC):
     """
     Abstract base class for test generators.
     This class defines the contract for generating test cases from a unified specification.
     """
 
-    def __init__(self, adapter, prompt_template: str):
+    # Output formats the generator supports; 'structured' generators return JSON test
+    # cases as a TestSuite without code, and the orchestrator renders them.
+    output_formats = ("code",)
+
+    # Constructor parameters that may be set per test type in model_mapping.yaml.
+    config_options = ()
+
+    def __init__(self, adapter, prompt_template: str, system_prompt: Optional[str] = None):
         """
         :param adapter: An instance of an AI adapter that implements the complete() method.
         :param prompt_template: A template string for generating the prompt.
+        :param system_prompt: Optional static instructions, sent unchanged as the system
+                              message of every request so prompt caches can reuse them.
         """
         self.adapter = adapter
         self.prompt_template = prompt_template
+        self.system_prompt = system_prompt
         self.test_type = None
+        self.output_format = "code"
 
     @abstractmethod
     def generate(self, unified_spec: dict, **kwargs):
@@ -25,7 +43,7 @@ class BaseGenerator(ABC):
         
         :param unified_spec: A unified specification represented as a dictionary.
         :param kwargs: Additional parameters for test generation.
-        :return: A structured test suite or list of test cases.
+        :return: A TestSuite.
         """
         pass
 
@@ -44,3 +62,44 @@ class BaseGenerator(ABC):
         # For simplicity, we're using Python's format method.
         # In a more advanced scenario, you might integrate a templating engine.
         return self.prompt_template.format(spec=unified_spec)
+
+    def _complete(self, prompt: str, unified_spec: dict, render: Optional[Callable[[str], str]] = None, **kwargs) -> str:
+        """
+        Requests a completion from the adapter. When `candidates` > 1 is passed, that many
+        completions are requested at once and the one scoring best on syntax validity,
+        endpoint coverage and security findings is kept.
+
+        :param prompt: The composed prompt.
+        :param unified_spec: A unified specification as a dictionary (used for scoring).
+        :param render: Optional callable turning a raw completion into the final test code.
+        :param kwargs: Adapter parameters, plus the optional `candidates` count.
+        :return: The selected raw completion.
+        """
+        if self.system_prompt:
+            kwargs.setdefault("system", self.system_prompt)
+        candidates = kwargs.pop("candidates", 1) or 1
+        if candidates <= 1:
+            return self.adapter.complete(prompt, **kwargs)
+
+        responses = self.adapter.complete_n(prompt, n=candidates, **kwargs)
+        best_index, scores = select_best_candidate(responses, unified_spec, render=render)
+        logger.info(
+            f"Selected {self.test_type} candidate {best_index + 1}/{len(responses)} "
+            f"(score {scores[best_index]['score']:.1f})."
+        )
+        return responses[best_index]
+
+    def _build_suite(self, test_code: str, unified_spec: dict) -> TestSuite:
+        """
+        Wraps generated code in a TestSuite. The cases are extracted from the code and
+        the spec is referenced by endpoint key rather than copied into the result.
+
+        :param test_code: The generated test module.
+        :param unified_spec: A unified specification as a dictionary.
+        :return: A TestSuite.
+        """
+        test_suite = build_suite_from_code(test_code, self.test_type)
+        test_suite.test_type = self.test_type
+        test_suite.code = test_code
+        test_suite.endpoints = endpoint_keys(unified_spec)
+        return test_suite
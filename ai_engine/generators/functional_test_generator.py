@@ -1,15 +1,51 @@
 # ai-test-generator/ai_engine/generators/functional_test_generator.py
 
+import logging
+from typing import List, Dict, Optional
+
 from ai_engine.generators.base_generator import BaseGenerator
-from typing import List, Dict
-import os
+from ai_engine.post_processor.structured_output import CASE_FORMAT, StructuredCaseParser, parse_structured_cases
+from core.spec_processor.spec_normalizer import normalize_spec
+from core.test_models.test_suite import TestSuite, endpoint_keys
+
+logger = logging.getLogger(__name__)
+
+# Structured mode: the model returns compact JSON cases and the code is rendered locally,
+# so no completion tokens go to imports, fixtures, boilerplate or prose.
+STRUCTURED_SYSTEM_PROMPT = """Generate functional API test cases for the API in the user message as JSON data, not code.
+
+Return a single JSON object in exactly this format, without markdown or explanations:
+""" + CASE_FORMAT + """
+
+Rules:
+- Cover every listed endpoint: successful requests, validation errors, missing resources and edge cases.
+- "endpoint" must be one of the listed endpoints, written exactly as listed.
+- Prefer "data" to writing inputs: "valid" is a complete valid request, "boundary:<i>" and "invalid:<i>" select
+  the numbered request bodies listed for the endpoint. Add "path_params", "query" or "body" only to override it.
+- "status" is the expected HTTP status code. "assert" checks fields of the JSON response ("field" is a dotted
+  path; list indexes are numbers); omit it when only the status matters.
+- Keep names short and unique; omit empty fields."""
+
 
 class FunctionalTestGenerator(BaseGenerator):
     """Generator for creating functional test cases based on a unified specification."""
 
-    def __init__(self, adapter, prompt_template: str = None):
-        prompt_template = prompt_template or """Generate comprehensive functional tests with Allure reporting in pytest format for this API spec:
-{spec}
+    output_formats = ("code", "structured")
+
+    def __init__(self, adapter, prompt_template: str = None, system_prompt: str = None, output_format: str = "code",
+                 data_seed: int = 0):
+        """
+        :param adapter: An AI adapter instance (implements complete()).
+        :param prompt_template: Template of the user message ({spec} placeholder).
+        :param system_prompt: Static instructions sent ahead of it as the system message.
+        :param output_format: 'code' for a free-form pytest module, or 'structured' for JSON test
+                              cases rendered locally through the test IR.
+        :param data_seed: Seed of the synthesized test data structured cases refer to.
+        """
+        # The instructions are identical for every request and go first, as the system
+        # message, so provider prompt caches and local KV caches can reuse them; only the
+        # spec (the part that changes) is sent in the user message.
+        system_prompt = system_prompt or """Generate comprehensive functional tests with Allure reporting in pytest format for the API specification in the user message.
 
 Requirements:
 1. Include standard imports and fixtures as needed.
@@ -123,15 +159,13 @@ Integration Points:
 - Resource cleanup
 - State verification
 
-4. Use dynamic test data:
-- Data generators
-- Randomized inputs
-- Boundary values
-- Valid/invalid combinations
-- Complex scenarios
-- Real-world examples
-- Edge cases
-- Load testing data
+4. Use the generated test data instead of writing payloads:
+The module provides a `test_data` fixture, a dict keyed by "METHOD /path" (e.g. test_data["POST /pets"]):
+- ["valid"]: {"path_params": {...}, "query": {...}, "body": ...} - a valid request
+- ["boundary"]: valid bodies at the edges of the schema constraints
+- ["invalid"]: list of {"reason": ..., "body": ...}, each body violating one schema rule
+- ["invalid_params"]: list of {"in": "path" or "query", "name": ..., "reason": ..., "value": ...}
+Loop over these lists (or parametrize on their indexes) rather than writing literal values.
 
 5. Include proper test organization:
 - Logical grouping
@@ -145,18 +179,29 @@ Integration Points:
 
 Return the complete test suite with proper organization and documentation.
 """
-        super().__init__(adapter, prompt_template)
+        prompt_template = prompt_template or """API specification:
+{spec}"""
+        super().__init__(adapter, prompt_template, system_prompt)
         self.test_type = "functional"
+        self.output_format = output_format
+        self.data_seed = data_seed
 
     def generate(self, unified_spec: dict, **kwargs):
         """Generate functional test cases using AI."""
+        if self.output_format == "structured":
+            test_suite = self._generate_structured(unified_spec, **kwargs)
+            if test_suite is not None:
+                return test_suite
+            logger.warning("No valid structured test cases were generated; falling back to generating code.")
         try:
             # Compose the prompt with the API spec
             prompt = self._compose_prompt(unified_spec)
             
             # Get the AI-generated response with increased token limit
-            response = self.adapter.complete(
+            response = self._complete(
                 prompt,
+                unified_spec,
+                render=self._render_candidate,
                 max_tokens=4000,  # Increased for more comprehensive tests
                 temperature=0.7,
                 **kwargs
@@ -165,26 +210,89 @@ Return the complete test suite with proper organization and documentation.
             # Parse and clean the response
             parsed_tests = self._parse_output(response)
             
-            # Write the generated tests to file
-            output_dir = kwargs.get('output_dir', 'artifacts/generated_tests')
-            os.makedirs(output_dir, exist_ok=True)
-            
+            # Files are written by the caller's OutputManager, not by the generator
             test_code = self._format_test_code(parsed_tests[0]["test_code"] if parsed_tests else "")
-            output_path = os.path.join(output_dir, 'functional_api_tests.py')
             
-            with open(output_path, 'w') as f:
-                f.write(test_code)
-            
-            return {
-                "type": "functional",
-                "spec_summary": unified_spec,
-                "generated_tests": test_code,
-                "output_path": output_path
-            }
+            return self._build_suite(test_code, unified_spec)
         except Exception as e:
             print(f"Error generating functional tests: {str(e)}")
             raise
 
+    def _generate_structured(self, unified_spec: dict, **kwargs) -> Optional[TestSuite]:
+        """
+        Generates the tests as structured JSON cases, validating each case as it streams in.
+
+        :param unified_spec: A unified specification as a dictionary.
+        :param kwargs: Adapter parameters, plus the optional `candidates` count.
+        :return: A TestSuite of structured cases (its code is rendered by the caller), or None
+                 if the response held no valid case.
+        """
+        if "endpoints" not in unified_spec and "openapi" in unified_spec:
+            unified_spec = normalize_spec(unified_spec)
+        parser = StructuredCaseParser(unified_spec, self.data_seed)
+        prompt = self._describe_endpoints(unified_spec, parser)
+        params = {"max_tokens": 4000, "temperature": 0.2, **kwargs,
+                  "system": STRUCTURED_SYSTEM_PROMPT, "response_format": "json"}
+        candidates = params.pop("candidates", 1) or 1
+
+        if candidates > 1:
+            # Keep the candidate covering the most endpoints with valid cases.
+            parsers = [parse_structured_cases(response, unified_spec, self.data_seed)
+                       for response in self.adapter.complete_n(prompt, n=candidates, **params)]
+            parser = max(parsers, key=lambda p: (len({case.endpoint_key for case in p.cases}), len(p.cases)))
+        else:
+            stream = self.adapter.stream(prompt, **params)
+            try:
+                for chunk in stream:
+                    parser.feed(chunk)
+                    if parser.failed:
+                        break  # Not in the format: stop paying for the rest of the completion.
+            finally:
+                stream.close()
+            parser.close()
+
+        if parser.errors:
+            logger.warning(f"Structured output: {len(parser.errors)} problem(s): {'; '.join(parser.errors[:5])}")
+        if not parser.cases:
+            return None
+        logger.info(f"Received {len(parser.cases)} structured test case(s) for "
+                    f"{len({case.endpoint_key for case in parser.cases})} endpoint(s).")
+        test_suite = TestSuite(name=self.test_type, test_cases=parser.cases, test_type=self.test_type,
+                               endpoints=endpoint_keys(unified_spec), metadata={"output_format": "structured"})
+        if parser.errors:
+            test_suite.report["structured_output_errors"] = parser.errors
+        return test_suite
+
+    @staticmethod
+    def _describe_endpoints(unified_spec: dict, parser: StructuredCaseParser) -> str:
+        """Describes the endpoints compactly, with the numbered test data the cases can refer to."""
+        lines = [f'API: "{unified_spec.get("title", "the API")}"', "Endpoints:"]
+        for key, endpoint in parser.endpoints.items():
+            line = key
+            if endpoint.get("summary"):
+                line += f" - {endpoint['summary']}"
+            params = [f"{p['name']} ({p.get('in')}{', required' if p.get('required') else ''})"
+                      for p in endpoint.get("parameters", [])]
+            if params:
+                line += f"; params: {', '.join(params)}"
+            schema = (endpoint.get("request_body") or {}).get("schema") or {}
+            if schema.get("properties"):
+                required = set(schema.get("required", []))
+                fields = [f"{name}{'*' if name in required else ''}: {prop.get('type', 'object')}"
+                          for name, prop in schema["properties"].items()]
+                line += f"; body {{{', '.join(fields)}}}"
+            responses = sorted(endpoint.get("responses", {}))
+            if responses:
+                line += f"; responses: {', '.join(responses)}"
+            lines.append(line)
+            data = parser.test_data(key)
+            if data["boundary"]:
+                lines.append(f"  boundary:0-{len(data['boundary']) - 1}")
+            if data["invalid"]:
+                reasons = ", ".join(f"{index} {case['reason']}" for index, case in enumerate(data["invalid"]))
+                lines.append(f"  invalid: {reasons}")
+        return "\n".join(lines)
+
     def validate(self, tests: List[Dict]) -> bool:
         """Validate functional tests meet basic requirements"""
         if not tests:
@@ -196,6 +304,11 @@ Return the complete test suite with proper organization and documentation.
             for test in tests
         )
 
+    def _render_candidate(self, raw_output: str) -> str:
+        """Turn a raw completion into the final test code, as generate() would write it"""
+        parsed_tests = self._parse_output(raw_output)
+        return self._format_test_code(parsed_tests[0]["test_code"] if parsed_tests else "")
+
     def _parse_output(self, raw_output: str) -> List[Dict]:
         """Parse raw output into executable pytest code"""
         # Extract code blocks from markdown response if present
@@ -1,28 +1,243 @@
 # ai-test-generator/ai_engine/generators/performance_test_generator.py
 
+import json
+import logging
+import pprint
+import re
+from typing import Dict, List, Optional
+
 from ai_engine.generators.base_generator import BaseGenerator
+from core.spec_processor.schema_examples import example_from_schema
+from core.spec_processor.spec_normalizer import normalize_spec
+from core.test_models.test_suite import TestSuite
+
+logger = logging.getLogger(__name__)
+
+# Load profile baked into the generated module; every value can be overridden at
+# run time through the PERF_* environment variable of the same name.
+DEFAULT_LOAD_PROFILE = {
+    "users": 10,                  # Concurrent virtual users.
+    "requests_per_scenario": 50,  # Requests sent per scenario in the per-endpoint tests.
+    "mixed_requests": 200,        # Requests sent in the weighted mixed-workload test.
+    "think_time_ms": [0, 20],     # Uniform pause between a user's requests.
+    "p95_ms": 500,                # 95th percentile latency budget.
+    "p99_ms": 1000,               # 99th percentile latency budget.
+    "max_error_rate": 0.01,       # Share of requests allowed to fail (5xx or transport error).
+    "seed": 1234,                 # Seed for think times and the mixed-workload request order.
+}
+
+# Heuristic share of traffic per operation kind: reads dominate typical API load.
+_METHOD_WEIGHTS = {"GET": 3, "HEAD": 1, "POST": 2, "PUT": 1, "PATCH": 1, "DELETE": 1}
+
+WEIGHTING_PROMPT = """You are planning a load test for "{title}". For each operation below, give its
+relative share of production traffic as a number between 1 and 10.
+
+{operations}
+
+Answer with a JSON object mapping each operation exactly as written to its weight, and nothing else."""
+
+MODULE_TEMPLATE = '''# Generated by the AI Test Generator: load scenarios for "{title}".
+# Scenarios, payloads and weights are derived from the API specification. Thresholds
+# can be overridden at run time, e.g. PERF_USERS=50 PERF_P95_MS=300 pytest ...
+import math
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+
+def _setting(name, default):
+    value = os.environ.get("PERF_" + name.upper())
+    if value is None:
+        return default
+    return [float(part) for part in value.split(",")] if isinstance(default, (list, tuple)) else type(default)(value)
+
+
+LOAD_PROFILE = {{name: _setting(name, default) for name, default in {profile}.items()}}
+
+SCENARIOS = {scenarios}
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100.0 * len(ordered)) - 1)]
+
+
+def _send(session, base_url, scenario):
+    url = base_url + scenario["path"].format(**scenario["path_params"])
+    start = time.perf_counter()
+    try:
+        response = session.request(scenario["method"], url, params=scenario["query"], json=scenario["body"],
+                                   headers={{"Content-Type": "application/json"}}, timeout=30)
+        failed = response.status_code >= 500
+    except requests.RequestException:
+        failed = True
+    return (time.perf_counter() - start) * 1000.0, failed
+
+
+def _run_load(base_url, scenarios):
+    """Sends the scenarios with LOAD_PROFILE['users'] concurrent users; returns latencies (ms) and failures."""
+    rng = random.Random(LOAD_PROFILE["seed"])
+    low, high = LOAD_PROFILE["think_time_ms"]
+    pauses = [rng.uniform(low, high) / 1000.0 for _ in scenarios]
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=int(LOAD_PROFILE["users"]))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    def _user_request(item):
+        scenario, pause = item
+        time.sleep(pause)
+        return _send(session, base_url, scenario)
+
+    with ThreadPoolExecutor(max_workers=int(LOAD_PROFILE["users"])) as executor:
+        results = list(executor.map(_user_request, zip(scenarios, pauses)))
+    return [latency for latency, _ in results], sum(1 for _, failed in results if failed)
+
+
+def _check(latencies, failures, label):
+    p95, p99 = _percentile(latencies, 95), _percentile(latencies, 99)
+    error_rate = failures / float(len(latencies))
+    print(f"{{label}}: n={{len(latencies)}} p95={{p95:.1f}}ms p99={{p99:.1f}}ms errors={{error_rate:.2%}}")
+    assert error_rate <= LOAD_PROFILE["max_error_rate"], f"{{label}}: error rate {{error_rate:.2%}}"
+    assert p95 <= LOAD_PROFILE["p95_ms"], f"{{label}}: p95 {{p95:.1f}}ms exceeds {{LOAD_PROFILE['p95_ms']}}ms"
+    assert p99 <= LOAD_PROFILE["p99_ms"], f"{{label}}: p99 {{p99:.1f}}ms exceeds {{LOAD_PROFILE['p99_ms']}}ms"
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda scenario: scenario["name"])
+def test_endpoint_latency(base_url, scenario):
+    """Each operation on its own under concurrent load."""
+    latencies, failures = _run_load(base_url, [scenario] * int(LOAD_PROFILE["requests_per_scenario"]))
+    _check(latencies, failures, scenario["name"])
+
+
+def test_mixed_workload(base_url):
+    """All operations interleaved according to their traffic weights."""
+    rng = random.Random(LOAD_PROFILE["seed"])
+    weights = [scenario["weight"] for scenario in SCENARIOS]
+    mix = rng.choices(SCENARIOS, weights=weights, k=int(LOAD_PROFILE["mixed_requests"]))
+    latencies, failures = _run_load(base_url, mix)
+    _check(latencies, failures, "mixed workload")
+'''
+
+
+def _scenario_name(method: str, path: str) -> str:
+    slug = re.sub(r"[^0-9a-zA-Z]+", "_", path).strip("_").lower()
+    return f"{method.lower()}_{slug or 'root'}"
+
 
 class PerformanceTestGenerator(BaseGenerator):
     """
     Generator for creating performance test cases based on a unified specification.
+
+    The load test module is rendered deterministically from the spec: one scenario
+    per operation with schema-derived payloads, heuristic traffic weights and seeded
+    think times, checked against latency percentile and error-rate budgets. The LLM
+    is only consulted, when enabled, to estimate the traffic weights.
     """
 
-    def __init__(self, adapter, prompt_template: str = None):
-        prompt_template = prompt_template or "Generate performance tests for the following spec: {spec}"
-        super().__init__(adapter, prompt_template)
+    config_options = ("load_profile", "llm_weighting")
+
+    def __init__(self, adapter, prompt_template: str = None, load_profile: Optional[Dict] = None,
+                 llm_weighting: bool = False):
+        """
+        :param adapter: An AI adapter instance (implements complete()); only used for LLM weighting.
+        :param prompt_template: Template for the weighting prompt ({title} and {operations} placeholders).
+        :param load_profile: Overrides for DEFAULT_LOAD_PROFILE.
+        :param llm_weighting: Ask the LLM to estimate traffic weights instead of using method heuristics.
+        """
+        super().__init__(adapter, prompt_template or WEIGHTING_PROMPT)
+        self.test_type = "performance"
+        # Settings hand lists over as tuples; the rendered module expects plain lists.
+        self.load_profile = {name: list(value) if isinstance(value, tuple) else value
+                             for name, value in {**DEFAULT_LOAD_PROFILE, **(load_profile or {})}.items()}
+        self.llm_weighting = llm_weighting
 
-    def generate(self, unified_spec: dict, **kwargs):
+    def generate(self, unified_spec: dict, **kwargs) -> TestSuite:
         """
         Generate performance test cases.
-        
+
         :param unified_spec: A unified specification represented as a dictionary.
-        :param kwargs: Additional parameters for test generation.
-        :return: A dictionary representing the performance test suite.
+        :param kwargs: Additional parameters for the optional weighting request.
+        :return: A TestSuite holding the performance tests.
         """
-        prompt = self._compose_prompt(unified_spec)
-        response = self.adapter.complete(prompt, **kwargs)
-        return {
-            "type": "performance",
-            "spec_summary": unified_spec,
-            "generated_tests": response
-        }
+        if "endpoints" not in unified_spec and "openapi" in unified_spec:
+            unified_spec = normalize_spec(unified_spec)
+
+        scenarios = self.build_scenarios(unified_spec)
+        if not scenarios:
+            logger.warning("No operations found in the specification; no performance tests generated.")
+            return self._build_suite("", unified_spec)
+
+        if self.llm_weighting:
+            self._apply_llm_weights(scenarios, unified_spec, **kwargs)
+
+        test_code = MODULE_TEMPLATE.format(
+            title=unified_spec.get("title", "API"),
+            profile=pprint.pformat(self.load_profile, width=100),
+            scenarios=pprint.pformat(scenarios, width=100, sort_dicts=False),
+        )
+        return self._build_suite(test_code, unified_spec)
+
+    def build_scenarios(self, unified_spec: dict) -> List[Dict]:
+        """
+        Builds one load scenario per operation from its parameters and schemas.
+
+        :param unified_spec: A normalized specification.
+        :return: A list of scenario dictionaries, in spec order.
+        """
+        scenarios = []
+        for endpoint in unified_spec.get("endpoints", []):
+            method = endpoint["method"].upper()
+            parameters = endpoint.get("parameters", [])
+            body = endpoint.get("request_body") or {}
+            scenarios.append({
+                "name": _scenario_name(method, endpoint["path"]),
+                "method": method,
+                "path": endpoint["path"],
+                "path_params": {p["name"]: example_from_schema(p.get("schema") or {"type": "string"})
+                                for p in parameters if p.get("in") == "path"},
+                "query": {p["name"]: example_from_schema(p.get("schema") or {"type": "string"})
+                          for p in parameters if p.get("in") == "query" and p.get("required")},
+                "body": example_from_schema(body.get("schema")) if body.get("schema") else None,
+                "weight": _METHOD_WEIGHTS.get(method, 1),
+            })
+        return scenarios
+
+    def _apply_llm_weights(self, scenarios: List[Dict], unified_spec: dict, **kwargs) -> None:
+        """Replaces the heuristic weights with LLM estimates; keeps the heuristics on any failure."""
+        operations = "\n".join(f"{s['method']} {s['path']}" for s in scenarios)
+        prompt = self.prompt_template.format(title=unified_spec.get("title", "the API"), operations=operations)
+        kwargs.pop("candidates", None)
+        try:
+            response = self.adapter.complete(prompt, max_tokens=800, temperature=0, **kwargs)
+            match = re.search(r"\{.*\}", response, flags=re.DOTALL)
+            weights = json.loads(match.group(0)) if match else {}
+        except Exception as e:
+            logger.warning(f"LLM weighting failed, keeping heuristic weights: {e}")
+            return
+        for scenario in scenarios:
+            weight = weights.get(f"{scenario['method']} {scenario['path']}")
+            if isinstance(weight, (int, float)) and weight > 0:
+                scenario["weight"] = round(float(weight), 1)
+
+    def validate(self, tests: List[Dict]) -> bool:
+        """Validate performance tests meet basic requirements"""
+        if not tests:
+            return False
+        return all(
+            isinstance(test, dict) and
+            test.get("name") and
+            test.get("test_code")
+            for test in tests
+        )
+
+
+# --- Example Usage ---
+# if __name__ == "__main__":
+#     from core.spec_processor.spec_loader import load_spec
+#     generator = PerformanceTestGenerator(adapter=None)
+#     print(generator.generate(normalize_spec(load_spec("api_specs/petstore.yaml"))).code)
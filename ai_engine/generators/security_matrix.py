@@ -0,0 +1,133 @@
+# ai-test-generator/ai_engine/generators/security_matrix.py
+
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from core.spec_processor.data_synthesizer import DataSynthesizer
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "security_payloads.yaml")
+
+_LOCATIONS = ("path", "query", "header", "body")
+
+
+@lru_cache(maxsize=8)
+def load_corpus(path: str = CORPUS_PATH) -> Dict[str, Any]:
+    """
+    Loads and validates a payload corpus.
+
+    :param path: Path to a corpus YAML file (defaults to the bundled corpus).
+    :return: {'version': str, 'classes': {name: {locations, types, signatures, reflected, payloads}}}.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        raise RuntimeError(f"Failed to load security payload corpus {path}: {e}") from e
+
+    classes = {}
+    for name, entry in (raw.get("classes") or {}).items():
+        unknown = set(entry.get("locations", [])) - set(_LOCATIONS)
+        if unknown or not entry.get("payloads"):
+            raise RuntimeError(f"Invalid payload class '{name}' in {path}: "
+                               f"{'unknown locations ' + str(sorted(unknown)) if unknown else 'no payloads'}")
+        classes[name] = {
+            "locations": tuple(entry.get("locations", _LOCATIONS)),
+            "types": tuple(entry.get("types", ["any"])),
+            "signatures": tuple(entry.get("signatures", [])),
+            "reflected": bool(entry.get("reflected", False)),
+            # Long inputs stay in their {'repeat': s, 'times': n} form until the test runs.
+            "payloads": list(entry["payloads"]),
+        }
+    return {"version": str(raw.get("version", "0")), "classes": classes}
+
+
+def _schema_type(schema: Optional[dict]) -> str:
+    schema = schema or {}
+    if "type" in schema:
+        return schema["type"] if isinstance(schema["type"], str) else schema["type"][0]
+    return "object" if "properties" in schema else "string"
+
+
+def payload_classes(corpus: Dict[str, Any], location: str, schema_type: str) -> List[str]:
+    """
+    Returns the payload classes relevant to an input.
+
+    :param corpus: A corpus as returned by load_corpus().
+    :param location: The input location (path, query, header or body).
+    :param schema_type: The JSON schema type of the input.
+    :return: Class names, in corpus order.
+    """
+    return [
+        name for name, entry in corpus["classes"].items()
+        if location in entry["locations"] and ("any" in entry["types"] or schema_type in entry["types"])
+    ]
+
+
+def build_security_matrix(unified_spec: dict, corpus: Optional[Dict[str, Any]] = None, seed: int = 0) -> Dict[str, Any]:
+    """
+    Maps every parameter and top-level body field of a normalized spec to the payload
+    classes matching its location and type, with a valid baseline request per operation
+    into which the payloads are substituted one at a time.
+
+    :param unified_spec: A normalized specification.
+    :param corpus: A corpus as returned by load_corpus() (defaults to the bundled corpus).
+    :param seed: Seed for the baseline request values.
+    :return: {'version', 'payloads': {class: [...]}, 'signatures': {class: [...]}, 'reflected': [classes],
+              'requests': {'METHOD /path': {path_params, query, body}},
+              'targets': [('METHOD /path', location, name, (classes...))]}.
+    """
+    corpus = corpus or load_corpus()
+    synthesizer = DataSynthesizer(seed)
+    requests, targets, used = {}, [], set()
+
+    for endpoint in unified_spec.get("endpoints", []):
+        key = f"{endpoint['method'].upper()} {endpoint['path']}"
+        parameters = [p for p in endpoint.get("parameters", []) if p.get("in") in _LOCATIONS]
+        body_schema = (endpoint.get("request_body") or {}).get("schema") or {}
+        body_fields = (body_schema.get("properties") or {}) if _schema_type(body_schema) == "object" else {}
+
+        inputs = [(p["in"], p["name"], p.get("schema")) for p in parameters]
+        inputs += [("body", name, schema) for name, schema in body_fields.items()]
+        endpoint_targets = []
+        for location, name, schema in inputs:
+            classes = payload_classes(corpus, location, _schema_type(schema))
+            if classes:
+                endpoint_targets.append((key, location, name, tuple(classes)))
+                used.update(classes)
+        if not endpoint_targets:
+            continue
+
+        targets.extend(endpoint_targets)
+        requests[key] = {
+            "path_params": {p["name"]: synthesizer.valid(p.get("schema") or {"type": "string"})
+                            for p in parameters if p["in"] == "path"},
+            "query": {p["name"]: synthesizer.valid(p.get("schema") or {"type": "string"})
+                      for p in parameters if p["in"] == "query" and p.get("required")},
+            "body": synthesizer.valid(body_schema) if body_schema else None,
+        }
+
+    classes = {name: entry for name, entry in corpus["classes"].items() if name in used}
+    return {
+        "version": corpus["version"],
+        "payloads": {name: entry["payloads"] for name, entry in classes.items()},
+        "signatures": {name: list(entry["signatures"]) for name, entry in classes.items() if entry["signatures"]},
+        "reflected": [name for name, entry in classes.items() if entry["reflected"]],
+        "requests": requests,
+        "targets": targets,
+    }
+
+
+def case_count(matrix: Dict[str, Any]) -> int:
+    """Returns the number of test cases a matrix expands to."""
+    return sum(len(matrix["payloads"][name]) for target in matrix["targets"] for name in target[3])
+
+
+# --- Example Usage ---
+# if __name__ == "__main__":
+#     from core.spec_processor.spec_loader import load_spec
+#     from core.spec_processor.spec_normalizer import normalize_spec
+#     matrix = build_security_matrix(normalize_spec(load_spec("api_specs/petstore.yaml")))
+#     print(f"corpus {matrix['version']}: {len(matrix['targets'])} inputs, {case_count(matrix)} cases")
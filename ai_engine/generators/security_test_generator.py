@@ -1,17 +1,109 @@
 # ai-test-generator/ai_engine/generators/security_test_generator.py
 
+import logging
+import pprint
+
 from ai_engine.generators.base_generator import BaseGenerator
+from ai_engine.generators.security_matrix import build_security_matrix, case_count, load_corpus
+from core.spec_processor.spec_normalizer import normalize_spec
 from typing import List, Dict
-import os
+
+logger = logging.getLogger(__name__)
+
+MATRIX_TEMPLATE = '''import copy
+import json
+from urllib.parse import quote
+
+import pytest
+import requests
+
+# Security payload matrix generated from the API specification and payload corpus {version}.
+# Each target is (operation, location, name, payload classes); every payload of every class
+# is substituted into an otherwise valid request, one at a time.
+SECURITY_CORPUS_VERSION = {version!r}
+
+SECURITY_PAYLOADS = {payloads}
+
+SECURITY_SIGNATURES = {signatures}
+
+SECURITY_REFLECTED = {reflected}
+
+SECURITY_REQUESTS = {requests}
+
+SECURITY_TARGETS = {targets}
+
+SECURITY_CASES = [
+    pytest.param(target, payload_class, index, id=f"{{target[0]}} {{target[1]}}:{{target[2]}} {{payload_class}}[{{index}}]")
+    for target in SECURITY_TARGETS
+    for payload_class in target[3]
+    for index in range(len(SECURITY_PAYLOADS[payload_class]))
+]
+
+
+def _security_payload(payload_class, index):
+    payload = SECURITY_PAYLOADS[payload_class][index]
+    if isinstance(payload, dict) and set(payload) == {{"repeat", "times"}}:
+        return payload["repeat"] * payload["times"]
+    return payload
+
+
+def _send_security_payload(base_url, headers, target, payload):
+    operation, location, name, _ = target
+    method, path = operation.split(" ", 1)
+    request = copy.deepcopy(SECURITY_REQUESTS[operation])
+    request_headers = dict(headers)
+    wire_value = payload if isinstance(payload, str) else json.dumps(payload)
+    if location == "path":
+        request["path_params"][name] = wire_value
+    elif location == "query":
+        request["query"][name] = wire_value
+    elif location == "header":
+        request_headers[name] = wire_value
+    else:
+        request["body"] = dict(request["body"] or {{}})
+        request["body"][name] = payload
+    url = base_url + path.format(**{{key: quote(str(value), safe="") for key, value in request["path_params"].items()}})
+    return requests.request(method, url, params=request["query"], json=request["body"],
+                            headers=request_headers, timeout=30)
+
+
+@pytest.mark.parametrize("target,payload_class,index", SECURITY_CASES)
+def test_security_payload(base_url, headers, target, payload_class, index):
+    """Malicious input is rejected or neutralized: no server error, no leak, no unescaped reflection."""
+    payload = _security_payload(payload_class, index)
+    try:
+        response = _send_security_payload(base_url, headers, target, payload)
+    except requests.exceptions.InvalidHeader:
+        pytest.skip("the HTTP client refuses to send this header value")
+    assert response.status_code < 500, f"{{payload_class}} payload caused a server error ({{response.status_code}})"
+    for signature in SECURITY_SIGNATURES.get(payload_class, []):
+        assert signature not in response.text, f"{{payload_class}} payload: response contains {{signature!r}}"
+    if payload_class in SECURITY_REFLECTED and "html" in response.headers.get("Content-Type", ""):
+        assert str(payload) not in response.text, f"{{payload_class}} payload reflected unescaped"
+'''
 
 class SecurityTestGenerator(BaseGenerator):
     """
     Generator for creating security test cases based on a unified specification.
+
+    Payload-driven tests are rendered deterministically: every parameter and body
+    field is exercised with the classes of the bundled payload corpus matching its
+    location and type (see security_matrix.py), as compact parametrize tables. The
+    LLM only writes the scenarios that need reasoning about the API.
     """
 
-    def __init__(self, adapter, prompt_template: str = None):
-        prompt_template = prompt_template or """Generate comprehensive security tests with Allure reporting in pytest format for this API spec:
-{spec}
+    def __init__(self, adapter, prompt_template: str = None, payload_corpus: str = None, llm_scenarios: bool = True,
+                 system_prompt: str = None):
+        """
+        :param adapter: An AI adapter instance (implements complete()).
+        :param prompt_template: Template of the scenario user message ({spec} placeholder).
+        :param system_prompt: Static scenario instructions sent ahead of it as the system message.
+        :param payload_corpus: Path to a payload corpus YAML (defaults to the bundled corpus).
+        :param llm_scenarios: Also ask the LLM for the scenarios the payload matrix cannot
+                              express (authentication, business logic, headers, ...).
+        """
+        # Static instructions first (cacheable system message), the spec last.
+        system_prompt = system_prompt or """Generate comprehensive security tests with Allure reporting in pytest format for the API specification in the user message.
 
 Requirements:
 1. Include standard imports and fixtures as needed.
@@ -30,23 +122,6 @@ Authentication & Authorization:
 - Session fixation tests
 - Cookie security tests
 
-Input Validation & Injection:
-- SQL injection (various payloads)
-- NoSQL injection
-- XSS (reflected, stored, DOM)
-- XML injection
-- XPATH injection
-- LDAP injection
-- Command injection
-- Template injection
-- Buffer overflow attempts
-- Format string attacks
-- Unicode injection
-- HTML injection
-- CSV injection
-- File path manipulation
-- ZIP bomb detection
-
 API Security:
 - Rate limiting bypass attempts
 - Brute force protection
@@ -116,16 +191,7 @@ Compliance & Standards:
 - Resource cleanup
 - Test data isolation
 
-4. Use dynamic test data:
-- Generate unique test data
-- Use security payload generators
-- Implement different attack vectors
-- Vary request parameters
-- Test boundary conditions
-- Include edge cases
-- Use fuzzing techniques
-
-5. Include proper error handling and cleanup:
+4. Include proper error handling and cleanup:
 - Resource cleanup after tests
 - State reset between tests
 - Exception handling
@@ -134,20 +200,46 @@ Compliance & Standards:
 - Retry mechanisms
 - Rollback procedures
 
+Injection and malformed-input payloads (SQL/NoSQL, XSS, command and template injection,
+path traversal, header injection, type confusion, oversized input) are already covered
+by a generated payload matrix: do not write tests for them.
+
 Return the complete test suite with proper organization and documentation.
 """
-        super().__init__(adapter, prompt_template)
+        prompt_template = prompt_template or """API specification:
+{spec}"""
+        super().__init__(adapter, prompt_template, system_prompt)
         self.test_type = "security"
+        self.payload_corpus = payload_corpus
+        self.llm_scenarios = llm_scenarios
 
     def generate(self, unified_spec: dict, **kwargs):
-        """Generate security test cases using AI."""
+        """Generate security test cases: the payload matrix, plus the LLM-written scenarios."""
+        if "endpoints" not in unified_spec and "openapi" in unified_spec:
+            unified_spec = normalize_spec(unified_spec)
+
+        corpus = load_corpus(self.payload_corpus) if self.payload_corpus else load_corpus()
+        matrix = build_security_matrix(unified_spec, corpus)
+        logger.info(f"Security payload matrix (corpus {matrix['version']}): "
+                    f"{len(matrix['targets'])} inputs, {case_count(matrix)} cases.")
+        matrix_code = self._render_matrix(matrix) if matrix["targets"] else ""
+
+        scenario_code = self._generate_scenarios(unified_spec, **kwargs) if self.llm_scenarios else ""
+        test_suite = self._build_suite(self._merge(scenario_code, matrix_code), unified_spec)
+        test_suite.metadata["payload_corpus_version"] = matrix["version"]
+        return test_suite
+
+    def _generate_scenarios(self, unified_spec: dict, **kwargs) -> str:
+        """Generate the LLM-written security scenarios."""
         try:
             # Compose the prompt with the API spec
             prompt = self._compose_prompt(unified_spec)
             
             # Get the AI-generated response with increased token limit
-            response = self.adapter.complete(
+            response = self._complete(
                 prompt,
+                unified_spec,
+                render=self._render_candidate,
                 max_tokens=4000,  # Increased for more comprehensive tests
                 temperature=0.7,
                 **kwargs
@@ -156,26 +248,42 @@ Return the complete test suite with proper organization and documentation.
             # Parse and clean the response
             parsed_tests = self._parse_output(response)
             
-            # Write the generated tests to file
-            output_dir = kwargs.get('output_dir', 'artifacts/generated_tests')
-            os.makedirs(output_dir, exist_ok=True)
-            
-            test_code = self._format_test_code(parsed_tests[0]["test_code"] if parsed_tests else "")
-            output_path = os.path.join(output_dir, 'security_tests.py')
-            
-            with open(output_path, 'w') as f:
-                f.write(test_code)
-            
-            return {
-                "type": "security",
-                "spec_summary": unified_spec,
-                "generated_tests": test_code,
-                "output_path": output_path
-            }
+            # Files are written by the caller's OutputManager, not by the generator
+            return self._format_test_code(parsed_tests[0]["test_code"] if parsed_tests else "")
         except Exception as e:
             print(f"Error generating security tests: {str(e)}")
             raise
 
+    @staticmethod
+    def _render_matrix(matrix: Dict) -> str:
+        """Render the payload matrix as a parametrized test module section."""
+        return MATRIX_TEMPLATE.format(
+            version=matrix["version"],
+            payloads=pprint.pformat(matrix["payloads"], width=110),
+            signatures=pprint.pformat(matrix["signatures"], width=110),
+            reflected=pprint.pformat(matrix["reflected"], width=110),
+            requests=pprint.pformat(matrix["requests"], width=110),
+            targets=pprint.pformat(matrix["targets"], width=110),
+        )
+
+    @staticmethod
+    def _merge(*sections: str) -> str:
+        """Join code sections into one module, hoisting their imports to the top."""
+        imports, bodies = [], []
+        for section in sections:
+            body = []
+            for line in section.split("\n"):
+                if line.startswith(("import ", "from ")):
+                    if line not in imports:
+                        imports.append(line)
+                else:
+                    body.append(line)
+            if "".join(body).strip():
+                bodies.append("\n".join(body).strip("\n"))
+        if not bodies:
+            return ""
+        return "\n".join(imports) + "\n\n\n" + "\n\n\n".join(bodies) + "\n"
+
     def validate(self, tests: List[Dict]) -> bool:
         """Validate security tests meet basic requirements"""
         if not tests:
@@ -188,6 +296,11 @@ Return the complete test suite with proper organization and documentation.
             for test in tests
         )
 
+    def _render_candidate(self, raw_output: str) -> str:
+        """Turn a raw completion into the final test code, as generate() would write it"""
+        parsed_tests = self._parse_output(raw_output)
+        return self._format_test_code(parsed_tests[0]["test_code"] if parsed_tests else "")
+
     def _parse_output(self, raw_output: str) -> List[Dict]:
         """Parse raw output into executable pytest code"""
         # Extract code blocks from markdown response
@@ -1,17 +1,25 @@
 # ai-test-generator/ai_engine/orchestrator.py
 
+import json
 import logging
+import time
+import uuid
 
-# Import generator classes
-from ai_engine.generators.functional_test_generator import FunctionalTestGenerator
-from ai_engine.generators.security_test_generator import SecurityTestGenerator
-from ai_engine.generators.performance_test_generator import PerformanceTestGenerator
-from ai_engine.generators.e2e_test_generator import E2ETestGenerator
+# Generator classes are resolved lazily through the registry
+from ai_engine.registry import load_generator_class
+
+from ai_engine.adapters.usage import UsageTracker, merge_usage
+from utils.audit_logger import log_event, set_audit_context, spec_hash
 
 # Import post-processing functions
 from ai_engine.post_processor.syntax_checker import check_syntax
 from ai_engine.post_processor.spec_compliance import check_spec_compliance
 from ai_engine.post_processor.security_scanner import scan_security
+from ai_engine.post_processor.repair import RepairLoop
+from ai_engine.post_processor.deduplicator import deduplicate_suites
+from core.spec_processor.data_synthesizer import build_test_data
+from core.spec_processor.spec_normalizer import normalize_spec
+from core.test_models.ir_builder import build_suite_from_code
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -19,57 +27,90 @@ logging.basicConfig(level=logging.INFO)
 class Orchestrator:
     """
     Coordinates the entire test generation workflow:
-      1. Generates tests for requested test types.
-      2. Validates the generated tests using post-processors.
-      3. Aggregates and returns the final test suites.
+      1. Generates tests for requested test types, as code or as structured JSON cases
+         that are rendered locally into table-driven pytest modules.
+      2. Repairs failing fragments and missing endpoints with targeted prompts.
+      3. Validates the generated tests using post-processors.
+      4. Removes tests duplicated across test types.
+      5. Synthesizes the test data fixture the generated tests reference.
+      6. Aggregates and returns the final test suites.
     """
 
-    def __init__(self, adapter, unified_spec: dict, generation_params: dict = None):
+    def __init__(self, adapter, unified_spec: dict, generation_params: dict = None, model_mapping: dict = None,
+                 repair_config: dict = None, deduplicate: bool = True, test_data_config: dict = None):
         """
-        :param adapter: An AI adapter instance (implements complete()).
+        :param adapter: An AI adapter instance (implements complete()), or an AdapterRouter
+                        that selects the adapter per test type.
         :param unified_spec: A normalized specification as a dictionary.
         :param generation_params: Optional default parameters (e.g., temperature, max_tokens).
+        :param model_mapping: Optional parsed model_mapping.yaml used to select generators.
+        :param repair_config: Optional repair settings (max_rounds, token_budget); repair is skipped if omitted.
+        :param deduplicate: Whether to drop semantically identical tests across the generated suites.
+        :param test_data_config: Optional test data settings (enabled, seed) from generation_rules.yaml.
         """
         self.adapter = adapter
         self.unified_spec = unified_spec
         self.generation_params = generation_params or {}
-
-        # Mapping of test type to generator class.
-        self.generator_mapping = {
-            "functional": FunctionalTestGenerator,
-            "security": SecurityTestGenerator,
-            "performance": PerformanceTestGenerator,
-            "e2e": E2ETestGenerator
-        }
+        self.model_mapping = model_mapping or {}
+        self.repair_config = repair_config or {}
+        self.deduplicate = deduplicate
+        self.test_data_config = test_data_config or {}
 
     def run(self, test_types: list) -> dict:
         """
         Runs the test generation and post-processing for each requested test type.
         
         :param test_types: List of test types (e.g., ["functional", "security"]).
-        :return: A dictionary with the processed test suites for each test type.
+        :return: A dictionary with the processed TestSuite for each test type, plus
+                 "test_files" mapping file names to test code, "data_files"
+                 mapping file names to the test data the tests load, and
+                 "rendered_files" mapping file names to complete modules (and their
+                 data files) rendered from structured suites.
         """
-        results = {}
-        test_files = {}
+        results, rendered = {}, {}
+        run_started, run_usage = time.perf_counter(), self._usage_totals()
+        set_audit_context(run_id=uuid.uuid4().hex, spec_hash=spec_hash(self.unified_spec))
+        log_event("run_started", test_types=list(test_types))
 
         for test_type in test_types:
-            generator_class = self.generator_mapping.get(test_type)
+            # Only the generator modules for requested test types get imported.
+            generator_class = load_generator_class(test_type, self.model_mapping)
             if not generator_class:
                 logger.warning(f"No generator found for test type: {test_type}. Skipping.")
+                log_event("generator_missing", level="warning", test_type=test_type)
                 continue
+            started, usage_before = time.perf_counter(), self._usage_totals()
 
-            generator = generator_class(self.adapter)
+            generator = generator_class(self._adapter_for(test_type),
+                                        **self._generator_options(generator_class, test_type))
+            self._apply_output_format(generator, test_type)
             logger.info(f"Generating {test_type} tests...")
             test_suite = generator.generate(self.unified_spec, **self.generation_params)
             logger.info(f"{test_type} tests generated.")
 
+            # Structured cases were validated against the spec as they arrived; their code
+            # is rendered locally, so there is nothing for the repair loop to fix.
+            structured = test_suite.metadata.get("output_format") == "structured"
+            if structured:
+                filename = self._get_filename_for_type(test_type)
+                rendered[test_type] = self._render_structured(test_suite, filename)
+                test_suite.code = rendered[test_type][filename]
+
             # Post processing: Syntax check, spec compliance, and security scan
-            test_code = test_suite.get("generated_tests", "")
-            
+            test_code = test_suite.code
+
+            # Repair only the fragments that fail, within the configured budget
+            if test_code and not structured and self.repair_config.get("max_rounds", 0) > 0:
+                repair_loop = RepairLoop(self._adapter_for(test_type), **self.repair_config)
+                test_code, repair_report = repair_loop.repair(test_code, self.unified_spec)
+                if test_code != test_suite.code:
+                    test_suite.code = test_code
+                    test_suite.test_cases = build_suite_from_code(test_code, test_suite.name).test_cases
+                test_suite.report["repair_report"] = repair_report
+
             if test_code:
                 # Store test code with type-specific filename
-                filename = self._get_filename_for_type(test_type)
-                test_files[filename] = test_code
+                test_suite.metadata["filename"] = self._get_filename_for_type(test_type)
 
             # Syntax Check
             try:
@@ -78,7 +119,7 @@ class Orchestrator:
                 logger.info("Syntax check passed.")
             except Exception as e:
                 logger.error(f"Syntax check failed for {test_type} tests: {e}")
-                test_suite["syntax_errors"] = str(e)
+                test_suite.report["syntax_errors"] = str(e)
 
             # Specification Compliance Check
             try:
@@ -87,22 +128,113 @@ class Orchestrator:
                 logger.info("Spec compliance check passed.")
             except Exception as e:
                 logger.error(f"Spec compliance check failed for {test_type} tests: {e}")
-                test_suite["spec_compliance_errors"] = str(e)
+                test_suite.report["spec_compliance_errors"] = str(e)
 
             # Security Scan
             logger.info(f"Scanning {test_type} tests for security issues...")
             security_issues = scan_security(test_code)
             if security_issues:
                 logger.warning(f"Security issues found: {security_issues}")
-                test_suite["security_issues"] = security_issues
+                test_suite.report["security_issues"] = security_issues
             else:
                 logger.info("No security issues found.")
 
             results[test_type] = test_suite
+            log_event(
+                "generation_completed",
+                level="warning" if test_suite.report.get("syntax_errors") else "info",
+                test_type=test_type,
+                adapter=getattr(generator.adapter, "last_provider", None) or type(generator.adapter).__name__,
+                tokens=self._usage_delta(usage_before),
+                duration=round(time.perf_counter() - started, 3),
+                tests=len(test_suite),
+                issues=sorted(test_suite.report),
+            )
 
-        results["test_files"] = test_files
+        suites = list(results.values())
+        # Rendered modules hold one table-driven test per endpoint, not one function per case.
+        code_suites = [suite for test_type, suite in results.items() if test_type not in rendered]
+        if self.deduplicate and code_suites:
+            dedup_report = deduplicate_suites(code_suites)
+            if dedup_report["removed"]:
+                logger.info(f"Removed {len(dedup_report['removed'])} duplicate tests across suites.")
+
+        results["test_files"] = {
+            suite.metadata["filename"]: suite.code for suite in code_suites if suite.metadata.get("filename")
+        }
+        results["rendered_files"] = {name: content for files in rendered.values() for name, content in files.items()}
+        results["data_files"] = self._build_data_files() if results["test_files"] else {}
+        self._log_usage()
+        log_event("run_completed", test_types=[t for t in test_types if t in results],
+                  tokens=self._usage_delta(run_usage), duration=round(time.perf_counter() - run_started, 3))
         return results
 
+    def _usage(self) -> dict:
+        """Token usage per provider (or of the single adapter), as UsageTracker snapshots."""
+        if hasattr(self.adapter, "usage_summary"):
+            return self.adapter.usage_summary()
+        if isinstance(getattr(self.adapter, "usage", None), UsageTracker):
+            return {type(self.adapter).__name__: self.adapter.usage.snapshot()}
+        return {}
+
+    def _usage_totals(self) -> dict:
+        return merge_usage(self._usage())
+
+    def _usage_delta(self, before: dict) -> dict:
+        """Tokens used since the `before` totals, in the shape of audit records."""
+        after = self._usage_totals()
+        return {key: after[key] - before.get(key, 0) for key in ("prompt_tokens", "cached_tokens", "completion_tokens")}
+
+    def _log_usage(self) -> None:
+        """Log token usage per provider, with the share of prompt tokens served from cache."""
+        for provider, stats in self._usage().items():
+            if stats["requests"]:
+                logger.info(f"{provider}: {stats['requests']} request(s), {stats['prompt_tokens']} prompt tokens "
+                            f"({stats['cached_tokens']} cached, {stats['cache_hit_ratio']:.0%}), "
+                            f"{stats['completion_tokens']} completion tokens.")
+
+    def _build_data_files(self) -> dict:
+        """Synthesize the seeded test data fixture (test_data.json) from the spec schemas."""
+        if not self.test_data_config.get("enabled", True):
+            return {}
+        spec = self.unified_spec
+        if "endpoints" not in spec and "openapi" in spec:
+            spec = normalize_spec(spec)
+        test_data = build_test_data(spec, seed=self.test_data_config.get("seed", 0))
+        logger.info(f"Synthesized test data for {len(test_data)} operations.")
+        return {"test_data.json": json.dumps(test_data, indent=2, ensure_ascii=False) + "\n"}
+
+    def _generator_options(self, generator_class, test_type: str) -> dict:
+        """Returns the constructor options configured for a test type (model_mapping.yaml) that the generator accepts."""
+        mapping = self.model_mapping.get(test_type) or {}
+        return {name: mapping[name] for name in generator_class.config_options if name in mapping}
+
+    def _apply_output_format(self, generator, test_type: str) -> None:
+        """Sets the output format configured for a test type (model_mapping.yaml), if the generator supports it."""
+        output_format = (self.model_mapping.get(test_type) or {}).get("output_format")
+        if not output_format:
+            return
+        if output_format in generator.output_formats:
+            generator.output_format = output_format
+            if hasattr(generator, "data_seed"):
+                generator.data_seed = self.test_data_config.get("seed", 0)
+        else:
+            logger.warning(f"The {test_type} generator does not support output_format '{output_format}'; "
+                           f"generating {generator.output_format}.")
+
+    @staticmethod
+    def _render_structured(test_suite, filename: str) -> dict:
+        """Renders a structured suite into a table-driven pytest module and its data file."""
+        from generators.framework_adapters.registry import load_renderer_class
+
+        return load_renderer_class("pytest")().render(test_suite, filename)
+
+    def _adapter_for(self, test_type: str):
+        """Return the adapter for a test type, routing through the AdapterRouter if one was given."""
+        if hasattr(self.adapter, "for_test_type"):
+            return self.adapter.for_test_type(test_type)
+        return self.adapter
+
     def _get_filename_for_type(self, test_type: str) -> str:
         """Map test types to filenames"""
         filenames = {
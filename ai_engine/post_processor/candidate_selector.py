@@ -0,0 +1,83 @@
+# ai-test-generator/ai_engine/post_processor/candidate_selector.py
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ai_engine.post_processor.syntax_checker import check_syntax
+from ai_engine.post_processor.spec_compliance import find_missing_endpoints
+from ai_engine.post_processor.security_scanner import scan_security
+from core.spec_processor.spec_normalizer import normalize_spec
+
+# Relative weights of the scoring criteria. Valid syntax dominates because an
+# unparsable module is worthless regardless of how many endpoints it mentions.
+SYNTAX_WEIGHT = 100.0
+COVERAGE_WEIGHT = 50.0
+SECURITY_ISSUE_PENALTY = 10.0
+
+
+def score_candidate(test_code: str, unified_spec: dict) -> Dict:
+    """
+    Runs the post-processors on a single candidate and scores it.
+
+    :param test_code: The rendered test code of the candidate.
+    :param unified_spec: The unified specification as a dictionary.
+    :return: A dictionary with the score and the individual check results.
+    """
+    if "endpoints" not in unified_spec and "openapi" in unified_spec:
+        unified_spec = normalize_spec(unified_spec)
+    try:
+        syntax_ok = check_syntax(test_code)
+    except (SyntaxError, ValueError):
+        syntax_ok = False
+
+    endpoints = unified_spec.get("endpoints", [])
+    missing = find_missing_endpoints(test_code or "", unified_spec)
+    coverage = 1.0 - len(missing) / len(endpoints) if endpoints else 1.0
+
+    security_issues = scan_security(test_code or "")
+
+    score = (
+        (SYNTAX_WEIGHT if syntax_ok else 0.0)
+        + COVERAGE_WEIGHT * coverage
+        - SECURITY_ISSUE_PENALTY * len(security_issues)
+    )
+    return {
+        "score": score,
+        "syntax_ok": syntax_ok,
+        "coverage": coverage,
+        "missing_endpoints": missing,
+        "security_issues": security_issues,
+    }
+
+
+def select_best_candidate(
+    candidates: List[str],
+    unified_spec: dict,
+    render: Optional[Callable[[str], str]] = None,
+    max_workers: int = 4,
+) -> Tuple[int, List[Dict]]:
+    """
+    Scores all candidates concurrently and returns the index of the best one.
+    Ties are broken in favour of the earlier candidate.
+
+    :param candidates: Raw completions returned by the adapter.
+    :param unified_spec: The unified specification as a dictionary.
+    :param render: Optional callable turning a raw completion into test code before scoring.
+    :param max_workers: Maximum number of candidates validated in parallel.
+    :return: A tuple of (best candidate index, list of score dictionaries).
+    """
+    if not candidates:
+        raise ValueError("No candidates to select from.")
+    # Normalize once rather than in every scoring worker.
+    if "endpoints" not in unified_spec and "openapi" in unified_spec:
+        unified_spec = normalize_spec(unified_spec)
+
+    def _score(raw: str) -> Dict:
+        test_code = render(raw) if render else raw
+        return score_candidate(test_code, unified_spec)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(candidates)))) as executor:
+        scores = list(executor.map(_score, candidates))
+
+    best_index = max(range(len(scores)), key=lambda i: (scores[i]["score"], -i))
+    return best_index, scores
@@ -0,0 +1,170 @@
+# ai-test-generator/ai_engine/post_processor/deduplicator.py
+
+import ast
+import copy
+import hashlib
+import logging
+from typing import Dict, List, Optional, Set
+
+from core.test_models.test_suite import TestSuite
+
+logger = logging.getLogger(__name__)
+
+# Decorators that change what a test executes; all others (allure labels, marks
+# used for selection) are ignored when comparing tests.
+_SEMANTIC_DECORATORS = ("parametrize", "usefixtures")
+
+
+class _LocalRenamer(ast.NodeTransformer):
+    """
+    Renames the local variables of a function to positional placeholders (_v0, _v1, ...)
+    in order of first assignment. Parameters are kept, since they are pytest fixtures
+    and their names select what gets injected.
+    """
+
+    def __init__(self, local_names: Set[str]):
+        self.local_names = local_names
+        self.mapping: Dict[str, str] = {}
+
+    def visit_Name(self, node: ast.Name) -> ast.Name:
+        if node.id in self.local_names:
+            node.id = self.mapping.setdefault(node.id, f"_v{len(self.mapping)}")
+        return node
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> ast.ExceptHandler:
+        if node.name in self.local_names:
+            node.name = self.mapping.setdefault(node.name, f"_v{len(self.mapping)}")
+        self.generic_visit(node)
+        return node
+
+
+def _local_names(function: ast.FunctionDef) -> Set[str]:
+    """Returns the names a function binds locally (assignments, loop targets, with/except aliases)."""
+    names = set()
+    for node in ast.walk(function):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            names.add(node.id)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            names.add(node.name)
+    return names
+
+
+def _is_semantic(decorator: ast.AST) -> bool:
+    target = decorator.func if isinstance(decorator, ast.Call) else decorator
+    return isinstance(target, ast.Attribute) and target.attr in _SEMANTIC_DECORATORS
+
+
+def module_definitions(tree: ast.Module) -> Dict[str, ast.AST]:
+    """Maps the names a module defines at top level (functions, classes, constants, imports) to their statements."""
+    definitions = {}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            definitions[node.name] = node
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            for target in (node.targets if isinstance(node, ast.Assign) else [node.target]):
+                for name in ast.walk(target):
+                    if isinstance(name, ast.Name):
+                        definitions[name.id] = node
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                definitions[(alias.asname or alias.name).split(".")[0]] = node
+    return definitions
+
+
+def _referenced_definitions(function: ast.FunctionDef, definitions: Dict[str, ast.AST]) -> List[str]:
+    """
+    Returns the dumps of the module-level definitions a function depends on, directly or
+    through other definitions: free names it reads and fixtures it takes as parameters.
+    """
+    pending = [node.id for node in ast.walk(function) if isinstance(node, ast.Name)]
+    pending += [arg.arg for arg in function.args.args + function.args.kwonlyargs]
+    seen, dumps = {function.name}, []
+    while pending:
+        name = pending.pop()
+        if name in seen or name not in definitions:
+            continue
+        seen.add(name)
+        definition = definitions[name]
+        dumps.append(f"{name}={ast.dump(definition, annotate_fields=False)}")
+        pending.extend(node.id for node in ast.walk(definition) if isinstance(node, ast.Name))
+        if isinstance(definition, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            pending.extend(arg.arg for arg in definition.args.args + definition.args.kwonlyargs)
+    return sorted(dumps)
+
+
+def fingerprint(function: ast.FunctionDef, definitions: Optional[Dict[str, ast.AST]] = None) -> str:
+    """
+    Hashes a test function's normalized AST: its name, docstring and reporting
+    decorators are dropped and its locals renamed, so tests that only differ in
+    those respects collide. Parametrization is kept, as it changes the inputs.
+    The module-level fixtures, helpers and constants it uses are hashed with it, so
+    same-named but different definitions in two modules do not collide.
+
+    :param function: A parsed test function.
+    :param definitions: The top-level definitions of its module (see module_definitions()).
+    :return: A hex digest.
+    """
+    dependencies = _referenced_definitions(function, definitions) if definitions else []
+    node = copy.deepcopy(function)
+    node.name = "_"
+    node.decorator_list = [decorator for decorator in node.decorator_list if _is_semantic(decorator)]
+    node.returns = None
+    if node.body and isinstance(node.body[0], ast.Expr) and isinstance(getattr(node.body[0], "value", None), ast.Constant) \
+            and isinstance(node.body[0].value.value, str):
+        node.body = node.body[1:] or [ast.Pass()]
+    node = _LocalRenamer(_local_names(node)).visit(node)
+    payload = "\n".join([ast.dump(node, annotate_fields=False)] + dependencies)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _remove_lines(test_code: str, spans: List[tuple]) -> str:
+    """Removes the given (first, last) 1-based line spans from the code."""
+    lines = test_code.split("\n")
+    for first, last in sorted(spans, reverse=True):
+        del lines[first - 1:last]
+    return "\n".join(lines)
+
+
+def deduplicate_suites(suites: List[TestSuite]) -> Dict:
+    """
+    Drops top-level test functions that are semantically identical to one seen earlier,
+    within a suite or across the suites of a run. Suites are processed in the given
+    order, so the first occurrence (e.g. in the functional suite) is kept.
+
+    :param suites: The suites of one run; their code and cases are updated in place.
+    :return: A report listing each removed test and the test it duplicates.
+    """
+    seen: Dict[str, str] = {}
+    removed = []
+    for suite in suites:
+        try:
+            tree = ast.parse(suite.code)
+        except SyntaxError:
+            logger.warning(f"Skipping deduplication of {suite.name}: the module does not parse.")
+            continue
+
+        definitions = module_definitions(tree)
+        spans, dropped_names, kept_names = [], set(), set()
+        for node in tree.body:
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) or not node.name.startswith("test"):
+                continue
+            digest = fingerprint(node, definitions)
+            location = f"{suite.name}::{node.name}"
+            original: Optional[str] = seen.get(digest)
+            if original is None:
+                seen[digest] = location
+                kept_names.add(node.name)
+                continue
+            first_line = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+            spans.append((first_line, node.end_lineno))
+            dropped_names.add(node.name)
+            removed.append({"test": location, "duplicate_of": original})
+
+        if spans:
+            suite.code = _remove_lines(suite.code, spans)
+            dropped_names -= kept_names
+            suite.test_cases = [case for case in suite.test_cases if case.name not in dropped_names]
+            suite.report["deduplicated"] = sorted(dropped_names)
+            logger.info(f"Removed {len(spans)} duplicate test(s) from {suite.name}.")
+
+    return {"removed": removed, "unique_tests": len(seen)}
@@ -0,0 +1,161 @@
+# ai-test-generator/ai_engine/post_processor/repair.py
+
+import logging
+import re
+from typing import Dict, List, Tuple
+
+from ai_engine.post_processor.spec_compliance import find_missing_endpoints
+from core.spec_processor.spec_normalizer import normalize_spec
+
+logger = logging.getLogger(__name__)
+
+# A new top-level fragment starts at an unindented decorator, function or class.
+_FRAGMENT_START = re.compile(r"^(@|def |async def |class )")
+
+REPAIR_PROMPT = """The following pytest code fragment does not compile.
+Error: {error}
+
+{fragment}
+
+Return only the corrected fragment as Python code, without explanations."""
+
+FILL_IN_PROMPT = """Write pytest test functions for the following API endpoints of "{title}":
+{endpoints}
+
+The module already defines the `base_url` and `headers` fixtures and imports pytest, requests and allure.
+Reference each endpoint path literally in its test. Return only the new test functions as Python code."""
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token estimate (about four characters per token) used for budgeting."""
+    return len(text) // 4 + 1
+
+
+def _extract_code(raw_output: str) -> str:
+    """Return the contents of the markdown code fences in raw_output, or raw_output itself."""
+    blocks = re.findall(r"```(?:python)?\n(.*?)```", raw_output, flags=re.DOTALL)
+    return "\n".join(blocks).strip("\n") if blocks else raw_output.strip("\n")
+
+
+def split_fragments(test_code: str) -> List[str]:
+    """
+    Splits a module into top-level fragments: the preamble (imports, constants)
+    followed by one fragment per decorated function or class.
+
+    :param test_code: The test module source.
+    :return: A list of source fragments that concatenate back to the module.
+    """
+    fragments: List[List[str]] = [[]]
+    previous_was_decorator = False
+    for line in test_code.split("\n"):
+        starts_fragment = bool(_FRAGMENT_START.match(line))
+        if starts_fragment and not previous_was_decorator and fragments[-1]:
+            fragments.append([])
+        fragments[-1].append(line)
+        if line.strip():
+            previous_was_decorator = line.startswith("@")
+    return ["\n".join(lines) for lines in fragments]
+
+
+def _compile_error(fragment: str) -> str:
+    """Return the compile error message for a fragment, or an empty string if it compiles."""
+    try:
+        compile(fragment, "<fragment>", "exec")
+    except SyntaxError as e:
+        return f"{e.msg} (line {e.lineno})"
+    return ""
+
+
+class RepairLoop:
+    """
+    Repairs generated test code by re-prompting only for the parts that fail:
+    fragments that do not compile are sent back individually, and endpoints
+    missing from the suite get a small fill-in prompt. The loop stops after
+    `max_rounds` or once `token_budget` estimated tokens have been spent.
+    """
+
+    def __init__(self, adapter, max_rounds: int = 2, token_budget: int = 4000, max_tokens_per_request: int = 800):
+        """
+        :param adapter: An AI adapter instance (implements complete()).
+        :param max_rounds: Maximum number of repair rounds.
+        :param token_budget: Maximum estimated prompt + completion tokens across all rounds.
+        :param max_tokens_per_request: Completion limit for each repair request.
+        """
+        self.adapter = adapter
+        self.max_rounds = max_rounds
+        self.token_budget = token_budget
+        self.max_tokens_per_request = max_tokens_per_request
+        self.tokens_used = 0
+
+    def repair(self, test_code: str, unified_spec: dict) -> Tuple[str, Dict]:
+        """
+        Runs the bounded repair loop.
+
+        :param test_code: The generated test module.
+        :param unified_spec: The unified specification as a dictionary.
+        :return: A tuple of (repaired code, report dictionary).
+        """
+        report = {"rounds": 0, "repaired_fragments": 0, "filled_endpoints": [], "tokens_used": 0}
+        if "endpoints" not in unified_spec and "openapi" in unified_spec:
+            unified_spec = normalize_spec(unified_spec)
+
+        for round_number in range(1, self.max_rounds + 1):
+            fragments = split_fragments(test_code)
+            broken = [(i, err) for i, err in ((i, _compile_error(f)) for i, f in enumerate(fragments)) if err]
+            missing = find_missing_endpoints(test_code, unified_spec)
+            if not broken and not missing:
+                break
+
+            report["rounds"] = round_number
+            logger.info(
+                f"Repair round {round_number}: {len(broken)} broken fragment(s), "
+                f"{len(missing)} missing endpoint(s)."
+            )
+
+            for index, error in broken:
+                prompt = REPAIR_PROMPT.format(error=error, fragment=fragments[index])
+                fixed = self._request(prompt)
+                if fixed is None:
+                    break
+                if not _compile_error(fixed):
+                    # Keep the original trailing blank lines so spacing is preserved
+                    original = fragments[index]
+                    fragments[index] = fixed + original[len(original.rstrip("\n")):]
+                    report["repaired_fragments"] += 1
+
+            if missing:
+                prompt = FILL_IN_PROMPT.format(
+                    title=unified_spec.get("title", "the API"),
+                    endpoints="\n".join(f"- {path}" for path in dict.fromkeys(missing)),
+                )
+                filled = self._request(prompt)
+                if filled is not None and not _compile_error(filled):
+                    fragments.append("\n" + filled)
+                    report["filled_endpoints"].extend(
+                        path for path in missing if path in filled
+                    )
+
+            test_code = "\n".join(fragments)
+            if self.tokens_used >= self.token_budget:
+                logger.warning("Repair token budget exhausted.")
+                break
+
+        report["tokens_used"] = self.tokens_used
+        return test_code, report
+
+    def _request(self, prompt: str):
+        """
+        Sends a repair prompt if the remaining budget allows it.
+
+        :param prompt: The repair or fill-in prompt.
+        :return: The extracted code, or None if the budget is exhausted or the call fails.
+        """
+        if self.tokens_used + _estimate_tokens(prompt) + self.max_tokens_per_request > self.token_budget:
+            return None
+        try:
+            response = self.adapter.complete(prompt, max_tokens=self.max_tokens_per_request, temperature=0.2)
+        except Exception as e:
+            logger.warning(f"Repair request failed: {e}")
+            return None
+        self.tokens_used += _estimate_tokens(prompt) + _estimate_tokens(response)
+        return _extract_code(response)
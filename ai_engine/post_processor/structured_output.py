@@ -0,0 +1,245 @@
+# ai-test-generator/ai_engine/post_processor/structured_output.py
+
+import copy
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.spec_processor.data_synthesizer import DataSynthesizer
+from core.test_models.test_case import TestCase
+
+logger = logging.getLogger(__name__)
+
+# The compact case format the model is asked for; short keys keep completions small.
+CASE_FORMAT = """{"cases": [{"name": "<snake_case>", "endpoint": "<METHOD /path>", "data": "valid | boundary:<i> | invalid:<i>",
+  "path_params": {...}, "query": {...}, "body": <json>, "status": <int>,
+  "assert": [{"field": "<dotted.path>", "equals": <json>} or {"field": "<dotted.path>", "type": "str|int|float|bool|list|dict"}]}]}"""
+
+ASSERTION_TYPES = {"str", "int", "float", "bool", "list", "dict", "NoneType"}
+
+# Give up on a response that has not opened the case array after this many characters.
+MAX_PREAMBLE = 500
+
+_PLACEHOLDER = re.compile(r"{([^}]+)}")
+
+
+def _snake_case(name: str) -> str:
+    return re.sub(r"[^0-9a-zA-Z]+", "_", name).strip("_").lower()
+
+
+class StructuredCaseParser:
+    """
+    Incremental parser and validator of the structured case format.
+
+    Chunks of the completion are fed as they stream in. Every case is decoded and
+    validated against the spec as soon as its closing brace arrives, so valid cases
+    survive a truncated completion, invalid ones are dropped with a reason, and a
+    response that is not in the format at all is detected (`failed`) early enough to
+    stop the stream. Inputs can reference the synthesized test data ("data": "valid",
+    "boundary:0", "invalid:2"), which is resolved locally instead of being generated.
+    """
+
+    def __init__(self, unified_spec: dict, seed: int = 0):
+        """
+        :param unified_spec: A normalized specification (with endpoints).
+        :param seed: Seed of the test data referenced by the cases.
+        """
+        self.endpoints = {f"{e.get('method', '').upper()} {e.get('path', '')}": e
+                          for e in unified_spec.get("endpoints", [])}
+        self.synthesizer = DataSynthesizer(seed)
+        self._data: Dict[str, dict] = {}
+        self.cases: List[TestCase] = []
+        self.errors: List[str] = []
+        self.failed = False
+        self._names: Dict[str, int] = {}
+
+        self._buffer = ""
+        self._received = 0
+        self._scanned = 0
+        self._depth = 0
+        self._array_depth: Optional[int] = None
+        self._element_start: Optional[int] = None
+        self._in_string = False
+        self._escaped = False
+        self._closed = False
+        self._index = 0
+
+    def feed(self, chunk: str) -> List[TestCase]:
+        """
+        Consumes the next chunk of the completion.
+
+        :param chunk: Text as received from the provider.
+        :return: The cases completed (and valid) in this chunk.
+        """
+        if self.failed or self._closed:
+            return []
+        self._buffer += chunk
+        self._received += len(chunk)
+        completed = []
+        buffer, position = self._buffer, self._scanned
+        while position < len(buffer):
+            char = buffer[position]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._array_depth is not None and self._depth == self._array_depth and char == "{":
+                    self._element_start = position
+                self._depth += 1
+                if char == "[" and self._array_depth is None:
+                    self._array_depth = self._depth
+            elif char in "}]":
+                self._depth -= 1
+                if self._array_depth is not None:
+                    if char == "}" and self._depth == self._array_depth and self._element_start is not None:
+                        case = self._accept(buffer[self._element_start:position + 1])
+                        if case is not None:
+                            completed.append(case)
+                        self._element_start = None
+                    elif char == "]" and self._depth == self._array_depth - 1:
+                        self._closed = True
+                        break
+            position += 1
+
+        # Drop what was consumed, keeping the current element.
+        keep = self._element_start if self._element_start is not None else position
+        self._buffer, self._scanned = buffer[keep:], position - keep
+        if self._element_start is not None:
+            self._element_start = 0
+        if self._array_depth is None and self._received > MAX_PREAMBLE:
+            self.failed = True
+            self.errors.append("response is not in the structured case format")
+        return completed
+
+    def close(self) -> List[TestCase]:
+        """
+        Ends the stream.
+
+        :return: All valid cases.
+        """
+        if not self._closed and not self.failed:
+            if self._array_depth is None:
+                self.failed = True
+                self.errors.append("response is not in the structured case format")
+            else:
+                self.errors.append("response was truncated; the cases completed before the cut were kept")
+        return self.cases
+
+    def _accept(self, text: str) -> Optional[TestCase]:
+        self._index += 1
+        try:
+            case = self.validate(json.loads(text))
+        except (ValueError, TypeError, KeyError, IndexError) as e:
+            self.errors.append(f"case {self._index}: {e}")
+            return None
+        self.cases.append(case)
+        return case
+
+    def test_data(self, key: str) -> dict:
+        """Returns the synthesized test data of an endpoint (see DataSynthesizer.endpoint_data())."""
+        if key not in self._data:
+            self._data[key] = self.synthesizer.endpoint_data(self.endpoints[key])
+        return self._data[key]
+
+    def _inputs(self, key: str, reference: Optional[str]) -> Tuple[dict, dict, Any]:
+        """Resolves a test data reference into (path_params, query, body)."""
+        if not reference:
+            return {}, {}, None
+        data = self.test_data(key)
+        valid = copy.deepcopy(data["valid"])
+        kind, _, index = str(reference).partition(":")
+        if kind == "valid":
+            return valid["path_params"], valid["query"], valid["body"]
+        if kind in ("boundary", "invalid"):
+            entries = data[kind]
+            position = int(index or 0)
+            if not 0 <= position < len(entries):
+                raise IndexError(f"'{reference}' does not exist for {key} ({len(entries)} entries)")
+            entry = entries[position]
+            return valid["path_params"], valid["query"], copy.deepcopy(entry["body"] if kind == "invalid" else entry)
+        raise ValueError(f"unknown data reference '{reference}'")
+
+    def validate(self, data: dict) -> TestCase:
+        """
+        Validates one case against the format and the spec.
+
+        :param data: The decoded case.
+        :return: The TestCase.
+        :raises ValueError: If the case is invalid (the message says why).
+        """
+        if not isinstance(data, dict):
+            raise ValueError("expected an object")
+        method, _, path = str(data.get("endpoint", "")).strip().partition(" ")
+        key = f"{method.upper()} {path.strip()}"
+        if key not in self.endpoints:
+            raise ValueError(f"unknown endpoint '{data.get('endpoint')}'")
+        status = data.get("status")
+        if not isinstance(status, int) or isinstance(status, bool) or not 100 <= status <= 599:
+            raise ValueError(f"invalid status {status!r}")
+
+        path_params, query, body = self._inputs(key, data.get("data"))
+        for field, target in (("path_params", path_params), ("query", query)):
+            value = data.get(field) or {}
+            if not isinstance(value, dict):
+                raise ValueError(f"'{field}' must be an object")
+            target.update(value)
+        if "body" in data:
+            body = data["body"]
+        path = key.split(" ", 1)[1]
+        missing = [name for name in _PLACEHOLDER.findall(path) if name not in path_params]
+        if missing:
+            raise ValueError(f"missing path parameter(s) {missing} for {key}")
+
+        assertions = data.get("assert") or []
+        if not isinstance(assertions, list):
+            raise ValueError("'assert' must be a list")
+        for assertion in assertions:
+            if not isinstance(assertion, dict) or not isinstance(assertion.get("field"), str):
+                raise ValueError(f"invalid assertion {assertion!r}")
+            if "equals" not in assertion and assertion.get("type") not in ASSERTION_TYPES:
+                raise ValueError(f"assertion on '{assertion['field']}' needs 'equals' or a known 'type'")
+
+        name = _snake_case(str(data.get("name") or f"{method}_{path}")) or "case"
+        count = self._names.get(name, 0)
+        self._names[name] = count + 1
+        return TestCase(
+            name=f"{name}_{count + 1}" if count else name,
+            method=method, path=path, path_params=path_params, query=query, body=body,
+            expected_status=status,
+            assertions=[{k: v for k, v in a.items() if k in ("field", "equals", "type")} for a in assertions],
+            tags=["structured"],
+        )
+
+
+def parse_structured_cases(text: str, unified_spec: dict, seed: int = 0) -> StructuredCaseParser:
+    """
+    Parses a complete (non-streamed) structured response.
+
+    :param text: The completion.
+    :param unified_spec: A normalized specification.
+    :param seed: Seed of the referenced test data.
+    :return: The parser, holding the valid cases and the errors.
+    """
+    parser = StructuredCaseParser(unified_spec, seed)
+    parser.feed(text)
+    parser.close()
+    return parser
+
+
+# --- Example Usage ---
+# if __name__ == "__main__":
+#     spec = {"endpoints": [{"method": "GET", "path": "/pets/{petId}",
+#                            "parameters": [{"name": "petId", "in": "path", "schema": {"type": "integer"}}]}]}
+#     parser = StructuredCaseParser(spec)
+#     for chunk in ('{"cases": [{"name": "get_pet", "endpoint": "GET /pets/{petId}", "data": "val',
+#                   'id", "status": 200}, {"endpoint": "GET /nope", "status": 200}]}'):
+#         print(parser.feed(chunk))
+#     parser.close()
+#     print(parser.errors)
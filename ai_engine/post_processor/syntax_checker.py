@@ -1,5 +1,7 @@
 # ai-test-generator/ai_engine/post_processor/syntax_checker.py
 
+import textwrap
+
 def check_syntax(test_code: str) -> bool:
     """
     Performs a basic syntax check on the generated test code.
@@ -13,7 +15,7 @@ def check_syntax(test_code: str) -> bool:
 
     try:
         # Add wrapper to make partial code fragments compilable
-        wrapped_code = f"def __wrapper__():\n    {test_code.replace('\n', '\n    ')}"
+        wrapped_code = "def __wrapper__():\n" + textwrap.indent(test_code, "    ")
         compile(wrapped_code, "<string>", "exec")
     except Exception as e:
         error_msg = f"Syntax error in test code:\n{'-'*40}\n{test_code}\n{'-'*40}\nError: {e}"
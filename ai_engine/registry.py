@@ -0,0 +1,90 @@
+# ai-test-generator/ai_engine/registry.py
+
+import importlib
+from typing import Dict, Optional
+
+# Adapters and generators are registered by dotted path so that provider SDKs
+# (openai, transformers, google-generativeai) and generator modules are only
+# imported once a test type that needs them is actually requested.
+ADAPTER_REGISTRY: Dict[str, str] = {
+    "openai": "ai_engine.adapters.openai_adapter:OpenAIAdapter",
+    "gemini": "ai_engine.adapters.gemini_adapter:GeminiAdapter",
+    "huggingface": "ai_engine.adapters.huggingface_adapter:HuggingFaceAdapter",
+}
+
+GENERATOR_REGISTRY: Dict[str, str] = {
+    "functional_test_generator": "ai_engine.generators.functional_test_generator:FunctionalTestGenerator",
+    "security_test_generator": "ai_engine.generators.security_test_generator:SecurityTestGenerator",
+    "performance_test_generator": "ai_engine.generators.performance_test_generator:PerformanceTestGenerator",
+    "e2e_test_generator": "ai_engine.generators.e2e_test_generator:E2ETestGenerator",
+}
+
+# Fallback generator names used when model_mapping.yaml has no entry for a test type.
+DEFAULT_GENERATORS: Dict[str, str] = {
+    "functional": "functional_test_generator",
+    "security": "security_test_generator",
+    "performance": "performance_test_generator",
+    "e2e": "e2e_test_generator",
+}
+
+_class_cache: Dict[str, type] = {}
+
+
+def _import_object(target: str) -> type:
+    """
+    Imports and returns the object referenced by a "module.path:ClassName" string.
+    Resolved classes are cached so repeated lookups cost a dictionary access.
+
+    :param target: Dotted module path and attribute name separated by a colon.
+    :return: The referenced class.
+    """
+    if target not in _class_cache:
+        module_path, _, attr = target.partition(":")
+        module = importlib.import_module(module_path)
+        _class_cache[target] = getattr(module, attr)
+    return _class_cache[target]
+
+
+def load_adapter_class(provider: str) -> type:
+    """
+    Returns the adapter class for a provider, importing its module on first use.
+
+    :param provider: Provider key as used in ai_providers.yaml (e.g., 'openai').
+    :return: The adapter class.
+    :raises ValueError: If the provider is not registered.
+    """
+    target = ADAPTER_REGISTRY.get(provider)
+    if not target:
+        raise ValueError(f"No adapter registered for provider '{provider}'.")
+    return _import_object(target)
+
+
+def load_generator_class(test_type: str, model_mapping: Optional[dict] = None) -> Optional[type]:
+    """
+    Returns the generator class for a test type, importing its module on first use.
+    The generator name is taken from model_mapping.yaml when available.
+
+    :param test_type: The test type (e.g., 'functional').
+    :param model_mapping: Optional parsed model_mapping.yaml content.
+    :return: The generator class, or None if the test type is unknown.
+    """
+    generator_name = ((model_mapping or {}).get(test_type) or {}).get("generator")
+    generator_name = generator_name or DEFAULT_GENERATORS.get(test_type)
+    target = GENERATOR_REGISTRY.get(generator_name)
+    if not target:
+        return None
+    return _import_object(target)
+
+
+def available_test_types(model_mapping: Optional[dict] = None) -> list:
+    """
+    Lists the test types that can be generated, without importing any generator.
+
+    :param model_mapping: Optional parsed model_mapping.yaml content.
+    :return: A list of test type names.
+    """
+    test_types = list(DEFAULT_GENERATORS)
+    for test_type in (model_mapping or {}):
+        if test_type not in test_types:
+            test_types.append(test_type)
+    return test_types
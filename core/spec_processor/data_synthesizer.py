@@ -0,0 +1,398 @@
+# ai-test-generator/core/spec_processor/data_synthesizer.py
+
+import math
+import random
+import re
+import string
+from typing import Any, Dict, List, Optional, Tuple
+
+from .schema_examples import example_from_schema
+
+# Values per JSON schema string format; {n} is replaced with a random number.
+_FORMAT_TEMPLATES = {
+    "date-time": "2024-01-{day:02d}T12:00:00Z",
+    "date": "2024-01-{day:02d}",
+    "email": "user{n}@example.com",
+    "uuid": None,
+    "uri": "https://example.com/resource/{n}",
+    "hostname": "host{n}.example.com",
+    "ipv4": "10.0.0.{octet}",
+}
+
+_MAX_DEPTH = 8
+
+
+def _schema_type(schema: dict) -> str:
+    if "type" in schema:
+        return schema["type"] if isinstance(schema["type"], str) else schema["type"][0]
+    if "properties" in schema:
+        return "object"
+    if "items" in schema:
+        return "array"
+    return "string"
+
+
+class _PatternSampler:
+    """
+    Produces strings matching simple regular expressions: literals, escapes (\\d, \\w, \\s),
+    character classes, groups with alternation and the ?, *, +, {n} and {n,m} quantifiers.
+    Anything more exotic makes sample() return None.
+    """
+
+    _CLASSES = {"d": string.digits, "w": string.ascii_letters + string.digits + "_", "s": " "}
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+
+    def sample(self, pattern: str) -> Optional[str]:
+        try:
+            self._pattern, self._pos = pattern.lstrip("^").rstrip("$"), 0
+            value = self._alternation()
+            return value if self._pos == len(self._pattern) and re.fullmatch(pattern.lstrip("^").rstrip("$"), value) else None
+        except (IndexError, ValueError, re.error):
+            return None
+
+    def _peek(self) -> str:
+        return self._pattern[self._pos] if self._pos < len(self._pattern) else ""
+
+    def _alternation(self) -> str:
+        options = [self._sequence()]
+        while self._peek() == "|":
+            self._pos += 1
+            options.append(self._sequence())
+        return self.rng.choice(options)
+
+    def _sequence(self) -> str:
+        parts = []
+        while self._peek() and self._peek() not in "|)":
+            atom = self._atom()
+            low, high = self._quantifier()
+            parts.append("".join(atom() for _ in range(self.rng.randint(low, high))))
+        return "".join(parts)
+
+    def _atom(self):
+        char = self._pattern[self._pos]
+        self._pos += 1
+        if char == "(":
+            if self._pattern.startswith("?:", self._pos):
+                self._pos += 2
+            start = self._pos
+            self._alternation()
+            if self._peek() != ")":
+                raise ValueError("unbalanced group")
+            self._pos += 1
+            group = "(" + self._pattern[start:self._pos]
+            return lambda: _PatternSampler(self.rng).sample(group[1:-1]) or ""
+        if char == "[":
+            end = self._pattern.index("]", self._pos + 1)
+            choices = self._class(self._pattern[self._pos:end])
+            self._pos = end + 1
+            return lambda: self.rng.choice(choices)
+        if char == "\\":
+            escaped = self._pattern[self._pos]
+            self._pos += 1
+            choices = self._CLASSES.get(escaped, escaped)
+            return lambda: self.rng.choice(choices)
+        if char == ".":
+            return lambda: self.rng.choice(string.ascii_letters)
+        if char in "*+?{":
+            raise ValueError("dangling quantifier")
+        return lambda: char
+
+    def _class(self, body: str) -> str:
+        if body.startswith("^"):
+            raise ValueError("negated classes are not supported")
+        chars, i = [], 0
+        while i < len(body):
+            if body[i] == "\\" and i + 1 < len(body):
+                chars.extend(self._CLASSES.get(body[i + 1], body[i + 1]))
+                i += 2
+            elif i + 2 < len(body) and body[i + 1] == "-":
+                chars.extend(chr(c) for c in range(ord(body[i]), ord(body[i + 2]) + 1))
+                i += 3
+            else:
+                chars.append(body[i])
+                i += 1
+        return "".join(chars)
+
+    def _quantifier(self) -> Tuple[int, int]:
+        char = self._peek()
+        if char == "?":
+            self._pos += 1
+            return 0, 1
+        if char == "*":
+            self._pos += 1
+            return 0, 3
+        if char == "+":
+            self._pos += 1
+            return 1, 3
+        if char == "{":
+            end = self._pattern.index("}", self._pos)
+            low, _, high = self._pattern[self._pos + 1:end].partition(",")
+            self._pos = end + 1
+            return int(low), int(high) if high else (int(low) + 3 if _ else int(low))
+        return 1, 1
+
+
+class DataSynthesizer:
+    """
+    Generates test data locally from resolved JSON schemas: valid values, boundary
+    values and invalid values (each with the rule it violates). Output is fully
+    determined by the seed, so generated fixtures are reproducible across runs.
+    """
+
+    def __init__(self, seed: int = 0):
+        """
+        :param seed: Seed of the random generator.
+        """
+        self.rng = random.Random(seed)
+        self._patterns = _PatternSampler(self.rng)
+
+    # --- valid values ---
+
+    def valid(self, schema: Optional[dict], depth: int = 0) -> Any:
+        """
+        Generates a random value satisfying the schema.
+
+        :param schema: A resolved JSON schema.
+        :return: A valid value (None for empty or recursive schemas).
+        """
+        if not schema or "$ref" in schema or depth > _MAX_DEPTH:
+            return None
+        if schema.get("enum"):
+            return self.rng.choice(schema["enum"])
+        if "const" in schema:
+            return schema["const"]
+        if schema.get("allOf"):
+            merged = {}
+            for part in schema["allOf"]:
+                value = self.valid(part, depth + 1)
+                if isinstance(value, dict):
+                    merged.update(value)
+            return merged
+        for combinator in ("oneOf", "anyOf"):
+            if schema.get(combinator):
+                return self.valid(schema[combinator][0], depth + 1)
+
+        schema_type = _schema_type(schema)
+        if schema_type == "object":
+            return {
+                name: self.valid(prop, depth + 1)
+                for name, prop in (schema.get("properties") or {}).items()
+                if name in schema.get("required", []) or self.rng.random() < 0.7
+            }
+        if schema_type == "array":
+            low = schema.get("minItems", 1)
+            high = max(low, min(schema.get("maxItems", low + 2), low + 2))
+            return [self.valid(schema.get("items"), depth + 1) for _ in range(self.rng.randint(low, high))]
+        if schema_type in ("integer", "number"):
+            low, high = self._numeric_range(schema)
+            multiple = schema.get("multipleOf")
+            if multiple:
+                # A random multiple inside [low, high]; with none in range the schema is unsatisfiable.
+                first, last = math.ceil(low / multiple), math.floor(high / multiple)
+                if first <= last:
+                    value = self.rng.randint(first, last) * multiple
+                    return int(value) if schema_type == "integer" else round(value, 10)
+            if schema_type == "integer":
+                return self.rng.randint(math.ceil(low), math.floor(high)) if math.ceil(low) <= high else int(low)
+            return round(self.rng.uniform(low, high), 2)
+        if schema_type == "boolean":
+            return self.rng.random() < 0.5
+        if schema_type == "null":
+            return None
+        return self._string(schema)
+
+    def _numeric_range(self, schema: dict) -> Tuple[float, float]:
+        integer = _schema_type(schema) == "integer"
+        step = 1 if integer else 0.01
+        low = schema.get("minimum", 0)
+        high = schema.get("maximum", max(low, 0) + 1000)
+        if schema.get("exclusiveMinimum") is True:
+            low += step
+        elif isinstance(schema.get("exclusiveMinimum"), (int, float)) and not isinstance(schema.get("exclusiveMinimum"), bool):
+            low = schema["exclusiveMinimum"] + step
+        if schema.get("exclusiveMaximum") is True:
+            high -= step
+        elif isinstance(schema.get("exclusiveMaximum"), (int, float)) and not isinstance(schema.get("exclusiveMaximum"), bool):
+            high = schema["exclusiveMaximum"] - step
+        return low, max(low, high)
+
+    def _string(self, schema: dict, length: Optional[int] = None) -> str:
+        if schema.get("pattern") and length is None:
+            value = self._patterns.sample(schema["pattern"])
+            if value is not None:
+                return value
+            example = example_from_schema(schema)
+            if isinstance(example, str):
+                return example
+        min_length = schema.get("minLength", 0)
+        max_length = schema.get("maxLength", max(min_length, 12))
+        template = _FORMAT_TEMPLATES.get(schema.get("format"), "")
+        if schema.get("format") == "uuid":
+            value = "%08x-%04x-4%03x-8%03x-%012x" % tuple(self.rng.getrandbits(bits) for bits in (32, 16, 12, 12, 48))
+        elif template:
+            value = template.format(n=self.rng.randint(1, 9999), day=self.rng.randint(1, 28), octet=self.rng.randint(1, 254))
+        else:
+            size = length if length is not None else self.rng.randint(max(min_length, 1), max(max_length, 1))
+            return "".join(self.rng.choice(string.ascii_letters) for _ in range(size))[:max_length] if max_length else ""
+        return value
+
+    # --- boundary values ---
+
+    def boundary(self, schema: Optional[dict]) -> List[Any]:
+        """
+        Generates valid values at the edges of the schema's constraints.
+
+        :param schema: A resolved JSON schema.
+        :return: A list of distinct valid values.
+        """
+        if not schema or "$ref" in schema:
+            return []
+        if schema.get("enum"):
+            return list(schema["enum"])
+        schema_type = _schema_type(schema)
+        values: List[Any] = []
+        if schema_type in ("integer", "number"):
+            low, high = self._numeric_range(schema)
+            values = [low, high] if "minimum" in schema or "maximum" in schema else [0, -1, 2 ** 31 - 1]
+            if schema_type == "integer":
+                values = [int(v) for v in values]
+        elif schema_type == "string" and not schema.get("format") and not schema.get("pattern"):
+            min_length = schema.get("minLength", 0)
+            values = [self._string(schema, min_length)]
+            if "maxLength" in schema:
+                values.append(self._string(schema, schema["maxLength"]))
+            else:
+                values.append("ü€𝄞 '\"<>&")
+        elif schema_type == "array":
+            low = schema.get("minItems", 0)
+            values = [[self.valid(schema.get("items")) for _ in range(low)]]
+            if "maxItems" in schema:
+                values.append([self.valid(schema.get("items")) for _ in range(schema["maxItems"])])
+        elif schema_type == "object":
+            required = set(schema.get("required", []))
+            values = [{name: self.valid(prop) for name, prop in (schema.get("properties") or {}).items() if name in required}]
+            for name, prop in (schema.get("properties") or {}).items():
+                for edge in self.boundary(prop)[:2]:
+                    payload = self.valid(schema)
+                    payload[name] = edge
+                    values.append(payload)
+        elif schema_type == "boolean":
+            values = [True, False]
+        distinct = []
+        for value in values:
+            if value not in distinct:
+                distinct.append(value)
+        return distinct
+
+    # --- invalid values ---
+
+    def invalid(self, schema: Optional[dict], depth: int = 0) -> List[Dict[str, Any]]:
+        """
+        Generates values that each violate one rule of the schema.
+
+        :param schema: A resolved JSON schema.
+        :return: A list of {'reason': ..., 'value': ...}.
+        """
+        if not schema or "$ref" in schema or depth > 2:
+            return []
+        schema_type = _schema_type(schema)
+        cases = []
+        wrong_type = {"string": 12345, "integer": "not-a-number", "number": "not-a-number",
+                      "boolean": "not-a-boolean", "array": {"unexpected": "object"}, "object": ["unexpected", "array"]}
+        cases.append({"reason": f"type is not {schema_type}", "value": wrong_type.get(schema_type, 12345)})
+        if not schema.get("nullable"):
+            cases.append({"reason": "null value", "value": None})
+        if schema.get("enum"):
+            cases.append({"reason": "value not in enum", "value": "__not_in_enum__"})
+        if schema_type in ("integer", "number"):
+            low, high = self._numeric_range(schema)
+            step = 1 if schema_type == "integer" else 0.01
+            if "minimum" in schema or "exclusiveMinimum" in schema:
+                cases.append({"reason": "below minimum", "value": low - step})
+            if "maximum" in schema or "exclusiveMaximum" in schema:
+                cases.append({"reason": "above maximum", "value": high + step})
+        elif schema_type == "string":
+            if schema.get("minLength"):
+                cases.append({"reason": "shorter than minLength", "value": "x" * (schema["minLength"] - 1)})
+            if "maxLength" in schema:
+                cases.append({"reason": "longer than maxLength", "value": "x" * (schema["maxLength"] + 1)})
+            if schema.get("pattern") and not re.search(schema["pattern"], "!~"):
+                cases.append({"reason": "does not match pattern", "value": "!~"})
+            if schema.get("format") in _FORMAT_TEMPLATES:
+                cases.append({"reason": f"not a valid {schema['format']}", "value": "invalid-format"})
+        elif schema_type == "array":
+            if schema.get("minItems"):
+                cases.append({"reason": "fewer than minItems", "value": []})
+            if "maxItems" in schema:
+                cases.append({"reason": "more than maxItems",
+                              "value": [self.valid(schema.get("items")) for _ in range(schema["maxItems"] + 1)]})
+        elif schema_type == "object":
+            properties = schema.get("properties") or {}
+            for name in schema.get("required", []):
+                payload = self.valid(schema)
+                payload.pop(name, None)
+                cases.append({"reason": f"missing required property '{name}'", "value": payload})
+            for name, prop in properties.items():
+                for case in self.invalid(prop, depth + 1)[:2]:
+                    payload = self.valid(schema)
+                    payload[name] = case["value"]
+                    cases.append({"reason": f"'{name}': {case['reason']}", "value": payload})
+        return cases
+
+    # --- fixtures ---
+
+    def endpoint_data(self, endpoint: dict) -> Dict[str, Any]:
+        """
+        Builds the fixture data of one operation.
+
+        :param endpoint: A normalized endpoint.
+        :return: {'valid': {path_params, query, body}, 'boundary': [bodies], 'invalid': [{reason, body}]}.
+        """
+        parameters = endpoint.get("parameters", [])
+        body_schema = (endpoint.get("request_body") or {}).get("schema")
+        data = {
+            "valid": {
+                "path_params": {p["name"]: self.valid(p.get("schema") or {"type": "string"})
+                                for p in parameters if p.get("in") == "path"},
+                "query": {p["name"]: self.valid(p.get("schema") or {"type": "string"})
+                          for p in parameters if p.get("in") == "query" and p.get("required")},
+                "body": self.valid(body_schema) if body_schema else None,
+            },
+            "boundary": self.boundary(body_schema) if body_schema else [],
+            "invalid": [{"reason": case["reason"], "body": case["value"]} for case in self.invalid(body_schema)]
+            if body_schema else [],
+        }
+        invalid_params = []
+        for p in parameters:
+            if p.get("in") in ("path", "query"):
+                for case in self.invalid(p.get("schema") or {"type": "string"})[:3]:
+                    if case["value"] is not None:
+                        invalid_params.append({"in": p["in"], "name": p["name"], "reason": case["reason"],
+                                               "value": case["value"]})
+        data["invalid_params"] = invalid_params
+        return data
+
+
+def build_test_data(unified_spec: dict, seed: int = 0) -> Dict[str, Dict[str, Any]]:
+    """
+    Builds the fixture data for every operation of a normalized spec, keyed as 'METHOD /path'.
+
+    :param unified_spec: A normalized specification.
+    :param seed: Seed for reproducible values.
+    :return: A JSON-serializable dictionary.
+    """
+    synthesizer = DataSynthesizer(seed)
+    return {
+        f"{endpoint['method'].upper()} {endpoint['path']}": synthesizer.endpoint_data(endpoint)
+        for endpoint in unified_spec.get("endpoints", [])
+    }
+
+
+# --- Example Usage ---
+# if __name__ == "__main__":
+#     from core.spec_processor.spec_loader import load_spec
+#     from core.spec_processor.spec_normalizer import normalize_spec
+#     data = build_test_data(normalize_spec(load_spec("api_specs/petstore.yaml")), seed=42)
+#     print(data["POST /pets"]["invalid"][:3])
@@ -0,0 +1,209 @@
+# ai-test-generator/core/spec_processor/dependency_graph.py
+
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+
+# Order in which a resource's consumers appear in a workflow: read it, change it,
+# act on it, and delete it last.
+_METHOD_RANK = {"GET": 0, "HEAD": 0, "PUT": 1, "PATCH": 1, "POST": 2, "DELETE": 3}
+
+_ID_SUFFIX = re.compile(r"(?:_id|Id|ID)$")
+
+
+def endpoint_key(endpoint: dict) -> str:
+    """Returns the 'METHOD /path' key of a normalized endpoint."""
+    return f"{endpoint['method'].upper()} {endpoint['path']}"
+
+
+def _singular(word: str) -> str:
+    word = word.lower()
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("ses", "xes")):
+        return word[:-2]
+    return word[:-1] if word.endswith("s") and not word.endswith("ss") else word
+
+
+def _resource(path: str) -> str:
+    """Returns the resource a path creates or lists, e.g. 'pet' for /pets or /stores/{id}/pets."""
+    segments = [segment for segment in path.strip("/").split("/") if segment and "{" not in segment]
+    return _singular(segments[-1]) if segments else ""
+
+
+def _object_schema(schema: Optional[dict]) -> dict:
+    """Returns the object schema of a response, unwrapping arrays."""
+    if not isinstance(schema, dict):
+        return {}
+    if schema.get("type") == "array":
+        return _object_schema(schema.get("items"))
+    return schema if schema.get("properties") else {}
+
+
+def _success_schema(endpoint: dict) -> dict:
+    for status in sorted(endpoint.get("responses") or {}):
+        if status.startswith("2"):
+            return _object_schema(endpoint["responses"][status].get("schema"))
+    return {}
+
+
+def _inputs(endpoint: dict) -> List[dict]:
+    """
+    Lists the identifier inputs of an operation: path parameters, and `<resource>Id`
+    fields of its request body.
+    """
+    inputs = [{"name": p["name"], "in": "path"} for p in endpoint.get("parameters", []) if p.get("in") == "path"]
+    body_schema = _object_schema((endpoint.get("request_body") or {}).get("schema"))
+    for field in body_schema.get("properties", {}):
+        if _ID_SUFFIX.search(field):
+            inputs.append({"name": field, "in": "body"})
+    return inputs
+
+
+class DependencyGraph:
+    """
+    Producer/consumer graph between the operations of a normalized spec.
+
+    An edge A -> B means B needs a value produced by A: for example POST /pets
+    produces `id`, which GET /pets/{petId} consumes as its path parameter, and
+    POST /orders consumes as the `petId` field of its body. Edges are inferred from
+    path parameters, response fields and request fields; each carries the binding
+    (consumer input, producer field) a workflow uses to pass the value along.
+    """
+
+    def __init__(self, unified_spec: dict):
+        """
+        :param unified_spec: A normalized specification (see core/spec_processor/spec_normalizer.py).
+        """
+        self.endpoints: "OrderedDict[str, dict]" = OrderedDict(
+            (endpoint_key(endpoint), endpoint) for endpoint in unified_spec.get("endpoints", [])
+        )
+        self.producers: Dict[str, List[dict]] = {key: [] for key in self.endpoints}
+        self.consumers: Dict[str, List[dict]] = {key: [] for key in self.endpoints}
+        self.creators = self._creators()
+        self._build()
+
+    def _creators(self) -> Dict[str, str]:
+        """Maps each resource to the operation that creates it (a POST returning an `id`)."""
+        creators = {}
+        for key, endpoint in self.endpoints.items():
+            if endpoint["method"].upper() == "POST" and "id" in _success_schema(endpoint).get("properties", {}):
+                creators.setdefault(_resource(endpoint["path"]), key)
+        return creators
+
+    def _find_producer(self, consumer_key: str, consumer: dict, name: str, location: str,
+                       creators: Dict[str, str]) -> Optional[dict]:
+        """Finds the operation producing an input, and the response field that holds it."""
+        # 1. The item under a collection: /pets/{petId} is produced by POST /pets.
+        if location == "path":
+            marker = "{" + name + "}"
+            collection = consumer["path"].split(marker)[0].rstrip("/")
+            creator = f"POST {collection}"
+            if creator in self.endpoints and creator != consumer_key \
+                    and "id" in _success_schema(self.endpoints[creator]).get("properties", {}):
+                return {"producer": creator, "field": "id"}
+
+        # 2. A `<resource>Id` input is produced by the creator of that resource.
+        resource = _singular(_ID_SUFFIX.sub("", name)) if _ID_SUFFIX.search(name) else ""
+        creator = creators.get(resource)
+        if creator and creator != consumer_key:
+            return {"producer": creator, "field": "id"}
+
+        # 3. Any creator whose response has a field with exactly the input's name.
+        for creator in creators.values():
+            if creator != consumer_key and name in _success_schema(self.endpoints[creator]).get("properties", {}):
+                return {"producer": creator, "field": name}
+        return None
+
+    def _build(self) -> None:
+        creators = self.creators
+        for key, endpoint in self.endpoints.items():
+            for item in _inputs(endpoint):
+                if item["in"] == "body" and item["name"] == "id":
+                    continue
+                match = self._find_producer(key, endpoint, item["name"], item["in"], creators)
+                if match:
+                    edge = {"producer": match["producer"], "consumer": key, "input": item["name"],
+                            "in": item["in"], "field": match["field"]}
+                    self.producers[key].append(edge)
+                    self.consumers[match["producer"]].append(edge)
+
+    def dependencies(self, key: str, _seen: Set[str] = None) -> List[str]:
+        """
+        Returns the operations that must run before `key`, in execution order.
+
+        :param key: An endpoint key.
+        :return: A topologically ordered list of endpoint keys (excluding `key`).
+        """
+        _seen = _seen if _seen is not None else {key}
+        ordered = []
+        for edge in self.producers.get(key, []):
+            producer = edge["producer"]
+            if producer not in _seen:
+                _seen.add(producer)
+                ordered.extend(self.dependencies(producer, _seen))
+                ordered.append(producer)
+        return ordered
+
+    def workflows(self) -> List[dict]:
+        """
+        Extracts one workflow per created resource: the operations creating its
+        prerequisites, its creation, then the operations consuming it (reads first,
+        deletes last).
+
+        :return: A list of {'name', 'root', 'steps': [endpoint keys], 'bindings': [edges], 'requires': [roots]}.
+        """
+        workflows = []
+        creator_keys = set(self.creators.values())
+        for root in self.creators.values():
+            prerequisites = self.dependencies(root)
+            consumers = sorted(
+                {edge["consumer"] for edge in self.consumers[root]
+                 if edge["consumer"] != root and edge["consumer"] not in creator_keys},
+                key=lambda k: (_METHOD_RANK.get(self.endpoints[k]["method"].upper(), 2), k),
+            )
+            steps = prerequisites + [root] + consumers
+            step_set = set(steps)
+            bindings = [edge for step in steps for edge in self.producers[step] if edge["producer"] in step_set]
+            workflows.append({
+                "name": f"{_resource(self.endpoints[root]['path']) or 'root'}_lifecycle",
+                "root": root,
+                "steps": steps,
+                "bindings": bindings,
+                "requires": [key for key in prerequisites if key in creator_keys],
+            })
+        return workflows
+
+    @staticmethod
+    def batches(workflows: List[dict]) -> List[List[dict]]:
+        """
+        Groups workflows into topological levels: each level only requires resources
+        created by workflows of earlier levels, so the workflows within a level are
+        independent of each other.
+
+        :param workflows: Workflows as returned by workflows().
+        :return: A list of levels, each a list of workflows.
+        """
+        by_root = {workflow["root"]: workflow for workflow in workflows}
+        levels: Dict[str, int] = {}
+
+        def _level(root: str, stack: Set[str]) -> int:
+            if root not in levels:
+                requires = [r for r in by_root[root]["requires"] if r in by_root and r not in stack]
+                levels[root] = 1 + max((_level(r, stack | {root}) for r in requires), default=-1)
+            return levels[root]
+
+        grouped: Dict[int, List[dict]] = {}
+        for workflow in workflows:
+            grouped.setdefault(_level(workflow["root"], {workflow["root"]}), []).append(workflow)
+        return [grouped[level] for level in sorted(grouped)]
+
+
+# --- Example Usage ---
+# if __name__ == "__main__":
+#     from core.spec_processor.spec_loader import load_spec
+#     from core.spec_processor.spec_normalizer import normalize_spec
+#     graph = DependencyGraph(normalize_spec(load_spec("api_specs/petstore.yaml")))
+#     for level, workflows in enumerate(graph.batches(graph.workflows())):
+#         for workflow in workflows:
+#             print(level, workflow["name"], " -> ".join(workflow["steps"]))
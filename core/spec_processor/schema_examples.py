@@ -0,0 +1,59 @@
+# ai-test-generator/core/spec_processor/schema_examples.py
+
+from typing import Optional
+
+# Placeholder values per JSON schema string format.
+_FORMAT_EXAMPLES = {
+    "date-time": "2024-01-01T00:00:00Z",
+    "date": "2024-01-01",
+    "email": "user@example.com",
+    "uuid": "00000000-0000-4000-8000-000000000000",
+    "uri": "https://example.com",
+    "hostname": "example.com",
+    "ipv4": "127.0.0.1",
+}
+
+
+def example_from_schema(schema: Optional[dict], depth: int = 0):
+    """
+    Builds a schema-valid example value, preferring explicit examples, defaults and enums.
+
+    :param schema: A resolved JSON schema.
+    :param depth: Current nesting depth (recursion is capped).
+    :return: An example value.
+    """
+    if not schema or depth > 8:
+        return None
+    for key in ("example", "default"):
+        if key in schema:
+            return schema[key]
+    if schema.get("enum"):
+        return schema["enum"][0]
+    for combinator in ("allOf", "oneOf", "anyOf"):
+        if schema.get(combinator):
+            if combinator == "allOf":
+                merged = {}
+                for part in schema["allOf"]:
+                    value = example_from_schema(part, depth + 1)
+                    if isinstance(value, dict):
+                        merged.update(value)
+                return merged
+            return example_from_schema(schema[combinator][0], depth + 1)
+
+    schema_type = schema.get("type") or ("object" if "properties" in schema else "string")
+    if schema_type == "object":
+        return {
+            name: example_from_schema(prop, depth + 1)
+            for name, prop in (schema.get("properties") or {}).items()
+        }
+    if schema_type == "array":
+        return [example_from_schema(schema.get("items"), depth + 1)]
+    if schema_type == "integer":
+        return int(schema.get("minimum", 1))
+    if schema_type == "number":
+        return float(schema.get("minimum", 1.0))
+    if schema_type == "boolean":
+        return True
+    value = _FORMAT_EXAMPLES.get(schema.get("format"), "string")
+    min_length = schema.get("minLength", 0)
+    return value.ljust(min_length, "x") if len(value) < min_length else value
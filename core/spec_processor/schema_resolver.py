@@ -0,0 +1,66 @@
+# ai-test-generator/core/spec_processor/schema_resolver.py
+
+from typing import Any, Set
+
+
+def resolve_pointer(spec: dict, ref: str) -> Any:
+    """
+    Resolves a local JSON pointer such as '#/components/schemas/Pet'.
+
+    :param spec: The full specification.
+    :param ref: The $ref value.
+    :return: The referenced node.
+    :raises ValueError: If the reference is external or cannot be resolved.
+    """
+    if not ref.startswith("#/"):
+        raise ValueError(f"Only local references are supported: {ref}")
+    node = spec
+    for part in ref[2:].split("/"):
+        part = part.replace("~1", "/").replace("~0", "~")
+        if not isinstance(node, dict) or part not in node:
+            raise ValueError(f"Unresolvable reference: {ref}")
+        node = node[part]
+    return node
+
+
+def resolve_refs(node: Any, spec: dict, _seen: Set[str] = None) -> Any:
+    """
+    Returns a copy of `node` with all local $refs inlined. Recursive references are
+    left as {'$ref': ...} at the point where they would recurse.
+
+    :param node: A schema (or any part of the spec).
+    :param spec: The full specification used to resolve references.
+    :return: The resolved node.
+    """
+    _seen = _seen or set()
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            if ref in _seen:
+                return {"$ref": ref}
+            return resolve_refs(resolve_pointer(spec, ref), spec, _seen | {ref})
+        return {key: resolve_refs(value, spec, _seen) for key, value in node.items()}
+    if isinstance(node, list):
+        return [resolve_refs(item, spec, _seen) for item in node]
+    return node
+
+
+def collect_refs(node: Any) -> Set[str]:
+    """
+    Collects the $ref targets used directly within a node (without following them).
+
+    :param node: Any part of the specification.
+    :return: A set of reference strings.
+    """
+    refs = set()
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            ref = current.get("$ref")
+            if isinstance(ref, str):
+                refs.add(ref)
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+    return refs
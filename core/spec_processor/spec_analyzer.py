@@ -1,9 +1,74 @@
 # ai-test-generator/core/spec_processor/spec_analyzer.py
 
+from .schema_resolver import resolve_refs
+
+# Keys of an OpenAPI path item that describe operations (others, such as
+# "parameters" or "summary", are shared path-level fields).
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+
+def _first_content(content: dict) -> tuple:
+    """
+    Picks the preferred media type from an OpenAPI content map (JSON first).
+
+    :param content: The 'content' mapping of a request body or response.
+    :return: A tuple of (content type, schema), or (None, None) if empty.
+    """
+    if not content:
+        return None, None
+    content_type = "application/json" if "application/json" in content else next(iter(content))
+    return content_type, (content[content_type] or {}).get("schema")
+
+
+def _describe_operation(spec: dict, path: str, method: str, operation: dict, shared_parameters: list) -> dict:
+    """
+    Extracts the parameters, request body and responses of one operation, with $refs resolved.
+
+    :return: A dictionary describing the endpoint.
+    """
+    parameters = {}
+    for parameter in resolve_refs(shared_parameters + operation.get("parameters", []), spec):
+        # Operation-level parameters override path-level ones with the same name and location.
+        parameters[(parameter.get("name"), parameter.get("in"))] = {
+            "name": parameter.get("name"),
+            "in": parameter.get("in"),
+            "required": parameter.get("required", parameter.get("in") == "path"),
+            "schema": parameter.get("schema", {}),
+        }
+
+    request_body = None
+    if "requestBody" in operation:
+        body = resolve_refs(operation["requestBody"], spec)
+        content_type, schema = _first_content(body.get("content", {}))
+        request_body = {"required": body.get("required", False), "content_type": content_type, "schema": schema}
+
+    responses = {}
+    for status, response in (operation.get("responses") or {}).items():
+        response = resolve_refs(response or {}, spec)
+        content_type, schema = _first_content(response.get("content", {}))
+        responses[str(status)] = {
+            "description": response.get("description", ""),
+            "content_type": content_type,
+            "schema": schema,
+        }
+
+    return {
+        "path": path,
+        "method": method.upper(),
+        "operation_id": operation.get("operationId"),
+        "summary": operation.get("summary", ""),
+        "tags": operation.get("tags", []),
+        "parameters": list(parameters.values()),
+        "request_body": request_body,
+        "responses": responses,
+    }
+
+
 def analyze_spec(spec: dict) -> dict:
     """
     Analyzes the given specification and extracts key details.
-    For an OpenAPI spec, it extracts the endpoints and their HTTP methods.
+    For an OpenAPI spec, it extracts the endpoints with their HTTP methods,
+    parameters, request bodies and responses (with schema references resolved).
 
     :param spec: The specification as a dictionary.
     :return: A dictionary with analysis details (e.g., list of endpoints).
@@ -13,9 +78,12 @@ def analyze_spec(spec: dict) -> dict:
 
     # OpenAPI specs typically define endpoints under the "paths" key.
     paths = spec.get("paths", {})
-    for path, methods in paths.items():
-        for method in methods.keys():
-            endpoints.append({"path": path, "method": method.upper()})
+    for path, path_item in paths.items():
+        shared_parameters = path_item.get("parameters", [])
+        for method, operation in path_item.items():
+            if method.lower() not in HTTP_METHODS:
+                continue
+            endpoints.append(_describe_operation(spec, path, method, operation or {}, shared_parameters))
     
     analysis["endpoints"] = endpoints
     return analysis
@@ -0,0 +1,247 @@
+# ai-test-generator/core/spec_processor/spec_diff.py
+
+import hashlib
+import json
+from collections import deque
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+from .schema_resolver import collect_refs, resolve_refs
+from .spec_analyzer import HTTP_METHODS
+
+
+def _digest(node: Any) -> str:
+    """Hashes a spec node with its $refs left unresolved."""
+    return hashlib.sha1(json.dumps(node, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _operations(spec: dict) -> Dict[str, dict]:
+    """
+    Returns the operations of an OpenAPI document keyed as 'METHOD /path', with
+    path-level parameters merged in so they are compared with the operation.
+    """
+    operations = {}
+    for path, path_item in (spec.get("paths") or {}).items():
+        shared_parameters = path_item.get("parameters", [])
+        for method, operation in path_item.items():
+            if method.lower() in HTTP_METHODS:
+                operation = dict(operation or {})
+                if shared_parameters:
+                    operation["parameters"] = shared_parameters + operation.get("parameters", [])
+                operations[f"{method.upper()} {path}"] = operation
+    return operations
+
+
+def _components(spec: dict) -> Dict[str, Any]:
+    """Returns every reusable component keyed by its JSON pointer (e.g. '#/components/schemas/Pet')."""
+    components = {}
+    for kind, entries in (spec.get("components") or {}).items():
+        for name, node in (entries or {}).items():
+            pointer_name = name.replace("~", "~0").replace("/", "~1")
+            components[f"#/components/{kind}/{pointer_name}"] = node
+    return components
+
+
+def _affected_components(old_components: dict, new_components: dict) -> Set[str]:
+    """
+    Returns the components that changed, plus every component that (transitively)
+    references one of them, following $ref edges of both versions in reverse.
+    """
+    changed = {
+        ref for ref in set(old_components) | set(new_components)
+        if ref not in old_components or ref not in new_components
+        or _digest(old_components[ref]) != _digest(new_components[ref])
+    }
+    referrers: Dict[str, Set[str]] = {}
+    for components in (old_components, new_components):
+        for ref, node in components.items():
+            for target in collect_refs(node):
+                referrers.setdefault(target, set()).add(ref)
+
+    affected = set(changed)
+    queue = deque(changed)
+    while queue:
+        for referrer in referrers.get(queue.popleft(), ()):
+            if referrer not in affected:
+                affected.add(referrer)
+                queue.append(referrer)
+    return affected
+
+
+def _schema_type(schema: dict) -> Any:
+    return schema.get("type") if isinstance(schema, dict) else None
+
+
+def compare_schemas(old: Any, new: Any, location: str, direction: str, _depth: int = 0) -> Iterator[Tuple[str, str, bool]]:
+    """
+    Compares two resolved schemas and yields (location, description, breaking) tuples.
+    Whether a change breaks clients depends on the direction of the data: clients send
+    request schemas and read response schemas.
+
+    :param old: The previous schema.
+    :param new: The current schema.
+    :param location: Human-readable location used in the descriptions.
+    :param direction: 'request' or 'response'.
+    """
+    if _depth > 20 or not isinstance(old, dict) or not isinstance(new, dict) or old == new:
+        return
+    if "$ref" in old or "$ref" in new:
+        # Recursive reference left unresolved; compared where it was first expanded.
+        return
+    if _schema_type(old) != _schema_type(new):
+        yield location, f"type changed from {_schema_type(old)} to {_schema_type(new)}", True
+        return
+
+    old_enum, new_enum = old.get("enum"), new.get("enum")
+    if old_enum is None and new_enum is not None:
+        yield location, "enum introduced", direction == "request"
+    elif old_enum is not None and new_enum is None:
+        yield location, "enum removed", direction == "response"
+    elif old_enum != new_enum:
+        # Narrowing breaks senders (requests), widening breaks readers (responses).
+        removed = [value for value in old_enum if value not in new_enum]
+        added = [value for value in new_enum if value not in old_enum]
+        if removed:
+            yield location, f"enum values removed: {removed}", direction == "request"
+        if added:
+            yield location, f"enum values added: {added}", direction == "response"
+
+    old_properties, new_properties = old.get("properties") or {}, new.get("properties") or {}
+    old_required, new_required = set(old.get("required") or []), set(new.get("required") or [])
+    for name in old_properties:
+        if name not in new_properties:
+            yield f"{location}.{name}", "property removed", direction == "response" or name in old_required
+    for name in new_properties:
+        if name not in old_properties:
+            yield f"{location}.{name}", "property added", direction == "request" and name in new_required
+    for name in sorted(new_required - old_required):
+        if name in old_properties:
+            yield f"{location}.{name}", "property became required", direction == "request"
+    for name in sorted(old_required - new_required):
+        if name in new_properties:
+            yield f"{location}.{name}", "property became optional", direction == "response"
+    for name in old_properties:
+        if name in new_properties:
+            yield from compare_schemas(old_properties[name], new_properties[name], f"{location}.{name}", direction, _depth + 1)
+
+    if "items" in old or "items" in new:
+        yield from compare_schemas(old.get("items", {}), new.get("items", {}), f"{location}[]", direction, _depth + 1)
+
+    constraint_keys = ("format", "pattern", "minimum", "maximum", "minLength", "maxLength", "minItems", "maxItems")
+    for key in constraint_keys:
+        if old.get(key) != new.get(key):
+            # Tightened request constraints can reject previously valid input.
+            yield location, f"{key} changed from {old.get(key)} to {new.get(key)}", direction == "request"
+
+
+def _compare_operation(key: str, old_spec: dict, new_spec: dict, old: dict, new: dict) -> Iterator[Tuple[str, str, bool]]:
+    """Compares two versions of an operation, with $refs resolved, and yields its changes."""
+    old, new = resolve_refs(old, old_spec), resolve_refs(new, new_spec)
+
+    def _parameters(operation):
+        return {(p.get("name"), p.get("in")): p for p in operation.get("parameters", []) if isinstance(p, dict)}
+
+    old_parameters, new_parameters = _parameters(old), _parameters(new)
+    for (name, location), parameter in old_parameters.items():
+        if (name, location) not in new_parameters:
+            yield f"{key} {location} parameter {name}", "parameter removed", True
+    for (name, location), parameter in new_parameters.items():
+        label = f"{key} {location} parameter {name}"
+        previous = old_parameters.get((name, location))
+        if previous is None:
+            yield label, "parameter added", bool(parameter.get("required"))
+            continue
+        if parameter.get("required") and not previous.get("required"):
+            yield label, "parameter became required", True
+        yield from compare_schemas(previous.get("schema", {}), parameter.get("schema", {}), label, "request")
+
+    old_body, new_body = old.get("requestBody"), new.get("requestBody")
+    if old_body and not new_body:
+        yield f"{key} request body", "request body removed", True
+    elif new_body and not old_body:
+        yield f"{key} request body", "request body added", bool(new_body.get("required"))
+    elif old_body and new_body:
+        if new_body.get("required") and not old_body.get("required"):
+            yield f"{key} request body", "request body became required", True
+        for media_type, content in (old_body.get("content") or {}).items():
+            new_content = (new_body.get("content") or {}).get(media_type)
+            if new_content is None:
+                yield f"{key} request body {media_type}", "media type removed", True
+            else:
+                yield from compare_schemas((content or {}).get("schema", {}), (new_content or {}).get("schema", {}),
+                                           f"{key} request body", "request")
+
+    old_responses, new_responses = old.get("responses") or {}, new.get("responses") or {}
+    for status in old_responses:
+        if str(status) not in {str(s) for s in new_responses}:
+            yield f"{key} response {status}", "response removed", str(status).startswith("2")
+    for status, response in new_responses.items():
+        previous = old_responses.get(status)
+        if previous is None:
+            yield f"{key} response {status}", "response added", False
+            continue
+        for media_type, content in ((previous or {}).get("content") or {}).items():
+            new_content = ((response or {}).get("content") or {}).get(media_type)
+            if new_content is None:
+                yield f"{key} response {status} {media_type}", "media type removed", True
+            else:
+                yield from compare_schemas((content or {}).get("schema", {}), (new_content or {}).get("schema", {}),
+                                           f"{key} response {status}", "response")
+
+
+def diff_specs(old_spec: dict, new_spec: dict) -> Dict[str, Any]:
+    """
+    Compares two versions of an OpenAPI document at the operation and schema level.
+
+    Operations and components are first compared by hash, with $refs unresolved, and
+    schema changes are propagated to every operation that references them, directly or
+    through other components. Only operations flagged this way are resolved and compared
+    in detail, so unchanged parts of large specs cost a single hash each.
+
+    :param old_spec: The previous OpenAPI document.
+    :param new_spec: The current OpenAPI document.
+    :return: A dictionary with the classified changes and the affected endpoint keys
+             ('METHOD /path'), split into added, removed, breaking and affected sets.
+    """
+    old_operations, new_operations = _operations(old_spec), _operations(new_spec)
+    affected_components = _affected_components(_components(old_spec), _components(new_spec))
+
+    added = sorted(set(new_operations) - set(old_operations))
+    removed = sorted(set(old_operations) - set(new_operations))
+    changes: List[Dict[str, Any]] = [
+        {"endpoint": key, "location": key, "change": "operation added", "breaking": False} for key in added
+    ] + [
+        {"endpoint": key, "location": key, "change": "operation removed", "breaking": True} for key in removed
+    ]
+
+    modified = []
+    for key in sorted(set(old_operations) & set(new_operations)):
+        old, new = old_operations[key], new_operations[key]
+        if _digest(old) != _digest(new) or (collect_refs(old) | collect_refs(new)) & affected_components:
+            modified.append(key)
+            operation_changes = list(_compare_operation(key, old_spec, new_spec, old, new))
+            if not operation_changes:
+                # Documentation-only edits (summaries, descriptions, examples).
+                operation_changes = [(key, "operation changed", False)]
+            changes.extend(
+                {"endpoint": key, "location": location, "change": description, "breaking": breaking}
+                for location, description, breaking in operation_changes
+            )
+
+    return {
+        "changes": changes,
+        "added_endpoints": added,
+        "removed_endpoints": removed,
+        "modified_endpoints": modified,
+        "breaking_endpoints": sorted({change["endpoint"] for change in changes if change["breaking"]}),
+        "affected_endpoints": sorted(set(added) | set(removed) | set(modified)),
+        "affected_components": sorted(affected_components),
+    }
+
+
+# --- Example Usage ---
+# if __name__ == "__main__":
+#     from core.spec_processor.spec_loader import load_spec
+#     diff = diff_specs(load_spec("api_specs/petstore_v1.yaml"), load_spec("api_specs/petstore.yaml"))
+#     for change in diff["changes"]:
+#         print(("BREAKING " if change["breaking"] else "") + f"{change['location']}: {change['change']}")
+#     print("Affected endpoints:", diff["affected_endpoints"])
@@ -5,7 +5,7 @@ from .spec_analyzer import analyze_spec
 def normalize_spec(spec: dict) -> dict:
     """
     Normalizes the given specification into a unified format.
-    For an OpenAPI spec, extracts the API title, version, and endpoints.
+    For an OpenAPI spec, extracts the API title, version, server URLs, and endpoints.
 
     :param spec: The original specification as a dictionary.
     :return: A normalized specification as a dictionary.
@@ -17,6 +17,7 @@ def normalize_spec(spec: dict) -> dict:
         info = spec.get("info", {})
         unified_spec["title"] = info.get("title", "Untitled API")
         unified_spec["version"] = info.get("version", "unknown")
+        unified_spec["servers"] = [server.get("url") for server in spec.get("servers", []) if server.get("url")]
 
         # Use the analyzer to extract endpoints.
         analysis = analyze_spec(spec)
@@ -0,0 +1,239 @@
+# ai-test-generator/core/test_models/ir_builder.py
+
+import ast
+from typing import Dict, List, Optional, Tuple
+
+from .test_case import TestCase
+from .test_suite import TestSuite
+
+HTTP_METHODS = {"get", "post", "put", "patch", "delete", "head", "options"}
+
+
+def _constants(function: ast.FunctionDef) -> Dict[str, object]:
+    """Collects simple `name = <literal>` assignments made inside a function."""
+    constants = {}
+    for node in ast.walk(function):
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            try:
+                constants[node.targets[0].id] = ast.literal_eval(node.value)
+            except (ValueError, SyntaxError):
+                continue
+    return constants
+
+
+def _value(node: ast.AST, constants: Dict[str, object]):
+    """Evaluates a literal or a name bound to a literal; raises ValueError otherwise."""
+    if isinstance(node, ast.Name):
+        if node.id in constants:
+            return constants[node.id]
+        raise ValueError(node.id)
+    return ast.literal_eval(node)
+
+
+def _is_base_url(node: ast.AST) -> bool:
+    """True for expressions such as `base_url`, `BASE_URL` or `self.base_url`."""
+    name = node.id if isinstance(node, ast.Name) else getattr(node, "attr", "")
+    return "url" in name.lower()
+
+
+def _looks_like_url(node: ast.AST) -> bool:
+    """Distinguishes request URLs from other `.get(...)` style calls such as dict.get('key')."""
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, str) and node.value.startswith(("/", "http"))
+    return isinstance(node, (ast.JoinedStr, ast.BinOp))
+
+
+def _parse_url(node: ast.AST, constants: Dict[str, object]) -> Optional[Tuple[str, dict]]:
+    """
+    Converts the URL argument of a request call into a path template and its parameters,
+    e.g. f"{base_url}/pets/{pet_id}" -> ("/pets/{pet_id}", {"pet_id": 1}).
+    """
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add) and _is_base_url(node.left):
+        node = node.right
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value, {}
+    if isinstance(node, ast.Constant) and isinstance(node.value, str) and node.value.startswith("/"):
+        return node.value, {}
+    if not isinstance(node, ast.JoinedStr):
+        return None
+
+    parts = list(node.values)
+    if parts and isinstance(parts[0], ast.FormattedValue) and _is_base_url(parts[0].value):
+        parts = parts[1:]
+    path, path_params = "", {}
+    for part in parts:
+        if isinstance(part, ast.Constant):
+            path += str(part.value)
+        elif isinstance(part, ast.FormattedValue) and isinstance(part.value, ast.Name) \
+                and part.value.id in constants:
+            path += "{" + part.value.id + "}"
+            path_params[part.value.id] = constants[part.value.id]
+        else:
+            return None
+    return (path, path_params) if path.startswith("/") else None
+
+
+def _expected_status(test: ast.Assert) -> Optional[int]:
+    """
+    Extracts N from `assert r.status_code == N`. Membership checks (`in [200, 201]`) are
+    not translated: the IR holds a single expected status, and narrowing it would reject
+    statuses the original test accepted.
+    """
+    compare = test.test
+    if not isinstance(compare, ast.Compare) or len(compare.ops) != 1:
+        return None
+    left, right = compare.left, compare.comparators[0]
+    if isinstance(right, ast.Attribute) and right.attr == "status_code":
+        left, right = right, left
+    if not (isinstance(left, ast.Attribute) and left.attr == "status_code"):
+        return None
+    try:
+        value = ast.literal_eval(right)
+    except ValueError:
+        return None
+    if isinstance(compare.ops[0], ast.Eq) and isinstance(value, int):
+        return value
+    return None
+
+
+def _field_assertion(test: ast.Assert, json_names: set) -> Optional[dict]:
+    """Extracts {'field': ..., 'equals': ...} from `assert data["a"]["b"] == value` style assertions."""
+    compare = test.test
+    if not isinstance(compare, ast.Compare) or len(compare.ops) != 1:
+        return None
+
+    def _json_field(node) -> Optional[str]:
+        keys = []
+        while isinstance(node, ast.Subscript):
+            try:
+                keys.append(str(ast.literal_eval(node.slice)))
+            except ValueError:
+                return None
+            node = node.value
+        is_json = (isinstance(node, ast.Name) and node.id in json_names) or (
+            isinstance(node, ast.Call) and getattr(node.func, "attr", "") == "json"
+        )
+        return ".".join(reversed(keys)) if is_json and keys else None
+
+    operator, right = compare.ops[0], compare.comparators[0]
+    if isinstance(operator, ast.Eq):
+        field = _json_field(compare.left)
+        if field:
+            try:
+                return {"field": field, "equals": ast.literal_eval(right)}
+            except ValueError:
+                return None
+    if isinstance(operator, ast.In) and isinstance(compare.left, ast.Constant):
+        container = _json_field(right) if isinstance(right, ast.Subscript) else None
+        if (isinstance(right, ast.Name) and right.id in json_names) or (
+            isinstance(right, ast.Call) and getattr(right.func, "attr", "") == "json"
+        ):
+            return {"field": str(compare.left.value)}
+        if container:
+            return {"field": f"{container}.{compare.left.value}"}
+    return None
+
+
+def _is_translated(statement: ast.stmt, call: ast.Call, constants: Dict[str, object], json_names: set) -> bool:
+    """
+    True if a top-level statement of a test function is fully captured by its structured
+    case: the docstring, literal constants, the request, decoding its JSON, and
+    assertions on the status code or on JSON fields.
+    """
+    if isinstance(statement, ast.Pass):
+        return True
+    if isinstance(statement, ast.Expr):
+        return statement.value is call or (isinstance(statement.value, ast.Constant)
+                                           and isinstance(statement.value.value, str))
+    if isinstance(statement, ast.Assign) and len(statement.targets) == 1 \
+            and isinstance(statement.targets[0], ast.Name):
+        name = statement.targets[0].id
+        return statement.value is call or name in json_names or name in constants
+    if isinstance(statement, ast.Assert):
+        return _expected_status(statement) is not None or _field_assertion(statement, json_names) is not None
+    return False
+
+
+def _to_case(function: ast.FunctionDef, source: str) -> TestCase:
+    """
+    Converts a test function into a structured TestCase when it consists of a single
+    request whose statements and assertions all translate (see _is_translated);
+    otherwise keeps it as a free-form case, so no check is silently lost.
+    """
+    freeform = TestCase(name=function.name, description=ast.get_docstring(function) or "",
+                        test_code=ast.get_source_segment(source, function) or "")
+    calls = [
+        node for node in ast.walk(function)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+        and node.func.attr in HTTP_METHODS and node.args and _looks_like_url(node.args[0])
+    ]
+    if len(calls) != 1 or any(isinstance(node, (ast.For, ast.While)) for node in ast.walk(function)):
+        return freeform
+
+    call = calls[0]
+    constants = _constants(function)
+    parsed = _parse_url(call.args[0], constants)
+    if not parsed:
+        return freeform
+
+    inputs = {}
+    for keyword in call.keywords:
+        if keyword.arg in ("json", "params", "headers"):
+            try:
+                inputs[keyword.arg] = _value(keyword.value, constants)
+            except ValueError:
+                # Headers usually come from fixtures; anything else must be a literal.
+                if keyword.arg != "headers":
+                    return freeform
+
+    json_names = {
+        node.targets[0].id for node in ast.walk(function)
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)
+        and isinstance(node.value, ast.Call) and getattr(node.value.func, "attr", "") == "json"
+    }
+    if not all(_is_translated(statement, call, constants, json_names) for statement in function.body):
+        return freeform
+    expected_status, assertions = None, []
+    for node in function.body:
+        if isinstance(node, ast.Assert):
+            expected_status = expected_status or _expected_status(node)
+            assertion = _field_assertion(node, json_names)
+            if assertion:
+                assertions.append(assertion)
+    if expected_status is None:
+        return freeform
+
+    path, path_params = parsed
+    return TestCase(
+        name=function.name,
+        description=freeform.description,
+        method=call.func.attr.upper(),
+        path=path,
+        path_params=path_params,
+        query=inputs.get("params") or {},
+        headers=inputs.get("headers") or {},
+        body=inputs.get("json"),
+        expected_status=expected_status,
+        assertions=assertions,
+    )
+
+
+def build_suite_from_code(test_code: str, name: str) -> TestSuite:
+    """
+    Builds the framework-neutral representation of a generated pytest module.
+    Test functions that map onto a single request become structured cases that any
+    framework adapter can render; the rest are kept as free-form pytest code.
+
+    :param test_code: The generated pytest module.
+    :param name: Name of the resulting suite (e.g., the test type).
+    :return: A TestSuite.
+    """
+    suite = TestSuite(name=name)
+    try:
+        tree = ast.parse(test_code)
+    except SyntaxError:
+        return suite
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test"):
+            suite.add_test_case(_to_case(node, test_code))
+    return suite
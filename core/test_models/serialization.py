@@ -0,0 +1,85 @@
+# ai-test-generator/core/test_models/serialization.py
+
+import json
+from typing import IO, Iterator, Tuple, Union
+
+from .test_case import TestCase
+from .test_suite import TestSuite
+
+# A suite file is JSON Lines: the first line holds the suite header
+# ({"suite": {...}}), every following line one test case.
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _open(target: Union[str, IO[str]], mode: str):
+    return open(target, mode, encoding="utf-8") if isinstance(target, str) else target
+
+
+def dump_suite(test_suite: TestSuite, target: Union[str, IO[str]]) -> None:
+    """
+    Writes a suite as JSON Lines, one case per line.
+
+    :param test_suite: The suite to persist.
+    :param target: A file path or a writable text stream.
+    """
+    f = _open(target, "w")
+    try:
+        f.write(_encoder.encode({"suite": test_suite.header()}) + "\n")
+        for test_case in test_suite.test_cases:
+            f.write(_encoder.encode(test_case.to_dict()) + "\n")
+    finally:
+        if isinstance(target, str):
+            f.close()
+
+
+def iter_suite(source: Union[str, IO[str]]) -> Tuple[dict, Iterator[TestCase]]:
+    """
+    Reads a suite file lazily. Cases are decoded one line at a time, so consumers
+    that stream them (renderers, exporters) keep memory flat regardless of suite size.
+
+    :param source: A file path or a readable text stream.
+    :return: The suite header and an iterator over its cases.
+    """
+    f = _open(source, "r")
+    try:
+        first = f.readline()
+        if not first.strip():
+            raise ValueError("Empty test suite file.")
+        header = json.loads(first).get("suite")
+        if header is None:
+            raise ValueError("Test suite file does not start with a suite header.")
+    except Exception:
+        # The cases iterator never takes ownership of the file; close it here.
+        if isinstance(source, str):
+            f.close()
+        raise
+
+    def _cases() -> Iterator[TestCase]:
+        try:
+            for line in f:
+                if line.strip():
+                    yield TestCase.from_dict(json.loads(line))
+        finally:
+            if isinstance(source, str):
+                f.close()
+
+    return header, _cases()
+
+
+def load_suite(source: Union[str, IO[str]]) -> TestSuite:
+    """
+    Loads a suite written by dump_suite().
+
+    :param source: A file path or a readable text stream.
+    :return: The TestSuite.
+    """
+    header, cases = iter_suite(source)
+    return TestSuite(test_cases=list(cases), **header)
+
+
+# --- Example Usage ---
+# if __name__ == "__main__":
+#     suite = TestSuite(name="functional", test_type="functional")
+#     suite.add_test_case(TestCase(name="list_pets", method="GET", path="/pets", tags=["pets"]))
+#     dump_suite(suite, "artifacts/suites/functional.jsonl")
+#     print(load_suite("artifacts/suites/functional.jsonl"))
@@ -1,13 +1,113 @@
 # ai-test-generator/core/test_models/test_case.py
 
-from dataclasses import dataclass, field
+import sys
+from typing import Any, Dict, List, Optional
+
+
+def _intern_mapping(mapping: Optional[dict]) -> dict:
+    """Interns the string keys and string values of a shallow mapping."""
+    if not mapping:
+        return {}
+    return {
+        sys.intern(key) if isinstance(key, str) else key: sys.intern(value) if isinstance(value, str) else value
+        for key, value in mapping.items()
+    }
+
 
-@dataclass
 class TestCase:
     """
     Represents a single test case.
+
+    Structured cases describe one request and its expectations (method, path,
+    inputs, expected status and assertions) so framework adapters can render
+    them as data; free-form cases carry their code in `test_code`.
+
+    Cases use __slots__, and their method, path, tags and metadata are interned,
+    because generated suites can hold tens of thousands of them and most share
+    those values.
     """
-    name: str
-    description: str = ""
-    test_code: str = ""
-    metadata: dict = field(default_factory=dict)
+    __slots__ = ("name", "description", "test_code", "metadata", "method", "path", "path_params",
+                 "query", "headers", "body", "expected_status", "assertions", "tags")
+
+    def __init__(self, name: str, description: str = "", test_code: str = "", metadata: dict = None,
+                 method: str = "", path: str = "", path_params: dict = None, query: dict = None,
+                 headers: dict = None, body: Any = None, expected_status: int = 200,
+                 assertions: List[dict] = None, tags: List[str] = None):
+        self.name = name
+        self.description = description
+        self.test_code = test_code
+        self.metadata = _intern_mapping(metadata)
+        self.method = sys.intern(method.upper())
+        self.path = sys.intern(path)
+        self.path_params = path_params or {}
+        self.query = query or {}
+        self.headers = _intern_mapping(headers)
+        self.body = body
+        self.expected_status = expected_status
+        self.assertions = assertions or []
+        self.tags = [sys.intern(tag) for tag in tags or ()]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TestCase):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self) -> str:
+        target = f"{self.method} {self.path}" if self.is_structured else "free-form"
+        return f"TestCase(name={self.name!r}, {target})"
+
+    @property
+    def is_structured(self) -> bool:
+        """True if the case describes a request rather than free-form code."""
+        return bool(self.method and self.path)
+
+    @property
+    def endpoint_key(self) -> str:
+        """The 'METHOD /path' key of the spec endpoint the case exercises ('' for free-form cases)."""
+        return f"{self.method} {self.path}" if self.is_structured else ""
+
+    def to_data(self) -> dict:
+        """
+        Returns the compact data representation of a structured case
+        (empty inputs are omitted).
+
+        :return: A JSON-serializable dictionary.
+        """
+        data = {"name": self.name, "method": self.method, "path": self.path,
+                "expected_status": self.expected_status}
+        for key in ("path_params", "query", "headers", "assertions"):
+            value = getattr(self, key)
+            if value:
+                data[key] = value
+        if self.body is not None:
+            data["body"] = self.body
+        return data
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the full representation of the case, omitting fields left at their defaults.
+
+        :return: A JSON-serializable dictionary accepted by from_dict().
+        """
+        data = {}
+        for slot in self.__slots__:
+            value = getattr(self, slot)
+            if slot == "body":
+                keep = value is not None
+            elif slot == "expected_status":
+                keep = value != 200
+            else:
+                keep = slot == "name" or value not in ("", {}, [])
+            if keep:
+                data[slot] = value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TestCase":
+        """
+        Builds a case from the output of to_dict().
+
+        :param data: A dictionary of case fields.
+        :return: A TestCase.
+        """
+        return cls(**data)
@@ -1,22 +1,95 @@
 # ai-test-generator/core/test_models/test_suite.py
 
-from dataclasses import dataclass, field
-from typing import List
-from .test_case import TestCase
+import sys
+from collections import OrderedDict
+from typing import Dict, List
+from .test_case import TestCase, _intern_mapping
+
+
+def endpoint_keys(unified_spec: dict) -> List[str]:
+    """
+    Returns the 'METHOD /path' keys of the endpoints in a normalized spec.
+
+    :param unified_spec: A normalized specification.
+    :return: A list of endpoint keys.
+    """
+    return [
+        sys.intern(f"{endpoint.get('method', '').upper()} {endpoint.get('path', '')}")
+        for endpoint in unified_spec.get("endpoints", [])
+    ]
+
 
-@dataclass
 class TestSuite:
     """
     Represents a collection of test cases.
+
+    A suite is what generators hand to the post-processors and renderers: the
+    generated module (`code`), the cases extracted from it, and post-processing
+    results (`report`). Endpoints are stored as 'METHOD /path' references into
+    the spec rather than as copies of it; use resolve_endpoints() to look them up.
     """
-    name: str
-    test_cases: List[TestCase] = field(default_factory=list)
-    metadata: dict = field(default_factory=dict)
+    __slots__ = ("name", "test_type", "test_cases", "metadata", "code", "endpoints", "report")
+
+    def __init__(self, name: str, test_cases: List[TestCase] = None, metadata: dict = None, test_type: str = "",
+                 code: str = "", endpoints: List[str] = None, report: dict = None):
+        self.name = name
+        self.test_type = sys.intern(test_type)
+        self.test_cases = test_cases if test_cases is not None else []
+        self.metadata = _intern_mapping(metadata)
+        self.code = code
+        self.endpoints = [sys.intern(key) for key in endpoints or ()]
+        self.report = report or {}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TestSuite):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"TestSuite(name={self.name!r}, test_type={self.test_type!r}, cases={len(self.test_cases)})"
+
+    def __len__(self) -> int:
+        return len(self.test_cases)
 
     def add_test_case(self, test_case: TestCase) -> None:
         """
         Adds a new test case to the suite.
-        
+
         :param test_case: An instance of TestCase to be added.
         """
         self.test_cases.append(test_case)
+
+    def group_by_endpoint(self) -> "OrderedDict[str, List[TestCase]]":
+        """
+        Groups the structured test cases by endpoint, keyed as 'METHOD /path'.
+
+        :return: An ordered mapping of endpoint key to test cases.
+        """
+        groups: "OrderedDict[str, List[TestCase]]" = OrderedDict()
+        for test_case in self.test_cases:
+            if test_case.is_structured:
+                groups.setdefault(test_case.endpoint_key, []).append(test_case)
+        return groups
+
+    def resolve_endpoints(self, unified_spec: dict) -> List[Dict]:
+        """
+        Looks up the spec endpoints the suite refers to.
+
+        :param unified_spec: The normalized specification the suite was generated from.
+        :return: The referenced endpoint dictionaries, in suite order.
+        """
+        by_key = dict(zip(endpoint_keys(unified_spec), unified_spec.get("endpoints", [])))
+        return [by_key[key] for key in self.endpoints if key in by_key]
+
+    def header(self) -> Dict:
+        """
+        Returns the suite-level fields (everything except the cases), omitting empty ones.
+
+        :return: A JSON-serializable dictionary.
+        """
+        data = {"name": self.name}
+        for slot in ("test_type", "metadata", "code", "endpoints", "report"):
+            value = getattr(self, slot)
+            if value:
+                data[slot] = value
+        return data
@@ -0,0 +1,105 @@
+# ai-test-generator/generators/framework_adapters/jest/jest_adapter.py
+
+import json
+from typing import Dict
+
+from core.test_models.test_suite import TestSuite
+
+MODULE_TEMPLATE = '''// Generated by the AI Test Generator from the "{suite_name}" suite.
+// Test inputs and expectations live in {data_file}; edit the data, not this file.
+const CASES = require("./{data_file}");
+const BASE_URL = process.env.BASE_URL || "{base_url}";
+
+// Python type names used in case assertions, mapped to JavaScript types.
+const TYPES = {{ str: "string", int: "number", float: "number", bool: "boolean", dict: "object", list: "array" }};
+
+function lookup(payload, field) {{
+  return field.split(".").reduce((value, key) => value[key], payload);
+}}
+
+async function check(testCase) {{
+  const path = testCase.path.replace(/\\{{([^}}]+)\\}}/g, (_, name) => encodeURIComponent(testCase.path_params[name]));
+  const query = testCase.query ? "?" + new URLSearchParams(testCase.query).toString() : "";
+  const headers = {{ ...(testCase.headers || {{}}) }};
+  let body;
+  if (testCase.body !== undefined) {{
+    headers["Content-Type"] = "application/json";
+    body = JSON.stringify(testCase.body);
+  }}
+  const response = await fetch(BASE_URL + path + query, {{ method: testCase.method, headers, body }});
+  expect(response.status).toBe(testCase.expected_status);
+
+  const assertions = testCase.assertions || [];
+  if (assertions.length) {{
+    const payload = await response.json();
+    for (const assertion of assertions) {{
+      const value = lookup(payload, assertion.field);
+      expect(value).toBeDefined();
+      if ("equals" in assertion) expect(value).toEqual(assertion.equals);
+      if ("type" in assertion) {{
+        const actual = Array.isArray(value) ? "array" : typeof value;
+        expect(actual).toBe(TYPES[assertion.type] || assertion.type);
+      }}
+    }}
+  }}
+}}
+'''
+
+GROUP_TEMPLATE = '''
+describe({key}, () => {{
+  test.each(CASES[{key}])("$name", check, {timeout_ms});
+}});
+'''
+
+
+class JestAdapter:
+    """
+    Renders structured test cases as data-driven Jest test files.
+
+    The data file has the same layout as the one written by the pytest adapter, so a
+    single generated suite can be rendered for both frameworks without another LLM
+    run. Free-form (Python-only) cases are listed as `test.todo` entries.
+    """
+
+    def __init__(self, base_url: str = "http://localhost:8080/api", timeout: int = 30):
+        """
+        :param base_url: Default base URL, overridable at run time via the BASE_URL environment variable.
+        :param timeout: Per-test timeout in seconds.
+        """
+        self.base_url = base_url
+        self.timeout = timeout
+
+    def render(self, test_suite: TestSuite, module_name: str) -> Dict[str, str]:
+        """
+        Renders a suite into a Jest test file and its data file.
+
+        :param test_suite: The suite to render.
+        :param module_name: Base name of the suite (e.g., 'functional_api_tests').
+        :return: A mapping of file name to content.
+        """
+        base_name = module_name.rsplit(".", 1)[0] if module_name.endswith((".py", ".js")) else module_name
+        data_file = f"{base_name}.data.json"
+        groups = test_suite.group_by_endpoint()
+
+        parts = [MODULE_TEMPLATE.format(suite_name=test_suite.name, data_file=data_file, base_url=self.base_url)]
+        for key in groups:
+            parts.append(GROUP_TEMPLATE.format(key=json.dumps(key), timeout_ms=self.timeout * 1000))
+
+        freeform = [case.name for case in test_suite.test_cases if not case.is_structured]
+        if freeform:
+            parts.append("\n// Python-only test cases that could not be translated automatically.\n")
+            parts.extend(f"test.todo({json.dumps(name)});\n" for name in freeform)
+
+        data = {key: [case.to_data() for case in cases] for key, cases in groups.items()}
+        return {
+            f"{base_name}.test.js": "".join(parts),
+            data_file: json.dumps(data, separators=(",", ":"), ensure_ascii=False),
+        }
+
+
+# --- Example Usage ---
+# if __name__ == "__main__":
+#     suite = TestSuite(name="functional")
+#     suite.add_test_case(TestCase(name="list_pets", method="GET", path="/pets", expected_status=200))
+#     for filename, content in JestAdapter().render(suite, "functional_api_tests").items():
+#         print(f"--- {filename}\n{content}")
@@ -0,0 +1,131 @@
+# ai-test-generator/generators/framework_adapters/pytest/pytest_adapter.py
+
+import json
+import re
+from typing import Dict
+
+from core.test_models.test_suite import TestSuite
+
+MODULE_TEMPLATE = '''# Generated by the AI Test Generator from the "{suite_name}" suite.
+# Test inputs and expectations live in {data_file}; edit the data, not this module.
+import json
+import os
+
+import pytest
+import requests
+
+with open(os.path.join(os.path.dirname(__file__), "{data_file}"), encoding="utf-8") as _data:
+    CASES = json.load(_data)
+
+
+@pytest.fixture
+def base_url():
+    return os.environ.get("BASE_URL", "{base_url}")
+
+
+@pytest.fixture
+def headers():
+    return {{"Content-Type": "application/json"}}
+
+
+def _lookup(payload, field):
+    for key in field.split("."):
+        payload = payload[int(key)] if isinstance(payload, list) else payload[key]
+    return payload
+
+
+def _check(base_url, case):
+    url = base_url + case["path"].format(**case.get("path_params", {{}}))
+    response = requests.request(
+        case["method"], url,
+        params=case.get("query"), headers=case.get("headers"), json=case.get("body"), timeout={timeout}
+    )
+    assert response.status_code == case["expected_status"], response.text
+    for assertion in case.get("assertions", []):
+        value = _lookup(response.json(), assertion["field"])
+        if "equals" in assertion:
+            assert value == assertion["equals"], assertion
+        if "type" in assertion:
+            assert type(value).__name__ == assertion["type"], assertion
+'''
+
+FUNCTION_TEMPLATE = '''
+
+@pytest.mark.parametrize("case", CASES["{key}"], ids=lambda case: case["name"])
+def {function_name}(base_url, case):
+    _check(base_url, case)
+'''
+
+FREEFORM_HEADER = '''
+
+# Free-form test cases
+'''
+
+
+def _function_name(method: str, path: str) -> str:
+    """Builds a test function name such as test_get_pets_petid from an endpoint."""
+    slug = re.sub(r"[^0-9a-zA-Z]+", "_", path).strip("_").lower()
+    return f"test_{method.lower()}_{slug or 'root'}"
+
+
+class PytestAdapter:
+    """
+    Renders structured test cases as table-driven pytest modules.
+
+    Cases are grouped per endpoint into `pytest.mark.parametrize` tables whose rows
+    are stored in a compact JSON data file next to the module, so a module's size
+    no longer grows with the number of cases. Free-form cases (with `test_code`)
+    are appended verbatim.
+    """
+
+    def __init__(self, base_url: str = "http://localhost:8080/api", timeout: int = 30):
+        """
+        :param base_url: Default base URL, overridable at run time via the BASE_URL environment variable.
+        :param timeout: Request timeout in seconds for generated tests.
+        """
+        self.base_url = base_url
+        self.timeout = timeout
+
+    def render(self, test_suite: TestSuite, module_name: str) -> Dict[str, str]:
+        """
+        Renders a suite into a test module and its data file.
+
+        :param test_suite: The suite to render.
+        :param module_name: Module file name (e.g., 'functional_api_tests.py').
+        :return: A mapping of file name to content.
+        """
+        data_file = module_name[:-3] + ".data.json" if module_name.endswith(".py") else module_name + ".data.json"
+        groups = test_suite.group_by_endpoint()
+
+        parts = [MODULE_TEMPLATE.format(
+            suite_name=test_suite.name, data_file=data_file, base_url=self.base_url, timeout=self.timeout
+        )]
+        used_names = set()
+        for key in groups:
+            method, path = key.split(" ", 1)
+            function_name = _function_name(method, path)
+            while function_name in used_names:
+                function_name += "_"
+            used_names.add(function_name)
+            parts.append(FUNCTION_TEMPLATE.format(key=key, function_name=function_name))
+
+        freeform = [case.test_code for case in test_suite.test_cases if not case.is_structured and case.test_code]
+        if freeform:
+            parts.append(FREEFORM_HEADER)
+            parts.append("\n\n".join(freeform) + "\n")
+
+        data = {key: [case.to_data() for case in cases] for key, cases in groups.items()}
+        return {
+            module_name: "".join(parts),
+            data_file: json.dumps(data, separators=(",", ":"), ensure_ascii=False),
+        }
+
+
+# --- Example Usage ---
+# if __name__ == "__main__":
+#     suite = TestSuite(name="functional")
+#     suite.add_test_case(TestCase(name="list_pets", method="GET", path="/pets", expected_status=200))
+#     suite.add_test_case(TestCase(name="missing_pet", method="GET", path="/pets/{petId}",
+#                                  path_params={"petId": 0}, expected_status=404))
+#     for filename, content in PytestAdapter().render(suite, "functional_api_tests.py").items():
+#         print(f"--- {filename}\n{content}")
@@ -0,0 +1,26 @@
+# ai-test-generator/generators/framework_adapters/registry.py
+
+import importlib
+from typing import Dict
+
+# Framework renderers, registered by dotted path and imported on first use.
+# Every renderer takes a TestSuite and returns {file name: content}.
+RENDERER_REGISTRY: Dict[str, str] = {
+    "pytest": "generators.framework_adapters.pytest.pytest_adapter:PytestAdapter",
+    "jest": "generators.framework_adapters.jest.jest_adapter:JestAdapter",
+}
+
+
+def load_renderer_class(framework: str) -> type:
+    """
+    Returns the renderer class for a test framework.
+
+    :param framework: The framework name (e.g., 'pytest', 'jest').
+    :return: The renderer class.
+    :raises ValueError: If no renderer is registered for the framework.
+    """
+    target = RENDERER_REGISTRY.get(framework)
+    if not target:
+        raise ValueError(f"No renderer registered for framework '{framework}'.")
+    module_path, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module_path), attr)
@@ -0,0 +1,205 @@
+# ai-test-generator/generators/infrastructure/mock_server_generator.py
+
+import json
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from core.spec_processor.schema_examples import example_from_schema
+
+
+class MockASGIApp:
+    """
+    Minimal ASGI application serving canned, schema-valid responses for every
+    operation of a normalized spec. Response bodies are encoded once up front and
+    routing is a dictionary lookup for static paths, so the app adds very little
+    overhead per request.
+
+    The documented status returned for a request can be chosen with the
+    `X-Mock-Status` header; otherwise the lowest 2xx status is used.
+    """
+
+    def __init__(self, routes: Dict[str, Dict[str, Dict[str, Tuple[int, list, bytes]]]], base_path: str = ""):
+        """
+        :param routes: {path template: {METHOD: {status: (status, headers, body)}}}.
+        :param base_path: Path prefix stripped from incoming requests (e.g., '/api').
+        """
+        self.base_path = base_path.rstrip("/")
+        self.static_routes = {}
+        self.dynamic_routes: List[Tuple[re.Pattern, dict]] = []
+        for path, methods in routes.items():
+            if "{" in path:
+                pattern = re.compile("^" + re.sub(r"\\\{[^/]+?\\\}", "[^/]+", re.escape(path)) + "$")
+                self.dynamic_routes.append((pattern, methods))
+            else:
+                self.static_routes[path] = methods
+        self.request_count = 0
+
+    def match(self, path: str) -> Optional[dict]:
+        """Returns the method table for a request path, or None if no route matches."""
+        # '/api' is stripped from '/api' and '/api/pets', not from '/apiary/pets'.
+        if self.base_path and (path == self.base_path or path.startswith(self.base_path + "/")):
+            path = path[len(self.base_path):] or "/"
+        methods = self.static_routes.get(path)
+        if methods is not None:
+            return methods
+        for pattern, methods in self.dynamic_routes:
+            if pattern.match(path):
+                return methods
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        # Drain the request body; its content is not validated.
+        more_body = True
+        while more_body:
+            message = await receive()
+            more_body = message.get("more_body", False)
+
+        self.request_count += 1
+        methods = self.match(scope["path"])
+        if methods is None:
+            status, headers, body = _error_response(404, "Not Found")
+        elif scope["method"] not in methods:
+            status, headers, body = _error_response(405, "Method Not Allowed")
+        else:
+            responses = methods[scope["method"]]
+            requested = dict(scope.get("headers", [])).get(b"x-mock-status")
+            status, headers, body = responses.get(requested.decode() if requested else "", responses["default"])
+
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+def _error_response(status: int, message: str) -> Tuple[int, list, bytes]:
+    body = json.dumps({"error": message, "status": status}).encode()
+    return status, [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())], body
+
+
+class MockServerGenerator:
+    """
+    Generates an in-process mock server from a normalized specification, so that
+    generated suites can be executed right after generation without a live service.
+    """
+
+    def __init__(self, unified_spec: dict):
+        """
+        :param unified_spec: A normalized specification (see core/spec_processor/spec_normalizer.py).
+        """
+        self.unified_spec = unified_spec
+
+    def base_path(self) -> str:
+        """Returns the path component of the first server URL (e.g., '/api')."""
+        servers = self.unified_spec.get("servers") or []
+        return urlparse(servers[0]).path.rstrip("/") if servers else ""
+
+    def build_routes(self) -> dict:
+        """
+        Precomputes the encoded responses of every operation.
+
+        :return: {path template: {METHOD: {status: (status, headers, body), 'default': ...}}}.
+        """
+        routes: Dict[str, dict] = {}
+        for endpoint in self.unified_spec.get("endpoints", []):
+            table = {}
+            for status, response in (endpoint.get("responses") or {}).items():
+                # Range keys may be written '2XX' or '2xx'; anything else non-numeric is skipped.
+                status = str(status) if status == "default" else str(status).upper()
+                if status != "default" and not status.replace("X", "0").isdigit():
+                    continue
+                code = 200 if status == "default" else int(status.replace("X", "0"))
+                if code == 204 or not response.get("schema"):
+                    headers, body = [(b"content-length", b"0")], b""
+                else:
+                    body = json.dumps(example_from_schema(response["schema"])).encode()
+                    content_type = (response.get("content_type") or "application/json").encode()
+                    headers = [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]
+                table[status] = (code, headers, body)
+
+            success = sorted(s for s in table if s.startswith("2"))
+            table["default"] = table[success[0]] if success else table.get("default", (200, [(b"content-length", b"0")], b""))
+            routes.setdefault(endpoint["path"], {})[endpoint["method"].upper()] = table
+        return routes
+
+    def build_app(self) -> MockASGIApp:
+        """
+        Builds the ASGI application.
+
+        :return: A MockASGIApp instance.
+        """
+        return MockASGIApp(self.build_routes(), base_path=self.base_path())
+
+    def serve(self, host: str = "127.0.0.1", port: int = 8080) -> "MockServer":
+        """
+        Starts the mock server in a background thread.
+
+        :param host: Interface to bind.
+        :param port: Port to bind (0 picks a free port).
+        :return: A running MockServer; use it as a context manager or call stop().
+        """
+        server = MockServer(self.build_app(), host, port)
+        server.start()
+        return server
+
+
+class MockServer:
+    """
+    Runs a MockASGIApp with uvicorn in a background thread.
+    """
+
+    def __init__(self, app: MockASGIApp, host: str, port: int):
+        try:
+            import uvicorn
+        except ImportError as e:
+            raise RuntimeError("uvicorn is required to serve the mock server (pip install uvicorn).") from e
+        self.app = app
+        config = uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="on", access_log=False)
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        """The URL generated tests should use as base_url."""
+        sockets = self._server.servers[0].sockets if self._server.servers else []
+        host, port = sockets[0].getsockname()[:2] if sockets else (self._server.config.host, self._server.config.port)
+        return f"http://{host}:{port}{self.app.base_path}"
+
+    def start(self, timeout: float = 10.0) -> None:
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("Mock server failed to start.")
+            time.sleep(0.01)
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+    def __enter__(self) -> "MockServer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+# --- Example Usage ---
+# if __name__ == "__main__":
+#     from core.spec_processor.spec_loader import load_spec
+#     from core.spec_processor.spec_normalizer import normalize_spec
+#     unified_spec = normalize_spec(load_spec("api_specs/petstore.yaml"))
+#     with MockServerGenerator(unified_spec).serve(port=8080) as server:
+#         print(f"Mock server running at {server.base_url}")
+#         input("Press Enter to stop...")
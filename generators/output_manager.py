@@ -0,0 +1,173 @@
+# ai-test-generator/generators/output_manager.py
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, TextIO, Union
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".generated_manifest.json"
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """
+    Writes data to a temp file in the destination directory and renames it into place,
+    so readers never observe a partially written file.
+
+    :param path: Destination path.
+    :param data: File content.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class OutputManager:
+    """
+    Owns every write into a generated-output directory.
+
+    A manifest of content hashes is kept next to the files. Files whose content did
+    not change are left untouched (so their mtimes stay stable for pytest, Docker and
+    CI caches), changed files are replaced atomically, and files written by a previous
+    run but not by the current one are pruned in finalize(). Files that were never
+    written by the manager are not touched.
+    """
+
+    def __init__(self, output_dir: str, manifest_name: str = MANIFEST_NAME):
+        """
+        :param output_dir: Directory generated files are written to.
+        :param manifest_name: Name of the manifest file inside output_dir.
+        """
+        self.output_dir = output_dir
+        self.manifest_path = os.path.join(output_dir, manifest_name)
+        self.previous = self._load_manifest()
+        self.current: Dict[str, str] = {}
+        self.stats = {"written": 0, "unchanged": 0, "removed": 0}
+        self._lock = threading.Lock()
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            return manifest.get("files", {}) if isinstance(manifest, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _relative(self, path: str) -> str:
+        """Returns the manifest key of a path, given relative to output_dir or as a path inside it."""
+        if not os.path.isabs(path) and not os.path.normpath(path).startswith(os.path.normpath(self.output_dir) + os.sep):
+            path = os.path.join(self.output_dir, path)
+        relative = os.path.relpath(path, self.output_dir)
+        if relative.startswith(os.pardir):
+            raise ValueError(f"{path} is outside the output directory {self.output_dir}")
+        return relative.replace(os.sep, "/")
+
+    def _is_current(self, relative: str, digest: str) -> bool:
+        """True if the file on disk already holds content with the given hash."""
+        path = os.path.join(self.output_dir, relative)
+        if not os.path.exists(path):
+            return False
+        if self.previous.get(relative) == digest:
+            return True
+        # No (or a stale) manifest entry: fall back to hashing the file itself.
+        return _file_digest(path) == digest
+
+    def _record(self, relative: str, digest: str, written: bool) -> None:
+        with self._lock:
+            self.current[relative] = digest
+            self.stats["written" if written else "unchanged"] += 1
+
+    def write(self, path: str, content: Union[str, bytes]) -> bool:
+        """
+        Writes a file if its content differs from what is on disk.
+
+        :param path: Path relative to output_dir (or inside it).
+        :param content: File content; str is encoded as UTF-8.
+        :return: True if the file was written, False if it was unchanged.
+        """
+        relative = self._relative(path)
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        written = not self._is_current(relative, digest)
+        if written:
+            atomic_write(os.path.join(self.output_dir, relative), data)
+        self._record(relative, digest, written)
+        return written
+
+    @contextmanager
+    def open(self, path: str) -> Iterator[TextIO]:
+        """
+        Opens a text stream for content too large to build in memory. The content is
+        streamed to a temp file and only replaces the target if its hash changed.
+
+        :param path: Path relative to output_dir (or inside it).
+        """
+        relative = self._relative(path)
+        target = os.path.join(self.output_dir, relative)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".tmp-", suffix=os.path.basename(target))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", buffering=1 << 16) as f:
+                yield f
+            digest = _file_digest(temp_path)
+            written = not self._is_current(relative, digest)
+            if written:
+                os.replace(temp_path, target)
+            self._record(relative, digest, written)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def finalize(self) -> Dict[str, int]:
+        """
+        Removes files written by the previous run but not by this one, and saves the manifest.
+
+        :return: Counts of written, unchanged and removed files.
+        """
+        for relative in sorted(set(self.previous) - set(self.current)):
+            path = os.path.join(self.output_dir, relative)
+            if os.path.exists(path):
+                os.remove(path)
+                self.stats["removed"] += 1
+                logger.info(f"Removed stale output: {path}")
+            directory = os.path.dirname(path)
+            while directory != os.path.normpath(self.output_dir) and os.path.isdir(directory) and not os.listdir(directory):
+                os.rmdir(directory)
+                directory = os.path.dirname(directory)
+
+        if self.current != self.previous or not os.path.exists(self.manifest_path):
+            manifest = json.dumps({"files": dict(sorted(self.current.items()))}, indent=2)
+            atomic_write(self.manifest_path, manifest.encode("utf-8"))
+        self.previous = dict(self.current)
+        return dict(self.stats)
+
+
+# --- Example Usage ---
+# if __name__ == "__main__":
+#     manager = OutputManager("artifacts/generated_tests")
+#     manager.write("functional_api_tests.py", "def test_example():\n    assert True\n")
+#     with manager.open("postman_collection.json") as f:
+#         f.write("{}")
+#     print(manager.finalize())
@@ -1,19 +1,42 @@
 # ai-test-generator/generators/test_assembler.py
 
+import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from generators.output_manager import OutputManager, atomic_write
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER = "{generated_tests}"
+
 
 class TestAssembler:
     """
     Assembles final test files by combining AI-generated content with static templates.
+
+    Templates are read and split around the {generated_tests} placeholder once, then
+    cached. Generated code is inserted by concatenation rather than str.format, so
+    braces in the generated code or the template are kept as-is. Files are written
+    atomically and only when their content changed; when an OutputManager is given,
+    all writes go through it.
     """
 
-    def __init__(self, template_dir: str):
+    def __init__(self, template_dir: str, max_workers: int = 4, output_manager: Optional[OutputManager] = None):
         """
         :param template_dir: Directory containing framework-specific test templates.
+        :param max_workers: Maximum number of files rendered and written in parallel.
+        :param output_manager: Optional manager owning the output directory.
         """
         self.template_dir = template_dir
+        self.max_workers = max_workers
+        self.output_manager = output_manager
+        self._templates: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self._lock = threading.Lock()
 
-    def load_template(self, framework: str, template_name: str = "default") -> str:
+    def load_template(self, framework: str, template_name: str = "template") -> str:
         """
         Loads a template for the specified framework.
         
@@ -27,27 +50,88 @@ class TestAssembler:
         with open(template_path, "r", encoding="utf-8") as f:
             return f.read()
 
-    def assemble_tests(self, framework: str, ai_generated_tests: str, output_path: str) -> None:
+    def _parsed_template(self, framework: str, template_name: str) -> Tuple[str, str]:
+        """
+        Returns the cached (prefix, suffix) around the placeholder of a template.
+        Templates without a placeholder get the generated tests appended.
+        """
+        key = (framework, template_name)
+        with self._lock:
+            if key not in self._templates:
+                content = self.load_template(framework, template_name)
+                prefix, found, suffix = content.partition(PLACEHOLDER)
+                self._templates[key] = (prefix, suffix) if found else (content.rstrip("\n") + "\n\n", "\n")
+            return self._templates[key]
+
+    def render(self, framework: str, ai_generated_tests: str, template_name: str = "template") -> str:
+        """
+        Inserts the generated tests into the framework template.
+
+        :param framework: The target test framework.
+        :param ai_generated_tests: The tests generated by the AI.
+        :param template_name: The template file base name.
+        :return: The final file content.
+        """
+        prefix, suffix = self._parsed_template(framework, template_name)
+        return prefix + ai_generated_tests + suffix
+
+    @staticmethod
+    def write_if_changed(output_path: str, content: str) -> bool:
+        """
+        Writes content atomically (temp file + rename), skipping the write if the
+        file already holds identical content so its mtime is left untouched.
+
+        :param output_path: Destination path.
+        :param content: File content.
+        :return: True if the file was written, False if it was already up to date.
+        """
+        data = content.encode("utf-8")
+        try:
+            with open(output_path, "rb") as f:
+                if f.read() == data:
+                    return False
+        except FileNotFoundError:
+            pass
+
+        atomic_write(output_path, data)
+        return True
+
+    def assemble_tests(self, framework: Optional[str], ai_generated_tests: str, output_path: str) -> bool:
         """
         Combines the AI-generated tests with the static template and writes the final test file.
         
-        :param framework: The target test framework.
+        :param framework: The target test framework, or None to write the content without a template.
         :param ai_generated_tests: The tests generated by the AI.
         :param output_path: Path where the assembled test file should be saved.
+        :return: True if the file was written, False if it was unchanged.
         """
         try:
-            template_content = self.load_template(framework)
-            # Assume the template contains a placeholder {generated_tests}
-            final_test_content = template_content.format(generated_tests=ai_generated_tests)
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(final_test_content)
-            print(f"Final test file assembled at: {output_path}")
+            content = self.render(framework, ai_generated_tests) if framework else ai_generated_tests
+            if self.output_manager:
+                written = self.output_manager.write(output_path, content)
+            else:
+                written = self.write_if_changed(output_path, content)
         except Exception as e:
             raise RuntimeError(f"Failed to assemble test file: {e}") from e
+        logger.info(f"{'Assembled' if written else 'Unchanged'}: {output_path}")
+        return written
+
+    def assemble_many(self, jobs: List[Tuple[Optional[str], str, str]]) -> Dict[str, bool]:
+        """
+        Renders and writes several files concurrently.
+
+        :param jobs: (framework or None, generated content, output path) tuples.
+        :return: A mapping of output path to whether it was written.
+        """
+        if not jobs:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(jobs)))) as executor:
+            written = list(executor.map(lambda job: self.assemble_tests(*job), jobs))
+        return {job[2]: was_written for job, was_written in zip(jobs, written)}
 
 
 # --- Example Usage ---
 # if __name__ == "__main__":
-#     assembler = TestAssembler(template_dir="ai-test-generator/templates/framework")
+#     assembler = TestAssembler(template_dir="templates/framework")
 #     ai_tests = "def test_example():\n    assert True"
 #     assembler.assemble_tests(framework="pytest", ai_generated_tests=ai_tests, output_path="assembled_test.py")
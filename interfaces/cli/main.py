@@ -4,19 +4,11 @@ CLI entry point for the AI Enabled Test Generator.
 """
 
 import argparse
-import os
 import sys
 import logging
-import yaml
-from dotenv import load_dotenv
-import shutil
 
-from ai_engine.orchestrator import Orchestrator
-from ai_engine.adapters.openai_adapter import OpenAIAdapter
-from utils.config_loader import load_config
-
-# Load environment variables before anything else
-load_dotenv()
+# Heavy modules (orchestrator, generators, provider SDKs) are imported inside
+# main() so that `--help` and argument errors return without loading them.
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description="AI Enabled Test Generator CLI")
@@ -29,44 +21,64 @@ def parse_arguments():
         help='Test types to generate (functional, security, performance, e2e)'
     )
     parser.add_argument(
-        '--framework', required=True,
-        help='Test framework to use (e.g., pytest, jest, postman)'
+        '--framework', nargs='+', required=True, choices=['pytest', 'jest', 'postman'],
+        help='Test frameworks to produce (pytest, jest, postman); all are rendered from one generation run'
     )
     parser.add_argument(
         '--output-dir', required=True,
         help='Output directory for generated tests'
     )
+    parser.add_argument(
+        '--candidates', type=int, default=1,
+        help='Number of candidate completions per test type; the best-scoring one is kept (default: 1)'
+    )
+    parser.add_argument(
+        '--validate-with-mock', action='store_true',
+        help='Run the generated tests against a local mock server built from the spec'
+    )
+    parser.add_argument(
+        '--set', action='append', default=[], metavar='SECTION.KEY=VALUE',
+        help='Override a setting from config/*.yaml, e.g. generation_rules.repair.max_rounds=0 (repeatable)'
+    )
     return parser.parse_args()
 
-def clean_output_directory(output_dir: str) -> None:
-    """
-    Clean up the output directory by removing it and recreating it.
-    
-    :param output_dir: Path to the output directory
-    """
-    if os.path.exists(output_dir):
-        logging.info(f"Cleaning up existing output directory: {output_dir}")
-        shutil.rmtree(output_dir)
-    os.makedirs(output_dir, exist_ok=True)
-    logging.info(f"Created fresh output directory: {output_dir}")
-
 def main():
-    # Check for required environment variables first
-    if not os.getenv("OPENAI_API_KEY"):
-        logging.error("OPENAI_API_KEY environment variable is not set. Please set it in your .env file.")
-        sys.exit(1)
-
     args = parse_arguments()
 
-    # Clean up output directory before generating new tests
-    clean_output_directory(args.output_dir)
+    # Load environment variables (BASE_URL, PERF_*, AITG__* overrides) from .env
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    import yaml
+    from ai_engine.orchestrator import Orchestrator
+    from ai_engine.adapters.adapter_router import AdapterRouter
+    from utils.settings import ConfigError, configure_settings
+    from generators.output_manager import OutputManager
 
-    # Load a global configuration (if needed)
+    # All generated files go through the output manager, which only rewrites
+    # changed files and prunes the ones a previous run left behind.
+    output_manager = OutputManager(args.output_dir)
+
+    # All config/*.yaml files are loaded and validated once; AITG__* environment
+    # variables and --set options are layered on top.
     try:
-        framework_config = load_config("config/framework_config.yaml")
-    except Exception as e:
-        logging.error(f"Failed to load framework configuration: {e}")
-        framework_config = {}
+        settings = configure_settings(overrides=args.set)
+    except ConfigError as e:
+        logging.error(f"Failed to load configuration: {e}")
+        sys.exit(1)
+    if not settings.ai_providers:
+        logging.error("No AI providers configured (config/ai_providers.yaml).")
+        sys.exit(1)
+
+    # Secrets (API keys and key pools) resolve through the backends of config/secrets.yaml.
+    from utils.secret_manager import get_api_key
+    if not get_api_key("OPENAI_API_KEY"):
+        logging.warning("OPENAI_API_KEY secret is not set; OpenAI-routed test types will fall back to other providers.")
+
+    framework_config = settings.framework_config
+    # Model mapping selects the generator module and adapter per test type
+    model_mapping = settings.model_mapping
+    generation_rules = settings.generation_rules
 
     # Load the specification file (YAML or JSON)
     try:
@@ -79,37 +91,147 @@ def main():
     # For this example, we assume the spec is already in a unified format.
     unified_spec = spec
 
-    # Initialize the AI adapter (using OpenAI adapter for demonstration)
-    try:
-        adapter = OpenAIAdapter()
-    except Exception as e:
-        logging.error(f"Failed to initialize AI adapter: {e}")
-        sys.exit(1)
+    # Route each test type to its configured provider. Adapters (and their SDKs)
+    # are only built when a test type routed to them is generated; calls are bounded
+    # by the resilience settings (timeouts, circuit breakers, hedging).
+    router = AdapterRouter(settings.ai_providers, model_mapping, resilience=generation_rules.get("resilience"),
+                           transport=generation_rules.get("transport"))
 
     # Initialize and run the orchestrator with the unified spec and requested test types
-    orchestrator = Orchestrator(adapter, unified_spec)
+    generation_params = {"candidates": args.candidates} if args.candidates > 1 else {}
+    orchestrator = Orchestrator(
+        router,
+        unified_spec,
+        generation_params=generation_params,
+        model_mapping=model_mapping,
+        repair_config=generation_rules.get("repair"),
+        test_data_config=generation_rules.get("test_data"),
+    )
     results = orchestrator.run(args.test_types)
 
+    suites = [results[test_type] for test_type in args.test_types if test_type in results]
+    write_suite_files(suites, output_manager)
+
     # Save the tests to separate files
-    for filename, test_code in results["test_files"].items():
-        output_path = os.path.join(args.output_dir, filename)
-        with open(output_path, "w") as f:
-            # Add common imports and fixtures to each file
-            f.write("""import pytest
-import requests
-import allure
-
-@pytest.fixture
-def base_url():
-    return 'http://localhost:8080/api'
-
-@pytest.fixture
-def headers():
-    return {'Content-Type': 'application/json'}\n\n""")
-            
-            f.write(test_code)
-        
-        logging.info(f"Generated {filename} in {args.output_dir}")
+    if "pytest" in args.framework:
+        write_pytest_files(results["test_files"], output_manager, results.get("data_files"),
+                           results.get("rendered_files"))
+
+    if "jest" in args.framework:
+        write_jest_files(suites, output_manager, framework_config.get("jest", {}))
+
+    if "postman" in args.framework:
+        export_postman(spec, output_manager, framework_config.get("postman", {}))
+
+    stats = output_manager.finalize()
+    logging.info(f"Output in {args.output_dir}: {stats['written']} written, {stats['unchanged']} unchanged, "
+                 f"{stats['removed']} removed")
+
+    if args.validate_with_mock:
+        validate_with_mock(spec, args.output_dir)
+
+def write_pytest_files(test_files: dict, output_manager, data_files: dict = None, rendered_files: dict = None) -> None:
+    """
+    Writes the generated pytest modules through the pytest template, which
+    provides the common imports and fixtures, next to the data files they load.
+
+    :param test_files: Mapping of file name to generated test code.
+    :param output_manager: The OutputManager owning the output directory.
+    :param data_files: Mapping of file name to test data (e.g. test_data.json), written as is.
+    :param rendered_files: Mapping of file name to complete modules and data files rendered
+                           from structured suites, written as is.
+    """
+    from generators.test_assembler import TestAssembler
+
+    assembler = TestAssembler("templates/framework", output_manager=output_manager)
+    jobs = [("pytest", test_code, filename) for filename, test_code in test_files.items()]
+    jobs += [(None, content, filename) for filename, content in (data_files or {}).items()]
+    jobs += [(None, content, filename) for filename, content in (rendered_files or {}).items()]
+    written = assembler.assemble_many(jobs)
+    logging.info(f"Generated {sum(written.values())} pytest file(s) in {output_manager.output_dir} "
+                 f"({len(written) - sum(written.values())} unchanged)")
+
+def write_suite_files(suites: list, output_manager) -> None:
+    """
+    Persists the generated suites as JSON Lines (suites/<type>.jsonl), so they can be
+    reloaded and re-rendered without another generation run.
+
+    :param suites: The TestSuite objects returned by the orchestrator.
+    :param output_manager: The OutputManager owning the output directory.
+    """
+    from core.test_models.serialization import dump_suite
+
+    for suite in suites:
+        with output_manager.open(f"suites/{suite.test_type or suite.name}.jsonl") as f:
+            dump_suite(suite, f)
+
+def write_jest_files(suites: list, output_manager, jest_config: dict) -> None:
+    """
+    Renders the generated suites as Jest tests through the framework-neutral test IR,
+    reusing the pytest generation instead of running the LLM again.
+
+    :param suites: The TestSuite objects returned by the orchestrator.
+    :param output_manager: The OutputManager owning the output directory.
+    :param jest_config: The 'jest' section of framework_config.yaml.
+    """
+    from generators.framework_adapters.registry import load_renderer_class
+    from generators.test_assembler import TestAssembler
+
+    renderer = load_renderer_class("jest")(base_url=jest_config.get("base_url", "http://localhost:8080/api"))
+    jobs = []
+    for suite in suites:
+        filename = suite.metadata.get("filename")
+        if not filename:
+            continue
+        for rendered_name, content in renderer.render(suite, filename).items():
+            framework = "jest" if rendered_name.endswith(".js") else None
+            jobs.append((framework, content, rendered_name))
+        structured = sum(1 for case in suite.test_cases if case.is_structured)
+        logging.info(f"Rendered {filename} for Jest ({structured}/{len(suite.test_cases)} cases translated)")
+    TestAssembler("templates/framework", output_manager=output_manager).assemble_many(jobs)
+
+def export_postman(spec: dict, output_manager, postman_config: dict) -> None:
+    """
+    Exports a Postman collection and environment for the specification.
+
+    :param spec: The loaded API specification.
+    :param output_manager: The OutputManager owning the output directory.
+    :param postman_config: The 'postman' section of framework_config.yaml.
+    """
+    import json
+    from core.spec_processor.spec_normalizer import normalize_spec
+    from generators.framework_adapters.postman.collection_exporter import PostmanCollectionExporter
+
+    exporter = PostmanCollectionExporter(normalize_spec(spec), base_url=postman_config.get("base_url"))
+    with output_manager.open("postman_collection.json") as f:
+        for chunk in exporter.iter_chunks():
+            f.write(chunk)
+    output_manager.write("postman_environment.json", json.dumps(exporter.environment(), indent=2))
+    logging.info(f"Exported Postman collection and environment to {output_manager.output_dir}")
+
+def validate_with_mock(spec: dict, output_dir: str) -> None:
+    """
+    Smoke-validates the generated tests against an in-process mock server built from the spec.
+
+    :param spec: The loaded API specification.
+    :param output_dir: Directory containing the generated tests.
+    """
+    from core.spec_processor.spec_normalizer import normalize_spec
+    from generators.infrastructure.mock_server_generator import MockServerGenerator
+    from runner.parallel_runner import ParallelTestRunner
+
+    try:
+        server = MockServerGenerator(normalize_spec(spec)).serve(port=0)
+    except Exception as e:
+        logging.error(f"Failed to start mock server: {e}")
+        return
+
+    with server:
+        logging.info(f"Running generated tests against mock server at {server.base_url}")
+        runner = ParallelTestRunner(options="--disable-warnings", env={"BASE_URL": server.base_url})
+        summary = runner.run([output_dir])
+    logging.info(f"Mock validation: {summary.get('tests', 0)} tests, {summary.get('failures', 0)} failures, "
+                 f"{summary.get('errors', 0)} errors")
 
 if __name__ == "__main__":
     main()
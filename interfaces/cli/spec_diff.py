@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Compares two versions of an API specification and reports the affected endpoints.
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+import yaml
+
+from core.spec_processor.spec_diff import diff_specs
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Classify the changes between two API specification versions")
+    parser.add_argument('old_spec', help='Path to the previous specification (JSON/YAML)')
+    parser.add_argument('new_spec', help='Path to the current specification (JSON/YAML)')
+    parser.add_argument(
+        '--output', default=None,
+        help='Write the full diff as JSON (usable with `python -m runner --affected`)'
+    )
+    parser.add_argument(
+        '--fail-on-breaking', action='store_true',
+        help='Exit with status 1 if any change is breaking'
+    )
+    return parser.parse_args()
+
+
+def load_spec(file_path: str) -> dict:
+    # YAML is a superset of JSON, so this reads both formats.
+    with open(file_path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    args = parse_arguments()
+
+    try:
+        old_spec, new_spec = load_spec(args.old_spec), load_spec(args.new_spec)
+    except Exception as e:
+        logging.error(f"Failed to load specification: {e}")
+        sys.exit(2)
+
+    diff = diff_specs(old_spec, new_spec)
+    for change in diff["changes"]:
+        marker = "BREAKING" if change["breaking"] else "changed"
+        print(f"[{marker}] {change['location']}: {change['change']}")
+    print(f"{len(diff['affected_endpoints'])} affected endpoint(s), {len(diff['breaking_endpoints'])} with breaking changes.")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(diff, f, indent=2)
+
+    if args.fail_on_breaking and diff["breaking_endpoints"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Entry point for running generated test suites in parallel shards.
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+from runner.parallel_runner import ParallelTestRunner
+from utils.settings import ConfigError, get_settings
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Run generated test suites in parallel shards")
+    parser.add_argument(
+        'test_paths', nargs='*', default=['artifacts/generated_tests'],
+        help='Files or directories containing generated tests'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=None,
+        help='Number of parallel pytest processes (default: runner.workers or CPU count)'
+    )
+    parser.add_argument(
+        '--alluredir', default=None,
+        help='Directory for merged Allure results'
+    )
+    parser.add_argument(
+        '--affected', default=None,
+        help='JSON file written by `python -m interfaces.cli.spec_diff`; only tests for its affected endpoints run'
+    )
+    return parser.parse_args()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    args = parse_arguments()
+
+    try:
+        framework_config = get_settings().framework_config
+    except ConfigError as e:
+        logging.error(f"Failed to load framework configuration: {e}")
+        framework_config = {}
+    pytest_config = framework_config.get("pytest", {})
+    runner_config = pytest_config.get("runner", {})
+
+    runner = ParallelTestRunner(
+        workers=args.workers if args.workers is not None else runner_config.get("workers", 0),
+        options=runner_config.get("options", ""),
+        durations_file=runner_config.get("durations_file", ".test_durations.json"),
+        junit_path=runner_config.get("junit_path", "artifacts/reports/junit.xml"),
+        allure_dir=args.alluredir or runner_config.get("allure_dir"),
+    )
+    endpoints = None
+    if args.affected:
+        with open(args.affected, "r", encoding="utf-8") as f:
+            endpoints = json.load(f)["affected_endpoints"]
+    summary = runner.run(args.test_paths, endpoints=endpoints)
+    sys.exit(summary["exit_code"])
+
+
+if __name__ == '__main__':
+    main()
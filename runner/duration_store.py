@@ -0,0 +1,94 @@
+# ai-test-generator/runner/duration_store.py
+
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable
+
+
+def junit_key(node_id: str) -> str:
+    """
+    Converts a pytest node id into the key used for duration history. The key matches
+    the classname/name pair pytest writes to JUnit XML, with parametrization stripped,
+    so durations recorded from reports can be looked up from collected node ids.
+
+    :param node_id: A pytest node id such as 'tests/test_api.py::test_get[1]'.
+    :return: A key such as 'tests.test_api::test_get' (or 'tests.test_api.TestPets::test_get').
+    """
+    path = node_id.partition("[")[0]
+    names = path.split("::")
+    names[0] = re.sub(r"\.py$", "", names[0].replace("/", "."))
+    return f"{'.'.join(names[:-1])}::{names[-1]}"
+
+
+class DurationStore:
+    """
+    Persists per-test durations between runs so shards can be balanced by expected runtime.
+    New measurements are blended with the history using an exponential moving average.
+    """
+
+    def __init__(self, path: str, smoothing: float = 0.5):
+        """
+        :param path: Path of the JSON file holding the duration history.
+        :param smoothing: Weight of the newest measurement in the moving average.
+        """
+        self.path = path
+        self.smoothing = smoothing
+        self.durations: Dict[str, float] = self._load()
+
+    def _load(self) -> Dict[str, float]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def estimate(self, node_id: str, default: float = None) -> float:
+        """
+        Returns the expected duration of a test.
+
+        :param node_id: The pytest node id.
+        :param default: Value for unknown tests; defaults to the mean of known durations (or 1s).
+        :return: Expected duration in seconds.
+        """
+        key = junit_key(node_id)
+        if key in self.durations:
+            return self.durations[key]
+        if default is not None:
+            return default
+        if self.durations:
+            return sum(self.durations.values()) / len(self.durations)
+        return 1.0
+
+    def record_junit(self, junit_paths: Iterable[str]) -> None:
+        """
+        Updates the history from JUnit XML reports. Parametrized cases of the same
+        test function are summed, since shards are planned per function.
+
+        :param junit_paths: Paths of JUnit XML files produced by pytest.
+        """
+        measured: Dict[str, float] = {}
+        for junit_path in junit_paths:
+            if not os.path.exists(junit_path):
+                continue
+            for case in ET.parse(junit_path).getroot().iter("testcase"):
+                key = f"{case.get('classname')}::{case.get('name', '').partition('[')[0]}"
+                measured[key] = measured.get(key, 0.0) + float(case.get("time") or 0.0)
+
+        for key, duration in measured.items():
+            previous = self.durations.get(key)
+            if previous is None:
+                self.durations[key] = duration
+            else:
+                self.durations[key] = self.smoothing * duration + (1 - self.smoothing) * previous
+
+    def save(self) -> None:
+        """Writes the duration history to disk."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.durations, f, indent=2, sort_keys=True)
@@ -0,0 +1,115 @@
+# ai-test-generator/runner/parallel_runner.py
+
+import logging
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from runner.duration_store import DurationStore
+from runner.result_merger import merge_allure_results, merge_junit_reports
+from runner.shard_planner import CollectionError, collect_tests, plan_shards, select_tests
+
+logger = logging.getLogger(__name__)
+
+
+class ParallelTestRunner:
+    """
+    Executes generated test suites in parallel pytest processes.
+
+    Tests are collected once, grouped by test module and endpoint, balanced across
+    shards using the duration history of previous runs, and executed as one pytest
+    process per shard. Per-shard JUnit and Allure results are merged at the end and
+    the measured durations feed the next run's plan.
+    """
+
+    def __init__(self, workers: int = 0, options: str = "", durations_file: str = ".test_durations.json",
+                 junit_path: str = "artifacts/reports/junit.xml", allure_dir: str = None, env: Dict[str, str] = None):
+        """
+        :param workers: Number of parallel pytest processes (0 uses the CPU count).
+        :param options: Extra pytest options passed to every shard.
+        :param durations_file: JSON file with the duration history.
+        :param junit_path: Path of the merged JUnit report.
+        :param allure_dir: Optional merged Allure results directory.
+        :param env: Optional extra environment variables for the shards (e.g., BASE_URL).
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.options = shlex.split(options or "")
+        self.durations = DurationStore(durations_file)
+        self.junit_path = junit_path
+        self.allure_dir = allure_dir
+        self.env = env or {}
+
+    def run(self, test_paths: List[str], cwd: str = None, endpoints: Optional[List[str]] = None) -> dict:
+        """
+        Runs the suites found in the given paths.
+
+        :param test_paths: Files or directories containing generated tests.
+        :param cwd: Working directory for collection and execution.
+        :param endpoints: Optional endpoint keys (e.g., a spec diff's affected set); only
+                          tests that may exercise them are run.
+        :return: A summary with the exit code, shard count, wall time and merged counters.
+        """
+        cwd = cwd or os.getcwd()
+        try:
+            node_ids, broken = collect_tests(test_paths, cwd=cwd)
+        except CollectionError as e:
+            logger.error(str(e))
+            return {"exit_code": 2, "shards": 0, "tests": 0}
+        if endpoints is not None:
+            collected = len(node_ids)
+            node_ids = select_tests(node_ids, endpoints, cwd=cwd)
+            logger.info(f"Selected {len(node_ids)} of {collected} tests for {len(endpoints)} endpoint(s).")
+        if not node_ids and not broken:
+            logger.warning(f"No tests collected from {test_paths}.")
+            return {"exit_code": 5, "shards": 0, "tests": 0}
+
+        shards = plan_shards(node_ids, self.workers, self.durations, cwd=cwd) if node_ids else []
+        if broken:
+            # Modules that fail to import run in a shard of their own, so their collection
+            # errors reach the merged report and the exit code instead of vanishing.
+            logger.error(f"{len(broken)} module(s) failed to collect: {', '.join(broken)}")
+            shards.append(broken)
+        logger.info(f"Running {len(node_ids)} tests in {len(shards)} shard(s).")
+
+        # Shard reports are merged into the configured outputs; the work dir is removed afterwards.
+        with tempfile.TemporaryDirectory(prefix="test-shards-") as work_dir:
+            junit_paths = [os.path.join(work_dir, f"shard-{i}.xml") for i in range(len(shards))]
+            allure_dirs = [os.path.join(work_dir, f"allure-{i}") for i in range(len(shards))]
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+                exit_codes = list(executor.map(
+                    lambda i: self._run_shard(shards[i], junit_paths[i], allure_dirs[i], cwd),
+                    range(len(shards))
+                ))
+            elapsed = time.perf_counter() - start
+
+            totals = merge_junit_reports(junit_paths, self.junit_path)
+            if self.allure_dir:
+                merge_allure_results(allure_dirs, self.allure_dir)
+            self.durations.record_junit(junit_paths)
+            self.durations.save()
+
+        # A shard with nothing collected (5) must not mask a real failure in another shard.
+        exit_code = max((code for code in exit_codes if code != 5), default=0)
+        summary = {"exit_code": exit_code, "shards": len(shards), "wall_time": elapsed, **totals}
+        logger.info(f"Parallel run finished: {summary}")
+        return summary
+
+    def _run_shard(self, node_ids: List[str], junit_path: str, allure_dir: str, cwd: str) -> int:
+        """
+        Runs a single shard in its own pytest process.
+
+        :return: The pytest exit code.
+        """
+        command = [sys.executable, "-m", "pytest", f"--rootdir={cwd}", f"--junitxml={junit_path}", *self.options]
+        if self.allure_dir:
+            command.append(f"--alluredir={allure_dir}")
+        command.extend(node_ids)
+        env = {**os.environ, **self.env}
+        return subprocess.run(command, cwd=cwd, env=env).returncode
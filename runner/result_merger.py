@@ -0,0 +1,63 @@
+# ai-test-generator/runner/result_merger.py
+
+import os
+import shutil
+import xml.etree.ElementTree as ET
+from typing import List
+
+_COUNTERS = ("tests", "failures", "errors", "skipped")
+
+
+def merge_junit_reports(junit_paths: List[str], output_path: str) -> dict:
+    """
+    Merges per-shard JUnit XML reports into a single <testsuites> document.
+
+    :param junit_paths: Paths of the shard reports (missing files are ignored).
+    :param output_path: Path of the merged report.
+    :return: Aggregated counters (tests, failures, errors, skipped, time).
+    """
+    merged = ET.Element("testsuites")
+    totals = {name: 0 for name in _COUNTERS}
+    totals["time"] = 0.0
+
+    for junit_path in junit_paths:
+        if not os.path.exists(junit_path):
+            continue
+        root = ET.parse(junit_path).getroot()
+        suites = [root] if root.tag == "testsuite" else list(root.iter("testsuite"))
+        for suite in suites:
+            merged.append(suite)
+            for name in _COUNTERS:
+                totals[name] += int(suite.get(name, 0))
+            totals["time"] += float(suite.get("time", 0.0))
+
+    for name in _COUNTERS:
+        merged.set(name, str(totals[name]))
+    merged.set("time", f"{totals['time']:.3f}")
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    ET.ElementTree(merged).write(output_path, encoding="utf-8", xml_declaration=True)
+    return totals
+
+
+def merge_allure_results(shard_dirs: List[str], output_dir: str) -> int:
+    """
+    Moves per-shard Allure result files into one results directory. Allure result
+    files are uniquely named, so merging is a plain move.
+
+    :param shard_dirs: Allure result directories written by the shards.
+    :param output_dir: Combined Allure results directory.
+    :return: Number of files merged.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    moved = 0
+    for shard_dir in shard_dirs:
+        if not os.path.isdir(shard_dir):
+            continue
+        for filename in os.listdir(shard_dir):
+            shutil.move(os.path.join(shard_dir, filename), os.path.join(output_dir, filename))
+            moved += 1
+        shutil.rmtree(shard_dir, ignore_errors=True)
+    return moved
@@ -0,0 +1,163 @@
+# ai-test-generator/runner/shard_planner.py
+
+import ast
+import heapq
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from runner.duration_store import DurationStore
+
+# Generated modules are named e.g. functional_api_tests.py, which pytest's
+# default python_files patterns do not match when collecting a directory.
+GENERATED_FILE_PATTERNS = "test_*.py *_test.py *_tests.py"
+
+# First path segment(s) of an endpoint literal, e.g. '/pets' from f'{base_url}/pets/{pet_id}'.
+_PATH_LITERAL = re.compile(r"^/[A-Za-z0-9_\-.]+")
+
+
+class CollectionError(RuntimeError):
+    """Raised when `pytest --collect-only` fails without naming the modules it could not collect."""
+
+
+def collect_tests(test_paths: List[str], cwd: str = None) -> Tuple[List[str], List[str]]:
+    """
+    Collects test node ids with `pytest --collect-only`, reduced to one id per test function,
+    along with the modules that failed to import or collect.
+
+    :param test_paths: Files or directories containing the generated suites.
+    :param cwd: Working directory (and rootdir) used for collection.
+    :return: A tuple of (function-level node ids in collection order, paths that failed to collect).
+    :raises CollectionError: If pytest failed without reporting which modules are broken.
+    """
+    cwd = cwd or os.getcwd()
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", f"--rootdir={cwd}",
+         "-o", f"python_files={GENERATED_FILE_PATTERNS}", *test_paths],
+        cwd=cwd, capture_output=True, text=True
+    )
+    node_ids, errors = [], []
+    seen = set()
+    for line in result.stdout.splitlines():
+        if line.startswith("ERROR "):
+            # Short summary line, e.g. "ERROR security_tests.py" or "ERROR security_tests.py - SyntaxError".
+            path = line[len("ERROR "):].split(" - ", 1)[0].strip()
+            if path not in errors:
+                errors.append(path)
+            continue
+        if "::" not in line:
+            continue
+        node_id = line.strip().partition("[")[0]
+        if node_id not in seen:
+            seen.add(node_id)
+            node_ids.append(node_id)
+    # 5 means nothing was collected, which is not an error here.
+    if result.returncode not in (0, 5) and not errors:
+        output = (result.stderr or result.stdout).strip().splitlines()
+        raise CollectionError(f"pytest --collect-only exited with {result.returncode}: "
+                              f"{output[-1] if output else 'no output'}")
+    return node_ids, errors
+
+
+def collect_node_ids(test_paths: List[str], cwd: str = None) -> List[str]:
+    """
+    Collects test node ids with `pytest --collect-only`, reduced to one id per test function.
+
+    :param test_paths: Files or directories containing the generated suites.
+    :param cwd: Working directory (and rootdir) used for collection.
+    :return: Function-level node ids, in collection order.
+    """
+    return collect_tests(test_paths, cwd)[0]
+
+
+def endpoint_index(test_file: str) -> Dict[str, str]:
+    """
+    Maps each test function in a module to the endpoint it exercises, taken from the
+    first path-like string literal in its body.
+
+    :param test_file: Path to the test module.
+    :return: A dictionary of function name to endpoint (e.g., '/pets').
+    """
+    try:
+        with open(test_file, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+    except (OSError, SyntaxError):
+        return {}
+
+    index = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) or not node.name.startswith("test"):
+            continue
+        for child in ast.walk(node):
+            if isinstance(child, ast.Constant) and isinstance(child.value, str):
+                match = _PATH_LITERAL.match(child.value)
+                if match:
+                    index[node.name] = match.group(0)
+                    break
+    return index
+
+
+def select_tests(node_ids: List[str], endpoints: List[str], cwd: str = None) -> List[str]:
+    """
+    Keeps the tests that may exercise one of the given endpoints (e.g. the affected set of
+    a spec diff). Tests are matched on the first path segment of their endpoint; tests
+    whose endpoint cannot be determined are always kept.
+
+    :param node_ids: Function-level node ids.
+    :param endpoints: Endpoint keys ('METHOD /path') or paths.
+    :param cwd: Directory the node ids are relative to.
+    :return: The selected node ids, in their original order.
+    """
+    cwd = cwd or os.getcwd()
+    prefixes = set()
+    for endpoint in endpoints:
+        match = _PATH_LITERAL.match(endpoint.split(" ", 1)[-1])
+        prefixes.add(match.group(0) if match else "/")
+    indexes: Dict[str, Dict[str, str]] = {}
+    selected = []
+    for node_id in node_ids:
+        test_file, _, function = node_id.partition("::")
+        if test_file not in indexes:
+            indexes[test_file] = endpoint_index(os.path.join(cwd, test_file))
+        endpoint = indexes[test_file].get(function.split("::")[-1])
+        if endpoint is None or endpoint in prefixes:
+            selected.append(node_id)
+    return selected
+
+
+def plan_shards(node_ids: List[str], workers: int, durations: Optional[DurationStore] = None,
+                cwd: str = None) -> List[List[str]]:
+    """
+    Groups tests into units by test module (test type) and endpoint, then assigns the
+    units to `workers` shards using longest-processing-time-first on expected duration.
+    Keeping an endpoint's tests together preserves any data they share.
+
+    :param node_ids: Function-level node ids.
+    :param workers: Number of shards to produce.
+    :param durations: Optional duration history used for balancing.
+    :param cwd: Directory the node ids are relative to.
+    :return: A list of shards, each a list of node ids.
+    """
+    cwd = cwd or os.getcwd()
+    indexes: Dict[str, Dict[str, str]] = {}
+    units: Dict[Tuple[str, str], List[str]] = {}
+    for node_id in node_ids:
+        test_file, _, function = node_id.partition("::")
+        if test_file not in indexes:
+            indexes[test_file] = endpoint_index(os.path.join(cwd, test_file))
+        endpoint = indexes[test_file].get(function.split("::")[-1], "")
+        units.setdefault((test_file, endpoint), []).append(node_id)
+
+    def _cost(unit_ids: List[str]) -> float:
+        return sum(durations.estimate(n) for n in unit_ids) if durations else float(len(unit_ids))
+
+    workers = max(1, min(workers, len(units)))
+    heap = [(0.0, i) for i in range(workers)]
+    shards: List[List[str]] = [[] for _ in range(workers)]
+    for unit_ids in sorted(units.values(), key=_cost, reverse=True):
+        load, shard = heapq.heappop(heap)
+        shards[shard].extend(unit_ids)
+        heapq.heappush(heap, (load + _cost(unit_ids), shard))
+    return [shard for shard in shards if shard]
@@ -0,0 +1,39 @@
+# ai-test-generator/tests/test_import_budget.py
+
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Wall-time budget of `--help`, including interpreter start-up. Provider SDKs are
+# imported lazily, so the CLI must answer well before any of them could load.
+HELP_BUDGET_SECONDS = 2.0
+
+HEAVY_MODULES = ("openai", "transformers", "google.generativeai")
+
+
+def _env() -> dict:
+    return {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))}
+
+
+def test_cli_help_within_budget(tmp_path):
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-m", "interfaces.cli.main", "--help"], cwd=tmp_path, env=_env(),
+                            capture_output=True, text=True, timeout=60)
+    elapsed = time.perf_counter() - started
+
+    assert result.returncode == 0, result.stderr
+    assert "--spec" in result.stdout
+    assert elapsed < HELP_BUDGET_SECONDS, f"--help took {elapsed:.2f}s (budget {HELP_BUDGET_SECONDS}s)"
+
+
+def test_orchestrator_import_skips_provider_sdks(tmp_path):
+    code = ("import sys, ai_engine.orchestrator; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=_env(),
+                            capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "", f"imported at module level: {result.stdout.strip()}"
@@ -0,0 +1,30 @@
+# ai-test-generator/tests/test_parallel_runner.py
+
+from runner.parallel_runner import ParallelTestRunner
+from runner.shard_planner import collect_tests
+
+
+def _write_suites(directory):
+    (directory / "functional_api_tests.py").write_text("def test_list():\n    pass\n\ndef test_get():\n    pass\n")
+    (directory / "security_tests.py").write_text("def test_injection(:\n    pass\n")
+    (directory / "e2e_tests.py").write_text("import module_that_does_not_exist\n\ndef test_flow():\n    pass\n")
+
+
+def test_collect_reports_modules_that_do_not_import(tmp_path):
+    _write_suites(tmp_path)
+
+    node_ids, broken = collect_tests([str(tmp_path)], cwd=str(tmp_path))
+
+    assert node_ids == ["functional_api_tests.py::test_list", "functional_api_tests.py::test_get"]
+    assert sorted(broken) == ["e2e_tests.py", "security_tests.py"]
+
+
+def test_run_fails_when_a_module_does_not_import(tmp_path):
+    _write_suites(tmp_path)
+    runner = ParallelTestRunner(workers=2, durations_file=str(tmp_path / "durations.json"),
+                                junit_path=str(tmp_path / "reports" / "junit.xml"))
+
+    summary = runner.run([str(tmp_path)], cwd=str(tmp_path))
+
+    assert summary["exit_code"] == 2
+    assert summary["errors"] == 2
@@ -1,41 +1,251 @@
+import atexit
+import contextvars
+import hashlib
+import json
 import logging
-from datetime import datetime
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+LOG_FILE = os.environ.get("AUDIT_LOG_FILE", "audit.log")
+
+# Fields every audit record may carry; anything else passed to log_event is kept too.
+AUDIT_FIELDS = ("run_id", "spec_hash", "test_type", "adapter", "tokens", "duration")
+
+_LEVELS = {"info": logging.INFO, "warning": logging.WARNING, "error": logging.ERROR}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats audit records as one JSON object per line: timestamp, level, event, and
+    the structured fields attached to the record.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "event": record.getMessage(),
+        }
+        entry.update(getattr(record, "audit", None) or {})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _BatchFlushMixin:
+    """Lets the writer thread defer flushes until the end of a batch."""
+
+    deferred = False
+
+    def flush(self):
+        if not self.deferred:
+            super().flush()
+
+
+class BatchingRotatingFileHandler(_BatchFlushMixin, logging.handlers.RotatingFileHandler):
+    """Size-based rotation, flushed once per batch instead of once per record."""
+
+
+class BatchingTimedRotatingFileHandler(_BatchFlushMixin, logging.handlers.TimedRotatingFileHandler):
+    """Time-based rotation, flushed once per batch instead of once per record."""
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues records without formatting them or waiting: formatting happens on the
+    writer thread, and records are dropped (and counted) if the queue is full.
+    """
+
+    def __init__(self, record_queue: queue.Queue):
+        super().__init__(record_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class AuditLogger:
+    """
+    Asynchronous audit logger. Callers only put records on a bounded queue; a
+    background thread formats them as JSON lines and writes them in batches to a
+    rotating file, flushing once per batch or every `flush_interval` seconds.
+    """
+
+    def __init__(self, log_file: str = None, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                 when: Optional[str] = None, batch_size: int = 256, flush_interval: float = 1.0,
+                 queue_size: int = 100000):
+        """
+        :param log_file: Path of the audit log (default: AUDIT_LOG_FILE env var or audit.log).
+        :param max_bytes: Rotate when the file reaches this size (ignored when `when` is set).
+        :param backup_count: Number of rotated files to keep.
+        :param when: Rotate on time instead of size, e.g. 'midnight' or 'H' (see TimedRotatingFileHandler).
+        :param batch_size: Maximum number of records written between two flushes.
+        :param flush_interval: Maximum seconds a record waits before being flushed.
+        :param queue_size: Records buffered before new ones are dropped.
+        """
+        self.log_file = log_file or LOG_FILE
+        directory = os.path.dirname(self.log_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if when:
+            self.file_handler = BatchingTimedRotatingFileHandler(self.log_file, when=when, backupCount=backup_count,
+                                                                 encoding="utf-8", delay=True)
+        else:
+            self.file_handler = BatchingRotatingFileHandler(self.log_file, maxBytes=max_bytes, backupCount=backup_count,
+                                                            encoding="utf-8", delay=True)
+        self.file_handler.setFormatter(JsonFormatter())
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.queue_handler = _NonBlockingQueueHandler(self.queue)
+        self.logger = logging.getLogger("audit")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+        self.logger.addHandler(self.queue_handler)
+
+        self._stop = object()
+        self._writer = threading.Thread(target=self._drain, name="audit-writer", daemon=True)
+        self._writer.start()
+
+    @property
+    def dropped(self) -> int:
+        """Number of records dropped because the queue was full."""
+        return self.queue_handler.dropped
+
+    def _drain(self) -> None:
+        """Writer thread: waits for a record, takes whatever else is queued, writes and flushes once."""
+        while True:
+            record = self.queue.get()
+            batch = [record]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and record is not self._stop:
+                try:
+                    record = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                batch.append(record)
+
+            self.file_handler.deferred = True
+            try:
+                for item in batch:
+                    if item is not self._stop:
+                        self.file_handler.handle(item)
+            finally:
+                self.file_handler.deferred = False
+                self.file_handler.flush()
+            if batch[-1] is self._stop:
+                return
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Writes the queued records, then stops the writer thread and closes the file.
+
+        :param timeout: Seconds to wait for the writer thread.
+        """
+        if not self._writer.is_alive():
+            return
+        self.logger.removeHandler(self.queue_handler)
+        self.queue.put(self._stop)
+        self._writer.join(timeout)
+        self.file_handler.close()
+        if self.dropped:
+            logging.getLogger(__name__).warning(f"{self.dropped} audit record(s) dropped: the audit queue was full.")
+
+
+_audit_logger: Optional[AuditLogger] = None
+_audit_lock = threading.Lock()
+# Per thread / asyncio task, so concurrent runs in one process keep their own run_id.
+_context: contextvars.ContextVar = contextvars.ContextVar("audit_context", default={})
+
+
+def configure_audit_logger(log_file: str = None, **options) -> AuditLogger:
+    """
+    (Re)configures the process-wide audit logger.
+
+    :param log_file: Path of the audit log.
+    :param options: AuditLogger options (max_bytes, backup_count, when, batch_size, flush_interval, queue_size).
+    :return: The new AuditLogger.
+    """
+    global _audit_logger
+    with _audit_lock:
+        if _audit_logger is not None:
+            _audit_logger.close()
+        _audit_logger = AuditLogger(log_file, **options)
+        return _audit_logger
+
+
+def get_audit_logger() -> AuditLogger:
+    """Returns the process-wide audit logger, creating it with default settings on first use."""
+    global _audit_logger
+    if _audit_logger is None:
+        with _audit_lock:
+            if _audit_logger is None:
+                _audit_logger = AuditLogger()
+    return _audit_logger
 
-LOG_FILE = "audit.log"
 
 def setup_audit_logger(log_file: str = None):
     """
     Sets up and returns an audit logger.
     """
-    if log_file is None:
-        log_file = LOG_FILE
-    logger = logging.getLogger("audit")
-    logger.setLevel(logging.INFO)
-    # Avoid adding multiple handlers if logger is already configured.
-    if not logger.handlers:
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.INFO)
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    return logger
-
-def log_event(event: str, level: str = "info"):
-    """
-    Logs an audit event.
-    """
-    logger = setup_audit_logger()
-    level = level.lower()
-    if level == "info":
-        logger.info(event)
-    elif level == "warning":
-        logger.warning(event)
-    elif level == "error":
-        logger.error(event)
-    else:
-        logger.info(event)
+    if log_file is not None and (_audit_logger is None or _audit_logger.log_file != log_file):
+        return configure_audit_logger(log_file).logger
+    return get_audit_logger().logger
+
+
+def set_audit_context(**fields) -> None:
+    """
+    Sets fields added to every subsequent audit record of the current thread or asyncio
+    task (e.g. run_id, spec_hash). A value of None removes the field.
+    """
+    context = dict(_context.get())
+    for key, value in fields.items():
+        if value is None:
+            context.pop(key, None)
+        else:
+            context[key] = value
+    _context.set(context)
+
+
+def spec_hash(spec: Any) -> str:
+    """Returns a short, stable hash of a specification for audit records."""
+    return hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def log_event(event: str, level: str = "info", **fields):
+    """
+    Logs an audit event. The call only enqueues the record; it never waits on disk I/O.
+
+    :param event: Short event name or message (e.g. 'generation_completed').
+    :param level: 'info', 'warning' or 'error'.
+    :param fields: Structured fields (run_id, spec_hash, test_type, adapter, tokens, duration, ...).
+    """
+    logger = (_audit_logger or get_audit_logger()).logger
+    logger.log(_LEVELS.get(level.lower(), logging.INFO), event, extra={"audit": {**_context.get(), **fields}})
+
+
+@atexit.register
+def _close_audit_logger():
+    if _audit_logger is not None:
+        _audit_logger.close()
 
 # --- Example Usage ---
 if __name__ == "__main__":
+    set_audit_context(run_id="demo", spec_hash=spec_hash({"title": "Demo API"}))
     log_event("Test generation started.")
-    log_event("Test generation completed successfully.", level="info")
+    log_event("generation_completed", test_type="functional", adapter="openai",
+              tokens={"prompt": 2400, "cached": 2048, "completion": 900}, duration=12.5)
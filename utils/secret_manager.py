@@ -1,22 +1,458 @@
+import json
+import logging
 import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-def get_secret(key: str) -> str:
+import yaml
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class SecretBackend:
+    """
+    A source of secrets. Backends are queried in order; the first one that knows a
+    key wins. A backend returns None for keys it does not hold and raises only when
+    the source itself cannot be read.
     """
-    Retrieves a secret from the environment variables.
-    
-    :param key: The environment variable name for the secret.
+
+    name = "backend"
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        :param key: Secret name (e.g. 'OPENAI_API_KEY').
+        :return: The secret value, or None if this backend does not hold it.
+        """
+        raise NotImplementedError
+
+
+class EnvBackend(SecretBackend):
+    """Reads secrets from environment variables."""
+
+    name = "env"
+
+    def __init__(self, environ: Mapping = None):
+        """
+        :param environ: Mapping to read from (default: os.environ).
+        """
+        self.environ = os.environ if environ is None else environ
+
+    def get(self, key: str) -> Optional[str]:
+        return self.environ.get(key)
+
+
+class _FileBackend(SecretBackend):
+    """Parses a file into a mapping once, and again only when its mtime or size changes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._values: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if stamp != self._stamp:
+                self._values = {str(k): str(v) for k, v in (self._parse() or {}).items() if v is not None}
+                self._stamp = stamp
+            return self._values.get(key)
+
+    def _parse(self) -> Mapping:
+        raise NotImplementedError
+
+
+class DotenvBackend(_FileBackend):
+    """Reads secrets from a .env file without exporting them to the process environment."""
+
+    name = "dotenv"
+
+    def __init__(self, path: str = ".env"):
+        """
+        :param path: Path of the .env file; a missing file holds no secrets.
+        """
+        super().__init__(path)
+
+    def _parse(self) -> Mapping:
+        from dotenv import dotenv_values
+        return dotenv_values(self.path)
+
+
+class EncryptedFileBackend(_FileBackend):
+    """
+    Reads secrets from a local file holding a Fernet-encrypted YAML (or JSON) mapping.
+    The key comes from an environment variable, so only the key has to be provisioned
+    on the machine; the file itself can be shared or committed. See write_encrypted_secrets().
+    """
+
+    name = "encrypted_file"
+
+    def __init__(self, path: str, key_env_var: str = "AITG_SECRETS_KEY", key: str = None):
+        """
+        :param path: Path of the encrypted file.
+        :param key_env_var: Environment variable holding the Fernet key.
+        :param key: The Fernet key itself (overrides key_env_var).
+        """
+        super().__init__(path)
+        self.key_env_var = key_env_var
+        self.key = key
+
+    def _parse(self) -> Mapping:
+        key = self.key or os.getenv(self.key_env_var)
+        if not key:
+            raise RuntimeError(f"Cannot decrypt '{self.path}': {self.key_env_var} is not set.")
+        from cryptography.fernet import Fernet, InvalidToken
+        with open(self.path, "rb") as f:
+            token = f.read()
+        try:
+            return yaml.safe_load(Fernet(key.encode("utf-8")).decrypt(token)) or {}
+        except InvalidToken as e:
+            raise RuntimeError(f"Cannot decrypt '{self.path}': wrong key or corrupted file.") from e
+
+
+class VaultBackend(SecretBackend):
+    """
+    Reads secrets from one path of a HashiCorp Vault KV v2 engine over its HTTP API
+    (e.g. a `vault server -dev` instance in development). The whole path is fetched in
+    one request and reused for `max_age` seconds, so resolving several keys costs one call.
+    """
+
+    name = "vault"
+
+    def __init__(self, url: str, token: str, path: str, mount: str = "secret", max_age: float = 60.0,
+                 timeout: float = 5.0):
+        """
+        :param url: Vault address (e.g. http://127.0.0.1:8200).
+        :param token: Vault token.
+        :param path: Secret path inside the mount (e.g. 'ai-test-generator').
+        :param mount: Mount point of the KV v2 engine.
+        :param max_age: Seconds a fetched path is reused before it is read again.
+        :param timeout: HTTP timeout in seconds.
+        """
+        self.url = f"{url.rstrip('/')}/v1/{mount.strip('/')}/data/{path.strip('/')}"
+        self.token = token
+        self.max_age = max_age
+        self.timeout = timeout
+        self._values: Optional[Dict[str, str]] = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if self._values is None or time.monotonic() - self._fetched_at > self.max_age:
+                self._values = self._fetch()
+                self._fetched_at = time.monotonic()
+            return self._values.get(key)
+
+    def _fetch(self) -> Dict[str, str]:
+        request = urllib.request.Request(self.url, headers={"X-Vault-Token": self.token})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                document = json.load(response)
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return {}
+            raise RuntimeError(f"Vault request failed: HTTP {e.code}") from e
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            raise RuntimeError(f"Vault request failed: {e}") from e
+        data = ((document.get("data") or {}).get("data")) or {}
+        return {str(k): str(v) for k, v in data.items() if v is not None}
+
+
+class KeyPool:
+    """
+    Several API keys of one provider. Requests are spread over the keys (least busy
+    first, round-robin among equals), each key has its own concurrency limit, and a key
+    that fails (e.g. is rate limited) cools down while the others keep serving, so the
+    aggregate throughput grows with the number of keys.
+    """
+
+    def __init__(self, keys: List[Optional[str]], max_concurrent: int = None, cooldown_seconds: float = 60.0):
+        """
+        :param keys: The API keys (a single None entry for providers without a key).
+        :param max_concurrent: Concurrent requests allowed per key (None for no limit).
+        :param cooldown_seconds: How long a failed key is skipped.
+        """
+        self.keys = list(keys) or [None]
+        self.max_concurrent = max_concurrent
+        self.cooldown_seconds = cooldown_seconds
+        self._in_flight = [0] * len(self.keys)
+        self._unavailable_until = [0.0] * len(self.keys)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _usable(self, index: int, now: float) -> bool:
+        return (self._unavailable_until[index] <= now and
+                (not self.max_concurrent or self._in_flight[index] < self.max_concurrent))
+
+    def has_capacity(self) -> bool:
+        """Checks whether any key can take a request now."""
+        now = time.monotonic()
+        with self._lock:
+            return any(self._usable(index, now) for index in range(len(self.keys)))
+
+    def acquire(self) -> Optional[int]:
+        """
+        Reserves the least busy usable key.
+
+        :return: The index of the key, or None if every key is cooling down or saturated.
+        """
+        now = time.monotonic()
+        with self._lock:
+            order = [(self._next + offset) % len(self.keys) for offset in range(len(self.keys))]
+            usable = [index for index in order if self._usable(index, now)]
+            if not usable:
+                return None
+            index = min(usable, key=lambda i: self._in_flight[i])
+            self._in_flight[index] += 1
+            self._next = (index + 1) % len(self.keys)
+            return index
+
+    def release(self, index: int, failed: bool = False) -> None:
+        """
+        Returns a key reserved by acquire().
+
+        :param index: The key index.
+        :param failed: Puts the key into cooldown.
+        """
+        with self._lock:
+            self._in_flight[index] = max(0, self._in_flight[index] - 1)
+            if failed:
+                self._unavailable_until[index] = time.monotonic() + self.cooldown_seconds
+
+
+class SecretManager:
+    """
+    Resolves secrets through an ordered list of backends and caches the values for
+    `ttl` seconds, so hot paths never touch a file or a network service. Once started,
+    a background thread re-resolves cached secrets shortly before they expire; if a
+    backend is unreachable, the last known value stays in use.
+    """
+
+    def __init__(self, backends: Iterable[SecretBackend] = None, ttl: float = 300.0, refresh_interval: float = 60.0):
+        """
+        :param backends: Backends in lookup order (default: environment only).
+        :param ttl: Seconds a resolved secret is served from the cache.
+        :param refresh_interval: Seconds between two background refresh passes.
+        """
+        self.backends = list(backends) if backends is not None else [EnvBackend()]
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self._cache: Dict[str, Tuple[Optional[str], float]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def get(self, key: str, default: Any = _MISSING) -> Optional[str]:
+        """
+        Returns a secret, from the cache if it is fresh.
+
+        :param key: Secret name.
+        :param default: Returned if no backend holds the secret.
+        :return: The secret value.
+        :raises ValueError: If the secret is not found and no default was given.
+        """
+        entry = self._cache.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            entry = self._refresh(key, entry)
+        if entry[0] is None:
+            if default is _MISSING:
+                raise ValueError(f"Secret '{key}' not found in {', '.join(b.name for b in self.backends)}.")
+            return default
+        return entry[0]
+
+    def get_pool(self, key: str) -> List[str]:
+        """
+        Returns the key pool stored under a secret: a comma-separated list of keys
+        (e.g. OPENAI_API_KEY=sk-a,sk-b). A single key is a pool of one.
+
+        :param key: Secret name.
+        :return: The keys, empty if the secret is not set.
+        """
+        value = self.get(key, default=None)
+        return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+    def invalidate(self, key: str = None) -> None:
+        """
+        Drops one cached secret (or all), e.g. after a key was rotated.
+
+        :param key: Secret name, or None for every secret.
+        """
+        with self._lock:
+            if key is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(key, None)
+
+    def _resolve(self, key: str) -> Tuple[Optional[str], List[str]]:
+        """Looks a secret up in backend order; a failing backend is logged and skipped."""
+        errors = []
+        for backend in self.backends:
+            try:
+                value = backend.get(key)
+            except Exception as e:
+                logger.warning(f"Secret backend '{backend.name}' failed for '{key}': {e}")
+                errors.append(f"{backend.name}: {e}")
+                continue
+            if value is not None:
+                return value, errors
+        return None, errors
+
+    def _refresh(self, key: str, previous: Optional[Tuple[Optional[str], float]]) -> Tuple[Optional[str], float]:
+        value, errors = self._resolve(key)
+        if value is None and errors:
+            # The secret may live in a backend that failed: keep what was cached.
+            if previous is not None:
+                logger.warning(f"Could not refresh secret '{key}', keeping the cached value.")
+                value = previous[0]
+            elif len(errors) == len(self.backends):
+                raise RuntimeError(f"Every secret backend failed for '{key}': {'; '.join(errors)}")
+        entry = (value, time.monotonic() + self.ttl)
+        with self._lock:
+            self._cache[key] = entry
+        return entry
+
+    def start(self) -> "SecretManager":
+        """Starts refreshing cached secrets in the background."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="secret-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops the background refresh."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.refresh_interval + 1)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            # Refresh what would expire before the next pass, so readers keep hitting the cache.
+            horizon = time.monotonic() + self.refresh_interval
+            with self._lock:
+                due = [(key, entry) for key, entry in self._cache.items() if entry[1] <= horizon]
+            for key, entry in due:
+                try:
+                    self._refresh(key, entry)
+                except Exception as e:
+                    logger.warning(f"Could not refresh secret '{key}': {e}")
+
+
+def build_backends(config: Mapping) -> List[SecretBackend]:
+    """
+    Builds the backends listed in the `secrets` settings section.
+
+    :param config: The secrets configuration (backends, dotenv, encrypted_file, vault).
+    :return: The backends in lookup order.
+    :raises ValueError: If an unknown backend is listed.
+    """
+    backends = []
+    for name in config.get("backends") or ["env"]:
+        options = config.get(name) or {}
+        if name == "env":
+            backends.append(EnvBackend())
+        elif name == "dotenv":
+            backends.append(DotenvBackend(options.get("path", ".env")))
+        elif name == "encrypted_file":
+            backends.append(EncryptedFileBackend(options.get("path", "secrets.enc"),
+                                                 options.get("key_env_var", "AITG_SECRETS_KEY")))
+        elif name == "vault":
+            url, token = os.getenv(options.get("url_env_var", "VAULT_ADDR")), os.getenv(options.get("token_env_var", "VAULT_TOKEN"))
+            if not url or not token:
+                logger.info("Vault secret backend skipped: address or token not set.")
+                continue
+            backends.append(VaultBackend(url, token, options.get("path", "ai-test-generator"),
+                                         options.get("mount", "secret"), options.get("max_age", 60.0)))
+        else:
+            raise ValueError(f"Unknown secret backend '{name}'.")
+    return backends
+
+
+_secret_manager: Optional[SecretManager] = None
+_secret_lock = threading.Lock()
+
+
+def configure_secrets(config: Mapping = None) -> SecretManager:
+    """
+    (Re)configures the process-wide secret manager.
+
+    :param config: The secrets configuration (default: the `secrets` settings section).
+    :return: The new, started SecretManager.
+    """
+    global _secret_manager
+    if config is None:
+        from utils.settings import get_settings
+        config = get_settings().get("secrets") or {}
+    manager = SecretManager(build_backends(config), ttl=config.get("ttl_seconds", 300.0),
+                            refresh_interval=config.get("refresh_seconds", 60.0))
+    with _secret_lock:
+        if _secret_manager is not None:
+            _secret_manager.stop()
+        _secret_manager = manager.start()
+    return manager
+
+
+def get_secret_manager() -> SecretManager:
+    """Returns the process-wide secret manager, configuring it from the settings on first use."""
+    manager = _secret_manager
+    return manager if manager is not None else configure_secrets()
+
+
+def get_secret(key: str, default: Any = _MISSING) -> Optional[str]:
+    """
+    Retrieves a secret through the configured backends.
+
+    :param key: The secret name (e.g. an environment variable name).
+    :param default: Returned if the secret is not found.
     :return: The secret value.
-    :raises ValueError: If the secret is not found.
+    :raises ValueError: If the secret is not found and no default was given.
+    """
+    return get_secret_manager().get(key, default)
+
+
+def get_api_key(key: str) -> Optional[str]:
+    """
+    Returns the first key of a key pool secret, for clients that use a single key.
+
+    :param key: The secret name.
+    :return: The key, or None if the secret is not set.
+    """
+    pool = get_secret_manager().get_pool(key)
+    return pool[0] if pool else None
+
+
+def write_encrypted_secrets(path: str, values: Mapping, key: str) -> None:
+    """
+    Writes secrets to a file readable by EncryptedFileBackend.
+
+    :param path: Path of the encrypted file.
+    :param values: Mapping of secret name to value.
+    :param key: Fernet key (create one with cryptography.fernet.Fernet.generate_key()).
     """
-    value = os.getenv(key)
-    if value is None:
-        raise ValueError(f"Secret for key '{key}' not found in environment variables.")
-    return value
+    from cryptography.fernet import Fernet
+    token = Fernet(key.encode("utf-8")).encrypt(yaml.safe_dump(dict(values)).encode("utf-8"))
+    with open(path, "wb") as f:
+        f.write(token)
 
 # --- Example Usage ---
 if __name__ == "__main__":
     try:
         secret = get_secret("OPENAI_API_KEY")
-        print("Retrieved secret:", secret)
+        print("Retrieved secret:", secret[:6] + "...")
+        print("Keys in pool:", len(get_secret_manager().get_pool("OPENAI_API_KEY")))
     except Exception as e:
         print(e)
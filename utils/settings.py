@@ -0,0 +1,352 @@
+import glob
+import logging
+import os
+import threading
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import yaml
+
+from utils.config_loader import load_config
+
+logger = logging.getLogger(__name__)
+
+CONFIG_DIR = os.environ.get("AITG_CONFIG_DIR", "config")
+
+# Environment overrides: AITG__<FILE>__<KEY>[__<KEY>...]=<YAML value>,
+# e.g. AITG__GENERATION_RULES__REPAIR__MAX_ROUNDS=0.
+ENV_PREFIX = "AITG__"
+
+# Sections that always exist (empty if their file is missing), one per config/*.yaml.
+KNOWN_SECTIONS = ("ai_providers", "framework_config", "generation_rules", "model_mapping", "secrets")
+
+
+class ConfigError(RuntimeError):
+    """Raised when the configuration cannot be loaded or fails validation."""
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return FrozenConfig(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, FrozenConfig):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class FrozenConfig(Mapping):
+    """
+    Immutable, read-only view of a configuration mapping. Keys are available both as
+    attributes (settings.generation_rules.repair.max_rounds) and as items, so it can
+    be passed wherever a dict of settings was expected.
+    """
+
+    def __init__(self, data: Mapping):
+        frozen = {key: _freeze(value) for key, value in data.items()}
+        object.__setattr__(self, "_data", frozen)
+        # Keys are also stored as instance attributes, so reading one is a plain attribute
+        # lookup; keys that clash with Mapping methods (e.g. 'items') are only items.
+        self.__dict__.update(
+            (key, value) for key, value in frozen.items()
+            if isinstance(key, str) and key.isidentifier() and not hasattr(type(self), key)
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        raise AttributeError(f"No configuration key '{name}'")
+
+    def __setattr__(self, name: str, value: Any):
+        raise TypeError("Settings are immutable; use overrides or edit the config files.")
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a mutable deep copy as plain dicts and lists."""
+        return {key: _thaw(value) for key, value in self._data.items()}
+
+
+class Settings(FrozenConfig):
+    """
+    The merged configuration of every config/*.yaml file (one section per file, named
+    after it), with environment and command-line overrides applied and validated.
+    """
+
+    def __init__(self, data: Mapping, config_dir: str, overrides: Tuple[str, ...], fingerprint: Tuple):
+        super().__init__(data)
+        object.__setattr__(self, "config_dir", config_dir)
+        object.__setattr__(self, "overrides", overrides)
+        object.__setattr__(self, "fingerprint", fingerprint)
+
+
+def _fingerprint(config_dir: str) -> Tuple:
+    """Identifies the current version of the config files (path, mtime and size of each)."""
+    entries = []
+    for path in sorted(glob.glob(os.path.join(config_dir, "*.yaml"))):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(entries)
+
+
+def _set_path(data: dict, keys: List[str], value: Any) -> None:
+    for key in keys[:-1]:
+        if not isinstance(data.get(key), dict):
+            data[key] = {}
+        data = data[key]
+    data[keys[-1]] = value
+
+
+def _parse_value(text: str) -> Any:
+    """Parses an override value as YAML, so '0', 'true' and '[a, b]' get their types."""
+    try:
+        return yaml.safe_load(text)
+    except yaml.YAMLError:
+        return text
+
+
+def _apply_overrides(raw: dict, environ: Mapping, overrides: Iterable[str]) -> None:
+    for name, value in sorted(environ.items()):
+        if name.startswith(ENV_PREFIX) and len(name) > len(ENV_PREFIX):
+            _set_path(raw, name[len(ENV_PREFIX):].lower().split("__"), _parse_value(value))
+    for override in overrides:
+        key, separator, value = override.partition("=")
+        if not separator or not key.strip():
+            raise ConfigError(f"Invalid override '{override}': expected SECTION.KEY=VALUE")
+        _set_path(raw, key.strip().split("."), _parse_value(value))
+
+
+def _is_int(value: Any, minimum: int = 0) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value >= minimum
+
+
+def validate(raw: Mapping) -> List[str]:
+    """
+    Checks the merged configuration for type errors and dangling references.
+
+    :param raw: The merged configuration.
+    :return: A list of problems (empty if valid).
+    """
+    problems = []
+    for section, content in raw.items():
+        if not isinstance(content, Mapping):
+            problems.append(f"{section}: expected a mapping, got {type(content).__name__}")
+    if problems:
+        return problems
+
+    providers = raw.get("ai_providers", {})
+    for name, provider in providers.items():
+        if not isinstance(provider, Mapping):
+            problems.append(f"ai_providers.{name}: expected a mapping")
+        elif "max_concurrent_requests" in provider and not _is_int(provider["max_concurrent_requests"], 1):
+            problems.append(f"ai_providers.{name}.max_concurrent_requests: expected a positive integer")
+
+    for test_type, mapping in raw.get("model_mapping", {}).items():
+        if not isinstance(mapping, Mapping):
+            problems.append(f"model_mapping.{test_type}: expected a mapping")
+            continue
+        if "llm_weighting" in mapping and not isinstance(mapping["llm_weighting"], bool):
+            problems.append(f"model_mapping.{test_type}.llm_weighting: expected true or false")
+        if "load_profile" in mapping and not isinstance(mapping["load_profile"], Mapping):
+            problems.append(f"model_mapping.{test_type}.load_profile: expected a mapping")
+        if mapping.get("output_format") not in (None, "code", "structured"):
+            problems.append(f"model_mapping.{test_type}.output_format: expected 'code' or 'structured'")
+        referenced = ([mapping["adapter"]] if mapping.get("adapter") else []) + list(mapping.get("fallback") or [])
+        for provider in referenced:
+            if providers and provider not in providers:
+                problems.append(f"model_mapping.{test_type}: unknown provider '{provider}'")
+
+    rules = raw.get("generation_rules", {})
+    for key in ("max_rounds", "token_budget", "max_tokens_per_request"):
+        value = (rules.get("repair") or {}).get(key)
+        if value is not None and not _is_int(value):
+            problems.append(f"generation_rules.repair.{key}: expected a non-negative integer")
+    test_data = rules.get("test_data") or {}
+    if "seed" in test_data and not _is_int(test_data["seed"], minimum=-2 ** 63):
+        problems.append("generation_rules.test_data.seed: expected an integer")
+    if "enabled" in test_data and not isinstance(test_data["enabled"], bool):
+        problems.append("generation_rules.test_data.enabled: expected true or false")
+    if "default_timeout" in rules and not (isinstance(rules["default_timeout"], (int, float)) and rules["default_timeout"] > 0):
+        problems.append("generation_rules.default_timeout: expected a positive number")
+
+    resilience = rules.get("resilience") or {}
+    for key in ("timeout_seconds", "deadline_seconds", "recovery_seconds"):
+        if resilience.get(key) is not None and not (isinstance(resilience[key], (int, float)) and resilience[key] > 0):
+            problems.append(f"generation_rules.resilience.{key}: expected a positive number")
+    if "failure_threshold" in resilience and not _is_int(resilience["failure_threshold"], 1):
+        problems.append("generation_rules.resilience.failure_threshold: expected a positive integer")
+    percentile = (resilience.get("hedge") or {}).get("percentile", 0.95)
+    if not (isinstance(percentile, (int, float)) and 0 < percentile <= 1):
+        problems.append("generation_rules.resilience.hedge.percentile: expected a fraction between 0 and 1")
+
+    mode = (rules.get("transport") or {}).get("mode", "live")
+    if mode not in ("live", "record", "replay", "auto"):
+        problems.append("generation_rules.transport.mode: expected live, record, replay or auto")
+
+    secrets = raw.get("secrets", {})
+    for key in ("ttl_seconds", "refresh_seconds"):
+        if key in secrets and not (isinstance(secrets[key], (int, float)) and secrets[key] > 0):
+            problems.append(f"secrets.{key}: expected a positive number")
+    unknown = set(secrets.get("backends") or ()) - {"env", "dotenv", "encrypted_file", "vault"}
+    if unknown:
+        problems.append(f"secrets.backends: unknown backend(s) {sorted(unknown)}")
+
+    runner = ((raw.get("framework_config", {}).get("pytest") or {}).get("runner") or {})
+    if "workers" in runner and not _is_int(runner["workers"]):
+        problems.append("framework_config.pytest.runner.workers: expected a non-negative integer")
+    return problems
+
+
+def load_settings(config_dir: str = None, overrides: Iterable[str] = (), environ: Mapping = None) -> Settings:
+    """
+    Loads every config/*.yaml file once, applies environment then command-line
+    overrides, and validates the result.
+
+    :param config_dir: Directory of the YAML files (default: AITG_CONFIG_DIR or 'config').
+    :param overrides: 'section.key.subkey=value' strings, applied last.
+    :param environ: Environment to read AITG__ overrides from (default: os.environ).
+    :return: An immutable Settings object.
+    :raises ConfigError: If a file cannot be parsed or validation fails.
+    """
+    config_dir = config_dir or CONFIG_DIR
+    overrides = tuple(overrides or ())
+    fingerprint = _fingerprint(config_dir)
+    raw: Dict[str, Any] = {section: {} for section in KNOWN_SECTIONS}
+    for path, _, _ in fingerprint:
+        section = os.path.splitext(os.path.basename(path))[0]
+        try:
+            raw[section] = load_config(path) or {}
+        except RuntimeError as e:
+            raise ConfigError(str(e)) from e
+
+    _apply_overrides(raw, os.environ if environ is None else environ, overrides)
+    problems = validate(raw)
+    if problems:
+        raise ConfigError("Invalid configuration:\n  " + "\n  ".join(problems))
+    return Settings(raw, config_dir, overrides, fingerprint)
+
+
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
+
+
+def configure_settings(config_dir: str = None, overrides: Iterable[str] = ()) -> Settings:
+    """
+    Loads the settings and installs them as the process-wide settings.
+
+    :param config_dir: Directory of the YAML files.
+    :param overrides: 'section.key=value' strings (e.g. from the CLI --set option).
+    :return: The installed Settings.
+    """
+    global _settings
+    settings = load_settings(config_dir, overrides)
+    with _settings_lock:
+        _settings = settings
+    return settings
+
+
+def get_settings() -> Settings:
+    """
+    Returns the process-wide settings, loading them with defaults on first use.
+    After that this is a single global lookup; no file is read.
+    """
+    global _settings
+    settings = _settings
+    if settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _settings = load_settings()
+            settings = _settings
+    return settings
+
+
+class SettingsWatcher:
+    """
+    Reloads the process-wide settings when a config file changes, for long-running
+    (service) processes. Files are polled by mtime and size, so no extra dependency is
+    needed. An invalid edit is logged and the previous settings stay in effect.
+    """
+
+    def __init__(self, interval: float = 2.0, on_change: Callable[[Settings], None] = None):
+        """
+        :param interval: Seconds between two polls.
+        :param on_change: Optional callback receiving the new Settings after a reload.
+        """
+        self.interval = interval
+        self.on_change = on_change
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="settings-watcher", daemon=True)
+
+    def start(self) -> "SettingsWatcher":
+        get_settings()
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(self.interval + 1)
+
+    def check(self) -> bool:
+        """
+        Reloads the settings if the config files changed since they were loaded.
+
+        :return: True if new settings were installed.
+        """
+        global _settings
+        current = get_settings()
+        if _fingerprint(current.config_dir) == current.fingerprint:
+            return False
+        try:
+            settings = load_settings(current.config_dir, current.overrides)
+        except ConfigError as e:
+            logger.error(f"Configuration change ignored: {e}")
+            # Remember the broken version so the error is only reported once.
+            object.__setattr__(current, "fingerprint", _fingerprint(current.config_dir))
+            return False
+        with _settings_lock:
+            _settings = settings
+        logger.info(f"Configuration reloaded from {current.config_dir}.")
+        if self.on_change:
+            self.on_change(settings)
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Configuration watcher failed: {e}")
+
+
+def watch_settings(interval: float = 2.0, on_change: Callable[[Settings], None] = None) -> SettingsWatcher:
+    """
+    Starts reloading the settings on config file changes.
+
+    :param interval: Seconds between two polls.
+    :param on_change: Optional callback receiving the new Settings after a reload.
+    :return: The running SettingsWatcher (call stop() to end it).
+    """
+    return SettingsWatcher(interval, on_change).start()
+
+# --- Example Usage ---
+if __name__ == "__main__":
+    settings = configure_settings(overrides=["generation_rules.repair.max_rounds=1"])
+    print(settings.generation_rules.repair.max_rounds, settings.model_mapping.functional.adapter)